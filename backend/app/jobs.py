@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+import multiprocessing
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+import os
+import signal
+import threading
+import time
+from typing import Any, Callable, Literal
+from uuid import uuid4
+
+from .scheduler.engine import ProgressCallback, run_scheduler
+from .schemas import SchedulerGenerateRequest, SchedulerGenerateResult
+
+JobStatus = Literal["queued", "running", "succeeded", "failed", "timed_out", "cancelled"]
+
+
+def solve_request(
+    payload: SchedulerGenerateRequest, progress: ProgressCallback | None = None
+) -> SchedulerGenerateResult:
+    return run_scheduler(
+        tenant_id=payload.tenant_id,
+        sections=payload.sections,
+        rooms=[room.room_id for room in payload.rooms],
+        room_types={room.room_id: room.room_type for room in payload.rooms},
+        admin=payload.admin,
+        population_size=payload.population_size,
+        generations=payload.generations,
+        mutation_rate=payload.mutation_rate,
+        seed=payload.seed,
+        time_budget_ms=payload.time_budget_ms,
+        stall_generations=payload.stall_generations,
+        target_fitness=payload.target_fitness,
+        task_ordering=payload.task_ordering,
+        local_search=payload.local_search,
+        solver=payload.solver,
+        decompose=payload.decompose,
+        warm_start=payload.warm_start,
+        progress=progress,
+        profile=payload.profile,
+    )
+
+
+SolveFunction = Callable[[SchedulerGenerateRequest, ProgressCallback | None], SchedulerGenerateResult]
+
+
+def _run_job(solve: SolveFunction, payload: SchedulerGenerateRequest, conn: Connection, report_progress: bool) -> None:
+    # Lead a process group so that killing the job also kills the processes
+    # a decomposed or parallel run starts.
+    if hasattr(os, "setpgrp"):
+        os.setpgrp()
+    conn.send(("started", time.time()))
+    try:
+        result = solve(payload, (lambda snapshot: conn.send(("progress", snapshot))) if report_progress else None)
+    except Exception as exc:
+        conn.send(("failed", str(exc)))
+    else:
+        conn.send(("succeeded", result))
+    conn.close()
+
+
+@dataclass
+class Job:
+    job_id: str
+    tenant_id: str
+    submitted_at: float
+    status: JobStatus = "queued"
+    result: SchedulerGenerateResult | None = None
+    error: str | None = None
+    started_at: float | None = None
+    finished_at: float | None = None
+
+
+@dataclass
+class _QueuedJob:
+    job: Job
+    payload: SchedulerGenerateRequest
+    on_progress: Callable[[dict[str, Any]], None] | None = None
+    on_finish: Callable[[Job], None] | None = None
+
+
+@dataclass
+class _RunningJob:
+    queued: _QueuedJob
+    process: BaseProcess
+    conn: Connection
+    launched_at: float
+
+
+def _kill(process: BaseProcess) -> None:
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (AttributeError, ProcessLookupError, PermissionError):
+        # No process groups here, or the worker has not called setpgrp yet.
+        process.kill()
+
+
+class JobQueue:
+    """Runs scheduler requests in worker processes, at most `workers` at a time.
+
+    At most `max_queue_depth` jobs may be queued or running; `submit` raises
+    RuntimeError beyond that. Each job gets a process of its own so that it
+    can be killed: the solver time budget is capped at `job_timeout_s`, and
+    a job still running `timeout_grace_s` past that is terminated and
+    reported as timed out. `started_at` is taken inside the worker process.
+    Finished jobs are forgotten `retention_s` after they finish, and
+    `cancel` kills a job outright.
+
+    Job processes are started with `start_method` ("forkserver" where
+    available, else "spawn") rather than forked from the threaded server, and
+    run `solve`, which must be picklable (a module-level function).
+
+    A supervisor thread, started with the first job, launches queued jobs,
+    collects results and enforces deadlines every `poll_interval_s`. It
+    calls `on_success` with each job that succeeds, then a job's own
+    `on_finish` once it ends (other than by `cancel`). A job submitted with
+    `on_progress` has the solver's progress snapshots forwarded to it.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        max_queue_depth: int = 32,
+        job_timeout_s: float = 300.0,
+        timeout_grace_s: float = 30.0,
+        retention_s: float = 3600.0,
+        on_success: Callable[[Job], None] | None = None,
+        poll_interval_s: float = 0.05,
+        solve: SolveFunction = solve_request,
+        start_method: str | None = None,
+    ) -> None:
+        if workers < 1 or max_queue_depth < 1 or job_timeout_s <= 0:
+            raise ValueError("workers, max_queue_depth and job_timeout_s must be positive")
+        self.workers = workers
+        self.max_queue_depth = max_queue_depth
+        self.job_timeout_s = job_timeout_s
+        self.timeout_grace_s = timeout_grace_s
+        self.retention_s = retention_s
+        self.on_success = on_success
+        self.poll_interval_s = poll_interval_s
+        self.solve = solve
+        if start_method is None:
+            start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        self._context = multiprocessing.get_context(start_method)
+        self._jobs: dict[str, Job] = {}
+        self._pending: deque[_QueuedJob] = deque()
+        self._running: dict[str, _RunningJob] = {}
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._supervisor: threading.Thread | None = None
+
+    def active(self) -> int:
+        with self._lock:
+            return len(self._pending) + len(self._running)
+
+    def submit(
+        self,
+        payload: SchedulerGenerateRequest,
+        on_progress: Callable[[dict[str, Any]], None] | None = None,
+        on_finish: Callable[[Job], None] | None = None,
+    ) -> Job:
+        budget_ms = self.job_timeout_s * 1000
+        if payload.time_budget_ms is not None:
+            budget_ms = min(budget_ms, payload.time_budget_ms)
+        payload = payload.model_copy(update={"time_budget_ms": budget_ms})
+
+        with self._lock:
+            if len(self._pending) + len(self._running) >= self.max_queue_depth:
+                raise RuntimeError(f"Job queue is full ({self.max_queue_depth} jobs queued or running)")
+            job = Job(job_id=str(uuid4()), tenant_id=payload.tenant_id, submitted_at=time.time())
+            self._jobs[job.job_id] = job
+            self._pending.append(_QueuedJob(job, payload, on_progress, on_finish))
+            if self._supervisor is None:
+                self._stopping.clear()
+                self._supervisor = threading.Thread(target=self._supervise, name="job-queue", daemon=True)
+                self._supervisor.start()
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """Drop a queued job or kill a running one; False if it had already ended."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.finished_at is not None:
+                return False
+            if job_id in self._running:
+                _kill(self._running[job_id].process)
+            else:
+                self._pending = deque(queued for queued in self._pending if queued.job is not job)
+            job.status, job.finished_at = "cancelled", time.time()
+            return True
+
+    def _supervise(self) -> None:
+        while not self._stopping.is_set():
+            with self._lock:
+                progress, finished = self._collect()
+                self._launch()
+                self._evict()
+            # Reaping can block briefly, so it happens outside the lock.
+            for running in finished:
+                running.process.join()
+                running.conn.close()
+            with self._lock:
+                for running in finished:
+                    job = running.queued.job
+                    if job.status == "failed" and job.error is None:
+                        job.error = f"Worker process exited with code {running.process.exitcode}"
+            for on_progress, snapshot in progress:
+                on_progress(snapshot)
+            for running in finished:
+                queued = running.queued
+                if queued.job.status == "succeeded" and self.on_success is not None:
+                    self.on_success(queued.job)
+                if queued.on_finish is not None and queued.job.status != "cancelled":
+                    queued.on_finish(queued.job)
+            self._stopping.wait(self.poll_interval_s)
+
+    def _launch(self) -> None:
+        context = self._context
+        while self._pending and len(self._running) < self.workers:
+            queued = self._pending.popleft()
+            receiver, sender = context.Pipe(duplex=False)
+            process = context.Process(
+                target=_run_job,
+                args=(self.solve, queued.payload, sender, queued.on_progress is not None),
+                name=f"job-{queued.job.job_id}",
+            )
+            process.start()
+            sender.close()
+            self._running[queued.job.job_id] = _RunningJob(queued, process, receiver, time.time())
+
+    def _collect(self) -> tuple[list[tuple[Callable[[dict[str, Any]], None], dict[str, Any]]], list[_RunningJob]]:
+        """Read job messages and enforce deadlines; returns progress to forward and jobs that ended."""
+        progress: list[tuple[Callable[[dict[str, Any]], None], dict[str, Any]]] = []
+        finished: list[_RunningJob] = []
+        now = time.time()
+        for job_id, running in list(self._running.items()):
+            job = running.queued.job
+            try:
+                while job.finished_at is None and running.conn.poll():
+                    kind, value = running.conn.recv()
+                    if kind == "started":
+                        job.status, job.started_at = "running", value
+                    elif kind == "progress":
+                        if running.queued.on_progress is not None:
+                            progress.append((running.queued.on_progress, value))
+                    elif kind == "succeeded":
+                        job.status, job.result, job.finished_at = "succeeded", value, now
+                    else:
+                        job.status, job.error, job.finished_at = "failed", value, now
+            except EOFError:
+                # The error, with the exit code, is filled in once the process is reaped.
+                job.status, job.finished_at = "failed", now
+            if job.finished_at is None and now > (job.started_at or running.launched_at) + (
+                self.job_timeout_s + self.timeout_grace_s
+            ):
+                _kill(running.process)
+                job.status, job.finished_at = "timed_out", now
+                job.error = f"Job exceeded its {self.job_timeout_s:g}s timeout"
+            if job.finished_at is not None:
+                del self._running[job_id]
+                finished.append(running)
+        return progress, finished
+
+    def _evict(self) -> None:
+        cutoff = time.time() - self.retention_s
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.finished_at and job.finished_at < cutoff]:
+            del self._jobs[job_id]
+
+    def shutdown(self) -> None:
+        self._stopping.set()
+        with self._lock:
+            supervisor, self._supervisor = self._supervisor, None
+        if supervisor is not None:
+            supervisor.join()
+        with self._lock:
+            running_jobs = list(self._running.values())
+            for running in running_jobs:
+                _kill(running.process)
+            self._running.clear()
+            self._pending.clear()
+        for running in running_jobs:
+            running.process.join()
+            running.conn.close()
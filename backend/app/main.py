@@ -1,3 +1,5 @@
+import asyncio
+import json
 import os
 from contextlib import asynccontextmanager
 from uuid import uuid4
@@ -10,14 +12,17 @@ load_dotenv(dotenv_path=env_path)
 
 from fastapi import Body, FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 
 from .database import check_connection, _get_engine
 from .pdf_ingestion import extract_raw_tables, normalize_subject_rows
+from .jobs import Job, JobQueue
 from .schemas import (
     AccessScope,
     ConstraintRule,
     ElectiveGroup,
     EmergencyRescheduleRequest,
+    JobStatusResponse,
     EmergencyRescheduleResponse,
     QualityResponse,
     SimulationRequest,
@@ -25,6 +30,7 @@ from .schemas import (
     SubjectImportResponse,
     SuggestionResponse,
     SubjectSpec,
+    SchedulerGenerateRequest,
     TimetableGenerateRequest,
     SchedulerSectionInput,
     TimetableGenerateResponse,
@@ -57,6 +63,7 @@ async def lifespan(app: FastAPI):
     else:
         print("WARNING: No database connection — running with in-memory storage only")
     yield
+    JOB_QUEUE.shutdown()
     try:
         _get_engine().dispose()
     except Exception:
@@ -80,6 +87,20 @@ TIMETABLE_CACHE: dict[str, TimetableGenerateResponse] = {}
 TIMETABLE_VERSIONS: dict[str, list[TimetableVersionRecord]] = {}
 
 
+def _cache_job_result(job: Job) -> None:
+    job.result.timetable_id = job.job_id
+    TIMETABLE_CACHE[job.job_id] = job.result
+
+
+JOB_QUEUE = JobQueue(
+    workers=int(os.getenv("SCHEDULER_WORKERS", "2")),
+    max_queue_depth=int(os.getenv("SCHEDULER_MAX_QUEUE_DEPTH", "32")),
+    job_timeout_s=float(os.getenv("SCHEDULER_JOB_TIMEOUT_S", "300")),
+    retention_s=float(os.getenv("SCHEDULER_JOB_RETENTION_S", "3600")),
+    on_success=_cache_job_result,
+)
+
+
 @app.get("/health")
 def health() -> dict[str, str]:
     return {"status": "ok"}
@@ -232,6 +253,90 @@ def generate_timetable(payload: TimetableGenerateRequest) -> TimetableGenerateRe
     return response
 
 
+def _resolve_warm_start(payload: SchedulerGenerateRequest) -> SchedulerGenerateRequest:
+    if payload.warm_start_timetable_id is None:
+        return payload
+    cached = TIMETABLE_CACHE.get(payload.warm_start_timetable_id)
+    if cached is None:
+        raise HTTPException(status_code=404, detail="Warm-start timetable not found")
+    return payload.model_copy(update={"warm_start": cached.timetable, "warm_start_timetable_id": None})
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.post("/scheduler/generate/stream")
+async def stream_scheduler(payload: SchedulerGenerateRequest) -> StreamingResponse:
+    """Run the scheduler, streaming a `progress` event per generation and then one `result` (or `error`) event.
+
+    The run is a JOB_QUEUE job, so streams share its worker limit and
+    timeout and get a 429 when the queue is full. Closing the connection
+    kills the run, whichever solver it is in.
+    """
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue[tuple[str, dict]] = asyncio.Queue()
+
+    def publish(event: str, data: dict) -> None:
+        if not loop.is_closed():
+            loop.call_soon_threadsafe(events.put_nowait, (event, data))
+
+    def on_finish(job: Job) -> None:
+        if job.status == "succeeded":
+            publish("result", job.result.model_dump(mode="json"))
+        else:
+            publish("error", {"detail": job.error or job.status})
+
+    payload = _resolve_warm_start(payload)
+    try:
+        job = JOB_QUEUE.submit(payload, on_progress=lambda snapshot: publish("progress", snapshot), on_finish=on_finish)
+    except RuntimeError as exc:
+        raise HTTPException(status_code=429, detail=str(exc)) from exc
+
+    async def stream():
+        try:
+            while True:
+                event, data = await events.get()
+                yield _sse(event, data)
+                if event != "progress":
+                    break
+        finally:
+            JOB_QUEUE.cancel(job.job_id)
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+def _job_status(job: Job) -> JobStatusResponse:
+    return JobStatusResponse(
+        job_id=job.job_id,
+        tenant_id=job.tenant_id,
+        status=job.status,
+        submitted_at=job.submitted_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        result=job.result,
+        error=job.error,
+    )
+
+
+@app.post("/scheduler/jobs", response_model=JobStatusResponse, status_code=202)
+def submit_scheduler_job(payload: SchedulerGenerateRequest) -> JobStatusResponse:
+    payload = _resolve_warm_start(payload)
+    try:
+        job = JOB_QUEUE.submit(payload)
+    except RuntimeError as exc:
+        raise HTTPException(status_code=429, detail=str(exc)) from exc
+    return _job_status(job)
+
+
+@app.get("/jobs/{job_id}", response_model=JobStatusResponse)
+def get_job(job_id: str) -> JobStatusResponse:
+    job = JOB_QUEUE.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _job_status(job)
+
+
 @app.post("/timetables/suggestions", response_model=SuggestionResponse)
 def timetable_suggestions(payload: TimetableValidateRequest) -> SuggestionResponse:
     conflicts = detect_conflicts(payload.timetable, payload.elective_groups)
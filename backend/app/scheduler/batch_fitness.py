@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .instance import ProblemInstance
+
+
+def _numpy() -> Any:
+    try:
+        import numpy
+    except ImportError as exc:
+        raise RuntimeError("numpy is required for batched fitness evaluation") from exc
+    return numpy
+
+
+@dataclass(frozen=True)
+class PenaltyScore:
+    """One candidate's penalties, with the same `fitness` as `IncrementalFitness`."""
+
+    hard_conflicts: int
+    subject_spread_penalty: int
+    fatigue_penalty: int
+    heavy_subject_penalty: int
+
+    @property
+    def total_penalty(self) -> int:
+        return (
+            self.hard_conflicts * 100
+            + self.subject_spread_penalty
+            + self.fatigue_penalty
+            + self.heavy_subject_penalty
+        )
+
+    @property
+    def fitness(self) -> float:
+        return max(0.0, 1000.0 - self.total_penalty)
+
+
+class PopulationEvaluator:
+    """Scores a whole SchedulerEngine population at once with NumPy.
+
+    The population is encoded as two (candidates x blocks) integer matrices,
+    start slot id and room id, with blocks in `ProblemInstance` task order.
+    Clash counts come from one bincount per resource kind over
+    (candidate, resource, slot) keys, spread and heavy-subject penalties
+    from bincounts over (candidate, course|section, day), and fatigue
+    streaks from a lexsort by (candidate, section, day, period). The
+    penalties are exactly those of `SchedulerEngine._fitness`.
+    """
+
+    def __init__(self, instance: ProblemInstance) -> None:
+        np = _numpy()
+        self.np = np
+        self.instance = instance
+        self.task_length = np.asarray(instance.task_length, dtype=np.int64)
+        self.task_faculty = np.asarray(instance.task_faculty, dtype=np.int64)
+        self.task_section = np.asarray(instance.task_section, dtype=np.int64)
+        self.task_course = np.asarray(instance.task_course, dtype=np.int64)
+        self.heavy = np.asarray(instance.task_difficulty, dtype=np.int64) >= 4
+        self.slot_day = np.asarray(instance.slot_day, dtype=np.int64)
+        self.slot_period = np.asarray(instance.slot_period, dtype=np.int64)
+        self.slot_run = np.asarray(instance.slot_run, dtype=np.int64)
+        self.offsets = np.arange(max(instance.task_length, default=1), dtype=np.int64)
+
+    def encode(self, candidates: list[dict[str, tuple[str, int, str]]]) -> tuple[Any, Any]:
+        instance = self.instance
+        slot_index = instance.slot_index
+        room_index = {name: room_id for room_id, name in enumerate(instance.rooms)}
+        starts = self.np.empty((len(candidates), len(instance.task_ids)), dtype=self.np.int64)
+        rooms = self.np.empty_like(starts)
+        for row, candidate in enumerate(candidates):
+            assignments = list(map(candidate.__getitem__, instance.task_ids))
+            row_starts = [slot_index.get((day, period), -1) for day, period, _ in assignments]
+            if -1 in row_starts:
+                task = row_starts.index(-1)
+                day, period, _ = assignments[task]
+                raise ValueError(f"{instance.task_ids[task]} starts outside the slot matrix: {day} {period}")
+            starts[row] = row_starts
+            rooms[row] = [room_index[room] for _, _, room in assignments]
+        return starts, rooms
+
+    def score(self, candidates: list[dict[str, tuple[str, int, str]]]) -> list[PenaltyScore]:
+        if not candidates:
+            return []
+        penalties = self.penalties(*self.encode(candidates))
+        return [
+            PenaltyScore(*(int(value) for value in row))
+            for row in zip(penalties["hard"], penalties["spread"], penalties["fatigue"], penalties["heavy"])
+        ]
+
+    def penalties(self, starts: Any, rooms: Any) -> dict[str, Any]:
+        np = self.np
+        instance = self.instance
+        count, blocks = starts.shape
+        slot_count = instance.slot_count
+        day_count = len(instance.days)
+        candidate = np.broadcast_to(np.arange(count, dtype=np.int64)[:, None], starts.shape)
+
+        # Hard: periods past the end of the day, plus every extra occupant of a
+        # (resource, slot) pair, per resource kind.
+        covered = np.minimum(self.task_length[None, :], self.slot_run[starts])
+        hard = (self.task_length[None, :] - covered).sum(axis=1)
+        valid = self.offsets[None, None, :] < covered[:, :, None]
+        slot_ids = (starts[:, :, None] + self.offsets[None, None, :])[valid]
+        owners = candidate[:, :, None].repeat(len(self.offsets), axis=2)[valid]
+        for resource, resource_count in (
+            (np.broadcast_to(self.task_faculty[None, :], starts.shape), len(instance.faculty)),
+            (rooms, len(instance.rooms)),
+            (np.broadcast_to(self.task_section[None, :], starts.shape), len(instance.sections)),
+        ):
+            ids = resource[:, :, None].repeat(len(self.offsets), axis=2)[valid]
+            keys = (owners * resource_count + ids) * slot_count + slot_ids
+            occupancy = np.bincount(keys, minlength=count * resource_count * slot_count).reshape(count, -1)
+            hard += np.maximum(occupancy - 1, 0).sum(axis=1)
+
+        days = self.slot_day[starts]
+        # Spread: courses taught on exactly one day.
+        course_days = np.bincount(
+            ((candidate * len(instance.courses) + self.task_course[None, :]) * day_count + days).ravel(),
+            minlength=count * len(instance.courses) * day_count,
+        ).reshape(count, len(instance.courses), day_count)
+        spread = ((course_days > 0).sum(axis=2) == 1).sum(axis=1) * 15
+
+        section_day = (candidate * len(instance.sections) + self.task_section[None, :]) * day_count + days
+        # Heavy subjects: more than two difficulty >= 4 blocks on a section's day.
+        heavy_counts = np.bincount(
+            section_day[:, self.heavy].ravel(), minlength=count * len(instance.sections) * day_count
+        ).reshape(count, -1)
+        heavy = (np.maximum(heavy_counts - 2, 0) * 6).sum(axis=1)
+
+        # Fatigue: each start that extends a run of consecutive periods past three.
+        groups = section_day.ravel()
+        periods = self.slot_period[starts].ravel()
+        order = np.lexsort((periods, groups))
+        groups, periods = groups[order], periods[order]
+        step = np.zeros(groups.size, dtype=bool)
+        step[1:] = (groups[1:] == groups[:-1]) & (periods[1:] == periods[:-1] + 1)
+        index = np.arange(groups.size)
+        run = index - np.maximum.accumulate(np.where(step, 0, index))
+        tired = groups[run >= 3] // (len(instance.sections) * day_count)
+        fatigue = np.bincount(tired, minlength=count) * 8
+
+        return {"hard": hard, "spread": spread, "fatigue": fatigue, "heavy": heavy}
@@ -0,0 +1,243 @@
+"""Scheduler benchmark runner.
+
+    python -m app.scheduler.benchmark --tiers small,medium --output bench.json
+    python -m app.scheduler.benchmark --baseline bench.json
+
+Times `run_scheduler` (and `SchedulerEngine.generate` when it can be
+imported) on synthetic institutions of increasing size, writes the
+measurements as JSON and, given a baseline report, exits non-zero when a
+tier got slower, used more memory or produced a worse timetable.
+"""
+from __future__ import annotations
+
+import argparse
+from datetime import datetime, timezone
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from .engine import run_scheduler
+from .synthetic import SyntheticInstitution, generate_institution
+
+# Roughly 80% of each section's week is booked; rooms and faculty are
+# scaled so every tier is feasible but not trivially so. Elective groups
+# span one or two departments (4-8 sections), since every member section
+# needs its own room while the group meets.
+TIERS: dict[str, dict[str, int]] = {
+    "small": {"sections": 8, "faculty": 20, "rooms": 7, "labs": 3, "elective_groups": 2},
+    "medium": {"sections": 24, "faculty": 60, "rooms": 20, "labs": 8, "elective_groups": 6},
+    "large": {"sections": 64, "faculty": 160, "rooms": 52, "labs": 20, "elective_groups": 8},
+    "xlarge": {"sections": 160, "faculty": 400, "rooms": 130, "labs": 50, "elective_groups": 20},
+}
+
+ENGINES = ("run_scheduler", "scheduler_engine")
+
+
+def _measure(solve: Callable[[], dict[str, Any]], repeats: int) -> dict[str, Any]:
+    """Best wall time over `repeats` untraced runs, plus one traced run for peak memory."""
+    timings: list[float] = []
+    outcome: dict[str, Any] = {}
+    for _ in range(repeats):
+        started = time.perf_counter()
+        outcome = solve()
+        timings.append(time.perf_counter() - started)
+    tracemalloc.start()
+    try:
+        solve()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "wall_s": round(min(timings), 4),
+        "wall_s_runs": [round(t, 4) for t in timings],
+        "peak_mb": round(peak / 2**20, 2),
+        **outcome,
+    }
+
+
+def _bench_run_scheduler(institution: SyntheticInstitution, options: dict[str, Any]) -> Callable[[], dict[str, Any]]:
+    def solve() -> dict[str, Any]:
+        result = run_scheduler(
+            tenant_id="benchmark",
+            sections=institution.sections,
+            rooms=institution.rooms,
+            room_types=institution.room_types,
+            admin=institution.admin,
+            **options,
+        )
+        return {
+            "fitness": result.fitness_score,
+            "unscheduled_periods": institution.demanded_periods - len(result.timetable),
+            "conflict_count": result.conflict_count,
+            "stop_reason": result.stop_reason,
+        }
+
+    return solve
+
+
+def _bench_scheduler_engine(institution: SyntheticInstitution, options: dict[str, Any]) -> Callable[[], dict[str, Any]]:
+    # SchedulerEngine gives every section the same subject list, so each
+    # department (sections sharing a curriculum) is one generate() call; the
+    # subject's faculty is taken from the department's first section.
+    from ..scheduler_engine import SchedulerEngine
+    from ..schemas import AdminConfig, RoomSpec, SubjectSpec
+
+    departments: dict[str, list[str]] = {}
+    curricula: dict[str, list[SubjectSpec]] = {}
+    for section in institution.sections:
+        department = section.section.split("-")[0]
+        departments.setdefault(department, []).append(section.section)
+        if department not in curricula:
+            curricula[department] = [
+                SubjectSpec(
+                    subject=subject.code,
+                    ltp=tuple(int(hours) for hours in subject.ltp.split("-")),
+                    faculty_id=subject.faculty_id,
+                    lab_block_size=subject.lab_block_size,
+                )
+                for subject in section.subjects
+                if not subject.elective_group
+            ]
+    rooms = [RoomSpec(name=room, is_lab=institution.room_types[room] == "LAB") for room in institution.rooms]
+    config = AdminConfig(hours_per_day=institution.admin.hours_per_day, days=institution.admin.working_days)
+    ga_config = {
+        "population_size": options.get("population_size", 20),
+        "generations": options.get("generations", 20),
+    }
+
+    def solve() -> dict[str, Any]:
+        engine = SchedulerEngine(seed=options.get("seed") or 0)
+        fitness: list[float] = []
+        hard_penalty = 0
+        for department, sections in departments.items():
+            _, breakdown, _ = engine.generate(sections, curricula[department], rooms, config, ga_config)
+            fitness.append(breakdown.final_score)
+            hard_penalty += breakdown.hard_penalty
+        return {
+            "fitness": round(sum(fitness) / len(fitness), 2),
+            "hard_penalty": hard_penalty,
+            "departments": len(departments),
+        }
+
+    return solve
+
+
+def run_benchmarks(
+    tiers: list[str],
+    engines: list[str],
+    repeats: int = 3,
+    seed: int = 0,
+    options: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Benchmark every tier/engine pair and return the JSON-ready report."""
+    unknown = [tier for tier in tiers if tier not in TIERS] + [engine for engine in engines if engine not in ENGINES]
+    if unknown:
+        raise ValueError(f"Unknown tier or engine: {', '.join(unknown)}")
+    options = {"seed": seed, **(options or {})}
+    results: list[dict[str, Any]] = []
+    for tier in tiers:
+        institution = generate_institution(subjects_per_section=7, seed=seed, **TIERS[tier])
+        for engine in engines:
+            record: dict[str, Any] = {
+                "tier": tier,
+                "engine": engine,
+                "sections": len(institution.sections),
+                "demanded_periods": institution.demanded_periods,
+            }
+            try:
+                if engine == "run_scheduler":
+                    solve = _bench_run_scheduler(institution, options)
+                else:
+                    solve = _bench_scheduler_engine(institution, options)
+            except ImportError as exc:
+                record["skipped"] = f"{engine} unavailable: {exc}"
+            else:
+                record.update(_measure(solve, repeats))
+            results.append(record)
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "repeats": repeats,
+            "seed": seed,
+            "options": options,
+        },
+        "results": results,
+    }
+
+
+def compare_to_baseline(report: dict[str, Any], baseline: dict[str, Any], tolerance: float = 0.2) -> list[str]:
+    """Regressions of `report` against `baseline`, matched by (tier, engine).
+
+    Wall time and peak memory regress when they grow by more than
+    `tolerance` (a fraction); fitness when it drops and unscheduled periods
+    when they rise at all, since runs with equal seeds are deterministic.
+    """
+    previous = {(r["tier"], r["engine"]): r for r in baseline.get("results", []) if "skipped" not in r}
+    regressions: list[str] = []
+    for record in report["results"]:
+        before = previous.get((record["tier"], record["engine"]))
+        if before is None or "skipped" in record:
+            continue
+        label = f"{record['tier']}/{record['engine']}"
+        for metric in ("wall_s", "peak_mb"):
+            if before.get(metric) and record[metric] > before[metric] * (1 + tolerance):
+                regressions.append(f"{label}: {metric} {before[metric]} -> {record[metric]}")
+        if record.get("fitness") is not None and before.get("fitness") is not None and record["fitness"] < before["fitness"]:
+            regressions.append(f"{label}: fitness {before['fitness']} -> {record['fitness']}")
+        if record.get("unscheduled_periods", 0) > before.get("unscheduled_periods", 0):
+            regressions.append(
+                f"{label}: unscheduled_periods {before.get('unscheduled_periods', 0)} -> {record['unscheduled_periods']}"
+            )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tiers", default="small,medium", help=f"comma-separated, from {', '.join(TIERS)}")
+    parser.add_argument("--engines", default=",".join(ENGINES), help=f"comma-separated, from {', '.join(ENGINES)}")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--population-size", type=int, default=20)
+    parser.add_argument("--generations", type=int, default=20)
+    parser.add_argument("--output", help="write the report to this JSON file")
+    parser.add_argument("--baseline", help="compare against this earlier report")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative slowdown / memory growth")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(
+        tiers=args.tiers.split(","),
+        engines=args.engines.split(","),
+        repeats=args.repeats,
+        seed=args.seed,
+        options={"population_size": args.population_size, "generations": args.generations},
+    )
+    for record in report["results"]:
+        if "skipped" in record:
+            print(f"{record['tier']:>7} {record['engine']:<17} skipped ({record['skipped']})")
+        else:
+            print(
+                f"{record['tier']:>7} {record['engine']:<17} {record['wall_s']:>8.3f}s {record['peak_mb']:>8.1f} MB"
+                f"  fitness {record['fitness']}  unscheduled {record.get('unscheduled_periods', '-')}"
+            )
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump(report, handle, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as handle:
+            regressions = compare_to_baseline(report, json.load(handle), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
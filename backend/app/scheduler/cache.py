@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .engine import Candidate
+
+
+class CandidateCache:
+    """Bounded LRU memo of constructed candidates keyed by construction seed."""
+
+    def __init__(self, max_size: int = 128) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[int, Candidate] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, seed: int) -> Candidate | None:
+        candidate = self._entries.get(seed)
+        if candidate is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(seed)
+        self.hits += 1
+        return candidate
+
+    def put(self, seed: int, candidate: Candidate) -> None:
+        if self.max_size <= 0:
+            return
+        self._entries[seed] = candidate
+        self._entries.move_to_end(seed)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+        }
@@ -0,0 +1,321 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+import random
+import time
+from typing import TYPE_CHECKING, Any, Callable, Literal
+
+from .occupancy import RoomIndex, block_mask
+
+if TYPE_CHECKING:
+    from .engine import SessionTask
+
+CSPStatus = Literal["solved", "infeasible", "budget_exhausted", "cancelled"]
+
+# Backtracks allowed when the caller sets no bound. Solvable instances rarely
+# need any, while a tight one can backtrack for hours (~1 ms each at 400 units).
+DEFAULT_MAX_BACKTRACKS = 1000
+# Search steps between calls to `should_stop`.
+STOP_CHECK_INTERVAL = 256
+
+
+@dataclass
+class CSPResult:
+    status: CSPStatus
+    genes: dict[str, tuple[int, str]]
+    stats: dict[str, Any] = field(default_factory=dict)
+
+
+def build_units(tasks: list[SessionTask]) -> list[list[SessionTask]]:
+    """Split tasks into CSP variables.
+
+    Every independent task is its own unit. Elective-group tasks are unified
+    by occurrence: the n-th session of a given kind of every member subject
+    in a group must start together, so each such set becomes one unit.
+    """
+    units: list[list[SessionTask]] = []
+    synced: dict[tuple[str, str, int], list[SessionTask]] = {}
+    occurrence: dict[tuple[str, str, str, str], int] = defaultdict(int)
+    for task in tasks:
+        if not task.elective_group:
+            units.append([task])
+            continue
+        member_key = (task.elective_group, task.section, task.subject_code, task.kind)
+        key = (task.elective_group, task.kind, occurrence[member_key])
+        occurrence[member_key] += 1
+        if key not in synced:
+            synced[key] = []
+            units.append(synced[key])
+        synced[key].append(task)
+    return units
+
+
+def overloaded_resources(
+    tasks: list[SessionTask],
+    day_periods: dict[str, int],
+    rooms: list[str],
+    room_types: dict[str, str],
+) -> list[str]:
+    """Resources whose demanded periods cannot fit in the week, a cheap necessary condition.
+
+    A resource whose sessions all have length L can use at most
+    floor(periods / L) * L periods of a day; with mixed lengths the bound is
+    the whole day. Room types multiply that by their number of rooms.
+    """
+    demand: dict[tuple[str, str], list[int]] = defaultdict(list)
+    for task in tasks:
+        demand[("faculty", task.faculty_id)].append(task.duration)
+        demand[("section", task.section)].append(task.duration)
+        demand[("room type", task.room_type)].append(task.duration)
+    room_counts: dict[str, int] = defaultdict(int)
+    for room in dict.fromkeys(rooms):
+        room_counts[room_types.get(room, "CLASSROOM")] += 1
+
+    overloaded: list[str] = []
+    for (kind, name), durations in demand.items():
+        lengths = set(durations)
+        length = lengths.pop() if len(lengths) == 1 else 1
+        capacity = sum(periods // length * length for periods in day_periods.values())
+        if kind == "room type":
+            capacity *= room_counts[name]
+        if sum(durations) > capacity:
+            overloaded.append(f"{kind} {name} needs {sum(durations)} periods, at most {capacity} available")
+    return overloaded
+
+
+def solve_csp(
+    tasks: list[SessionTask],
+    slots: list[tuple[str, int]],
+    day_periods: dict[str, int],
+    rooms: list[str],
+    room_types: dict[str, str],
+    start_slots: dict[int, list[int]],
+    time_budget_ms: float | None = None,
+    max_backtracks: int | None = DEFAULT_MAX_BACKTRACKS,
+    seed: int | None = 0,
+    preferred: dict[str, tuple[int, str]] | None = None,
+    should_stop: Callable[[], bool] | None = None,
+) -> CSPResult:
+    """Complete hard-constraint search: FC-CBJ over start-slot bitmask domains.
+
+    Variables are the units from `build_units`; a unit's domain is the bitmask
+    of start slot ids at which every member's block fits inside its day.
+    Assigning a unit forward-checks all units that share a faculty or section
+    with it, and records which assignment pruned each domain so that a dead
+    end backjumps straight to the deepest culprit (conflict-directed
+    backjumping). Variables are chosen smallest-domain first, ties broken by
+    constraint degree. Rooms are taken from RoomIndex at assignment time;
+    rooms of one type are treated as interchangeable, so the search is
+    complete up to the choice of room within a type. Units whose tasks
+    all have `preferred` genes at one start are assigned first and try that
+    start first; their tasks keep their preferred rooms while those are free.
+    `should_stop` is polled every STOP_CHECK_INTERVAL steps; once it returns
+    True the search ends with status "cancelled" and the partial assignment.
+    """
+    rng = random.Random(seed)
+    started = time.monotonic()
+    slot_count = len(slots)
+    units = build_units(tasks)
+    count = len(units)
+
+    def empty_result(status: CSPStatus, **extra: Any) -> CSPResult:
+        return CSPResult(status=status, genes={}, stats={"units": count, **extra})
+
+    if count == 0:
+        return empty_result("solved", backtracks=0, max_depth=0)
+
+    overloaded = overloaded_resources(tasks, day_periods, rooms, room_types)
+    if overloaded:
+        return empty_result("infeasible", reason="; ".join(overloaded))
+
+    # Initial domains: starts valid for every member duration.
+    domains: list[int] = []
+    for unit in units:
+        members_free = len({t.faculty_id for t in unit}) == len(unit) and len({t.section for t in unit}) == len(unit)
+        mask = -1 if members_free else 0
+        for task in unit:
+            mask &= sum(1 << slot_id for slot_id in start_slots.get(task.duration, []))
+        domains.append(mask if mask > 0 else 0)
+    if any(domain == 0 for domain in domains):
+        return empty_result("infeasible", reason="unit without any valid start")
+
+    # Constraint graph: for each neighbor pair, the (my duration, their duration)
+    # pairs of members sharing a faculty or section.
+    by_resource: dict[tuple[str, str], list[tuple[int, int]]] = defaultdict(list)
+    for index, unit in enumerate(units):
+        for task in unit:
+            by_resource[("faculty", task.faculty_id)].append((index, task.duration))
+            by_resource[("section", task.section)].append((index, task.duration))
+    overlaps: list[dict[int, set[tuple[int, int]]]] = [defaultdict(set) for _ in range(count)]
+    for members in by_resource.values():
+        for index, duration in members:
+            for other, other_duration in members:
+                if other != index:
+                    overlaps[index][other].add((duration, other_duration))
+    degree = [len(neighbors) for neighbors in overlaps]
+
+    room_index = RoomIndex(rooms, room_types, slot_count)
+    trail: list[tuple] = []
+    sizes = [domain.bit_count() for domain in domains]
+    past_fc: list[tuple[int, ...]] = [()] * count
+    assignment: list[tuple[int, tuple[str, ...]] | None] = [None] * count
+    depth_of = [-1] * count
+    unassigned = set(range(count))
+    by_room_type: dict[str, list[int]] = defaultdict(list)
+    for index, unit in enumerate(units):
+        for task in unit:
+            by_room_type[task.room_type].append(index)
+
+    def set_value(store: list, key: int, value: Any) -> None:
+        trail.append((store, key, store[key]))
+        store[key] = value
+
+    def undo(mark: int) -> None:
+        while len(trail) > mark:
+            store, key, previous = trail.pop()
+            store[key] = previous
+
+    # A unit prefers a start when all its tasks have a preferred gene there.
+    # Those units go first, so a still-valid prior timetable is rebuilt
+    # before anything else can take its slots.
+    preferred_start: list[int | None] = [None] * count
+    for index, unit in enumerate(units):
+        starts = {preferred[task.task_id][0] if task.task_id in preferred else None for task in unit} if preferred else {None}
+        if len(starts) == 1:
+            preferred_start[index] = starts.pop()
+    unpreferred = [int(start is None) for start in preferred_start]
+
+    def select() -> int:
+        return min(unassigned, key=lambda u: (unpreferred[u], sizes[u], -degree[u], u))
+
+    def ordered_values(index: int) -> list[int]:
+        domain = domains[index]
+        values = []
+        while domain:
+            low = domain & -domain
+            values.append(low.bit_length() - 1)
+            domain ^= low
+        rng.shuffle(values)
+        start = preferred_start[index]
+        if start is not None and domains[index] >> start & 1:
+            # Values are popped from the end.
+            values.remove(start)
+            values.append(start)
+        return values
+
+    def room_culprits(index: int, start: int) -> set[int]:
+        culprits: set[int] = set()
+        for task in units[index]:
+            span = block_mask(start, task.duration)
+            for other in by_room_type[task.room_type]:
+                placed = assignment[other]
+                if placed is None or other == index:
+                    continue
+                if any(block_mask(placed[0], t.duration) & span for t in units[other] if t.room_type == task.room_type):
+                    culprits.add(other)
+        return culprits
+
+    def assign(index: int, start: int, conflicts: set[int]) -> bool:
+        unit = units[index]
+        chosen: list[str] = []
+        for task in unit:
+            gene = preferred.get(task.task_id) if preferred else None
+            if gene is not None and gene[0] == start and room_index.is_free(gene[1], task.room_type, start, task.duration):
+                room = gene[1]
+            else:
+                room = room_index.find(task.room_type, start, task.duration)
+            if room is None:
+                conflicts.update(room_culprits(index, start))
+                return False
+            room_index.occupy(room, start, task.duration, trail)
+            chosen.append(room)
+        set_value(assignment, index, (start, tuple(chosen)))
+
+        for other, pairs in overlaps[index].items():
+            if assignment[other] is not None:
+                continue
+            removal = 0
+            for duration, other_duration in pairs:
+                low = max(0, start - other_duration + 1)
+                removal |= block_mask(low, start + duration - low)
+            pruned = domains[other] & ~removal
+            if pruned == domains[other]:
+                continue
+            set_value(domains, other, pruned)
+            set_value(sizes, other, pruned.bit_count())
+            set_value(past_fc, other, past_fc[other] + (index,))
+            if not pruned:
+                conflicts.update(u for u in past_fc[other] if u != index)
+                return False
+        return True
+
+    # Iterative FC-CBJ. Each frame: [unit, values left to try, conflict set, mark before current value].
+    frames: list[list[Any]] = []
+    backtracks = 0
+    best_depth = 0
+
+    def push(index: int) -> None:
+        unassigned.discard(index)
+        depth_of[index] = len(frames)
+        frames.append([index, ordered_values(index), set(), len(trail)])
+
+    def current_genes() -> dict[str, tuple[int, str]]:
+        genes: dict[str, tuple[int, str]] = {}
+        for index, placed in enumerate(assignment):
+            if placed is not None:
+                start, chosen = placed
+                for task, room in zip(units[index], chosen):
+                    genes[task.task_id] = (start, room)
+        return genes
+
+    push(select())
+    steps = 0
+    while frames:
+        steps += 1
+        if should_stop is not None and steps % STOP_CHECK_INTERVAL == 0 and should_stop():
+            return CSPResult("cancelled", current_genes(), {"units": count, "backtracks": backtracks, "max_depth": best_depth})
+        if time_budget_ms is not None and (time.monotonic() - started) * 1000 >= time_budget_ms:
+            return CSPResult("budget_exhausted", current_genes(), {"units": count, "backtracks": backtracks, "max_depth": best_depth})
+        if max_backtracks is not None and backtracks > max_backtracks:
+            return CSPResult("budget_exhausted", current_genes(), {"units": count, "backtracks": backtracks, "max_depth": best_depth})
+
+        frame = frames[-1]
+        index, values, conflicts, _ = frame
+        placed = False
+        while values:
+            start = values.pop()
+            mark = len(trail)
+            frame[3] = mark
+            if assign(index, start, conflicts):
+                placed = True
+                break
+            undo(mark)
+
+        if placed:
+            best_depth = max(best_depth, len(frames))
+            if not unassigned:
+                return CSPResult(
+                    "solved",
+                    current_genes(),
+                    {"units": count, "backtracks": backtracks, "max_depth": best_depth},
+                )
+            push(select())
+            continue
+
+        # Dead end: jump back to the deepest assigned unit responsible.
+        backtracks += 1
+        jump_set = (conflicts | set(past_fc[index])) - {index}
+        if not jump_set:
+            return empty_result("infeasible", backtracks=backtracks, max_depth=best_depth)
+        target = max(jump_set, key=lambda u: depth_of[u])
+        while frames and frames[-1][0] != target:
+            popped = frames.pop()
+            undo(popped[3])
+            unassigned.add(popped[0])
+            depth_of[popped[0]] = -1
+        target_frame = frames[-1]
+        undo(target_frame[3])
+        target_frame[2].update(jump_set - {target})
+
+    return empty_result("infeasible", backtracks=backtracks, max_depth=best_depth)
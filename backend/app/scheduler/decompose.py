@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from .csp import overloaded_resources
+
+if TYPE_CHECKING:
+    from .engine import PreprocessedData, SessionTask
+
+
+@dataclass
+class Component:
+    sections: list[str]
+    tasks: list[SessionTask]
+    rooms: list[str]
+
+
+def _apportion(total: int, demands: list[int]) -> list[int]:
+    """Split `total` items by largest remainder, giving every non-zero demand at least one."""
+    needing = [i for i, demand in enumerate(demands) if demand]
+    shares = [0] * len(demands)
+    if len(needing) > total:
+        return shares
+    for i in needing:
+        shares[i] = 1
+    spare = total - len(needing)
+    overall = sum(demands)
+    if not spare or not overall:
+        return shares
+    quotas = {i: spare * demands[i] / overall for i in needing}
+    for i, quota in quotas.items():
+        shares[i] += int(quota)
+    leftover = total - sum(shares)
+    for i in sorted(needing, key=lambda i: int(quotas[i]) - quotas[i])[:leftover]:
+        shares[i] += 1
+    return shares
+
+
+def split_components(
+    preprocessed: PreprocessedData,
+    sections: list[str],
+    rooms: list[str],
+    room_types: dict[str, str],
+) -> list[Component]:
+    """Split a tenant into sub-problems that can be solved independently.
+
+    Sections are joined when they share a faculty member or an elective
+    group. Rooms are one shared pool per room type, so each component is
+    given a slice of every pool proportional to the periods it books there.
+    When that slicing would leave some component short of rooms that the
+    whole tenant has (by the load bound in `overloaded_resources`), the
+    tenant is returned as a single component instead.
+    """
+    parent = {section: section for section in sections}
+    for task in preprocessed.tasks:
+        parent.setdefault(task.section, task.section)
+
+    def find(section: str) -> str:
+        while parent[section] != section:
+            parent[section] = parent[parent[section]]
+            section = parent[section]
+        return section
+
+    first_by_key: dict[tuple[str, str], str] = {}
+    for task in preprocessed.tasks:
+        keys = [("faculty", task.faculty_id)]
+        if task.elective_group:
+            keys.append(("group", task.elective_group))
+        for key in keys:
+            other = first_by_key.setdefault(key, task.section)
+            parent[find(task.section)] = find(other)
+
+    members: dict[str, list[str]] = defaultdict(list)
+    for section in parent:
+        members[find(section)].append(section)
+    tasks_by_root: dict[str, list[SessionTask]] = defaultdict(list)
+    for task in preprocessed.tasks:
+        tasks_by_root[find(task.section)].append(task)
+
+    roots = list(members)
+    whole = [Component(sections=list(sections), tasks=preprocessed.tasks, rooms=list(rooms))]
+    if len(roots) < 2:
+        return whole
+
+    pools: dict[str, list[str]] = defaultdict(list)
+    for room in dict.fromkeys(rooms):
+        pools[room_types.get(room, "CLASSROOM")].append(room)
+    component_rooms: list[list[str]] = [[] for _ in roots]
+    for room_type, pool in pools.items():
+        demands = [
+            sum(task.duration for task in tasks_by_root[root] if task.room_type == room_type) for root in roots
+        ]
+        taken = 0
+        for index, share in enumerate(_apportion(len(pool), demands)):
+            component_rooms[index].extend(pool[taken : taken + share])
+            taken += share
+
+    overloaded_room_types = {
+        issue for issue in overloaded_resources(preprocessed.tasks, preprocessed.day_periods, rooms, room_types)
+        if issue.startswith("room type")
+    }
+    components: list[Component] = []
+    for root, assigned_rooms in zip(roots, component_rooms):
+        tasks = tasks_by_root[root]
+        short = [
+            issue
+            for issue in overloaded_resources(tasks, preprocessed.day_periods, assigned_rooms, room_types)
+            if issue.startswith("room type")
+        ]
+        if short and not overloaded_room_types:
+            return whole
+        components.append(Component(sections=members[root], tasks=tasks, rooms=assigned_rooms))
+    return components
@@ -1,10 +1,24 @@
 from __future__ import annotations
 
+from array import array
 from collections import defaultdict
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+import hashlib
 import random
-from typing import Any
+import time
+from typing import Any, Callable, Container, Iterator, Literal
 
+from .cache import CandidateCache
+from .csp import solve_csp
+from .decompose import Component, split_components
+from .local_search import LocalSearchMethod, improve_genes
+from .instance import ProblemInstance
+from .occupancy import InstanceGrid, block_mask
+from .ordering import DSaturQueue, TaskOrdering, order_tasks
+from .profiling import ProfileHook, Profiler, phase
+from .strategy import choose_strategy, profile_instance
+from .warm_start import genes_from_timetable
 from ..schemas import (
     ConflictRecord,
     SchedulerAdminConfig,
@@ -29,12 +43,35 @@ class SessionTask:
 
 @dataclass
 class Candidate:
-    entries: list[TimetableEntry]
-    conflicts: list[ConflictRecord]
+    """A constructed timetable in compact form; see `materialize` for the response models.
+
+    `genes` maps each placed task id to its (start slot id, room);
+    `clashed_tasks` are the tasks that could not be placed without a hard
+    clash, each reported as one conflict.
+    """
+
     unscheduled_tasks: list[str]
+    clashed_tasks: list[str]
     hard_violations: dict[str, int]
     soft_score: float
     fitness: float
+    genes: dict[str, tuple[int, str]]
+
+
+@dataclass
+class SearchStats:
+    generations_run: int = 0
+    stop_reason: str = "generations"
+    elapsed_ms: float = 0.0
+    local_search: dict[str, Any] | None = None
+
+
+Solver = Literal["ga", "csp", "auto"]
+
+# Called once per generation with a progress snapshot (and periodically with
+# {"phase": "csp", "elapsed_ms": ...} while the CSP runs); returning False
+# stops the search with stop reason "cancelled".
+ProgressCallback = Callable[[dict[str, Any]], bool | None]
 
 
 @dataclass
@@ -43,6 +80,7 @@ class PreprocessedData:
     slots: list[tuple[str, int]]
     day_periods: dict[str, int]
     preprocessing_conflicts: list[str]
+    start_slots: dict[int, list[int]] = field(default_factory=dict)
 
 
 def parse_ltp(ltp: str) -> tuple[int, int, int]:
@@ -67,6 +105,18 @@ def build_slot_matrix(admin: SchedulerAdminConfig) -> tuple[list[tuple[str, int]
     return slots, day_periods
 
 
+def build_start_slot_table(
+    slots: list[tuple[str, int]],
+    day_periods: dict[str, int],
+    durations: set[int],
+) -> dict[int, list[int]]:
+    """Slot ids at which a block of each duration fits before the end of its day."""
+    return {
+        duration: [slot_id for slot_id, (day, period) in enumerate(slots) if period + duration - 1 <= day_periods[day]]
+        for duration in sorted(durations)
+    }
+
+
 def subject_to_tasks(
     section: str,
     subject: SchedulerSubjectInput,
@@ -151,16 +201,13 @@ def preprocess(sections: list[SchedulerSectionInput], admin: SchedulerAdminConfi
             all_tasks.extend(tasks)
             issues.extend(subject_issues)
 
-    return PreprocessedData(tasks=all_tasks, slots=slots, day_periods=day_periods, preprocessing_conflicts=issues)
-
-
-def _find_room(room_type: str, rooms: list[str], room_types: dict[str, str], room_usage: dict[tuple[str, str, int], str], day: str, period: int) -> str | None:
-    for room in rooms:
-        if room_types.get(room, "CLASSROOM") != room_type:
-            continue
-        if (room, day, period) not in room_usage:
-            return room
-    return None
+    return PreprocessedData(
+        tasks=all_tasks,
+        slots=slots,
+        day_periods=day_periods,
+        preprocessing_conflicts=issues,
+        start_slots=build_start_slot_table(slots, day_periods, {task.duration for task in all_tasks}),
+    )
 
 
 def generate_candidate(
@@ -171,15 +218,45 @@ def generate_candidate(
     rooms: list[str],
     room_types: dict[str, str],
     seed: int,
+    inherited: dict[str, tuple[int, str]] | None = None,
+    task_ordering: TaskOrdering = "input",
+    start_slots: dict[int, list[int]] | None = None,
+    profiler: Profiler | None = None,
+    instance: ProblemInstance | None = None,
 ) -> Candidate:
+    """Build one timetable, optionally seeded with inherited (start slot id, room) genes.
+
+    Inherited genes are placed first, exactly where the parent had them; tasks
+    whose gene is missing or now clashes are re-placed by the randomized
+    construction below. A `profiler` gets the time spent on setup plus
+    inherited genes, elective groups and remaining tasks, and counts
+    placement attempts and rollbacks.
+
+    Placement runs on the integer ids of `instance` (built from the
+    arguments when not given; `optimize_schedule` builds it once per run),
+    and only the finished candidate's genes are decoded back to names.
+    """
     rng = random.Random(seed)
-    entries: list[TimetableEntry] = []
-    conflicts: list[ConflictRecord] = []
-    unscheduled: list[str] = []
+    if instance is None:
+        instance = ProblemInstance.from_tasks(tasks, slots, rooms, room_types)
+    clashed: list[int] = []
+    unscheduled: list[int] = []
+    genes: list[tuple[int, int, int]] = []
+    attempts = 0
+    rollbacks = 0
+    phase_started = time.perf_counter()
 
-    faculty_usage: dict[tuple[str, str, int], str] = {}
-    section_usage: dict[tuple[str, str, int], str] = {}
-    room_usage: dict[tuple[str, str, int], str] = {}
+    grid = InstanceGrid(instance)
+    if start_slots is None:
+        start_slots = build_start_slot_table(slots, day_periods, {task.duration for task in tasks})
+    task_faculty = instance.task_faculty
+    task_section = instance.task_section
+    task_length = instance.task_length
+    task_room_type = instance.task_room_type
+    slot_run = instance.slot_run
+    faculty_busy = grid.faculty
+    section_busy = grid.section
+    room_ids = {room: room_id for room_id, room in enumerate(instance.rooms)}
 
     elective_buckets: dict[str, list[SessionTask]] = defaultdict(list)
     independent_tasks: list[SessionTask] = []
@@ -189,75 +266,101 @@ def generate_candidate(
         else:
             independent_tasks.append(task)
 
-    def place_task(task: SessionTask, preferred_start: tuple[str, int] | None = None) -> bool:
-        candidate_starts = [preferred_start] if preferred_start else []
-        all_possible: list[tuple[str, int]] = []
-        for day, period in slots:
-            if period + task.duration - 1 <= day_periods[day]:
-                all_possible.append((day, period))
-        rng.shuffle(all_possible)
-        candidate_starts.extend([s for s in all_possible if s not in candidate_starts])
-
-        for day, period in candidate_starts:
-            valid = True
-            local_room_assignments: list[tuple[int, str]] = []
-            for offset in range(task.duration):
-                p = period + offset
-                if (task.faculty_id, day, p) in faculty_usage:
-                    valid = False
-                    break
-                if (task.section, day, p) in section_usage:
-                    valid = False
-                    break
-                room = _find_room(task.room_type, rooms, room_types, room_usage, day, p)
-                if room is None:
-                    valid = False
-                    break
-                local_room_assignments.append((p, room))
+    def try_place(task: int, start: int, room_hint: int = -1) -> bool:
+        nonlocal attempts
+        attempts += 1
+        duration = task_length[task]
+        if slot_run[start] < duration:
+            return False
+        faculty, section = task_faculty[task], task_section[task]
+        if (faculty_busy[faculty] | section_busy[section]) & block_mask(start, duration):
+            return False
 
-            if not valid:
-                continue
+        room_type = task_room_type[task]
+        if room_hint >= 0 and grid.room_is_free(room_hint, room_type, start, duration):
+            room = room_hint
+        else:
+            room = grid.find_room(room_type, start, duration)
+            if room < 0:
+                return False
 
-            for p, room in local_room_assignments:
-                faculty_usage[(task.faculty_id, day, p)] = task.task_id
-                section_usage[(task.section, day, p)] = task.task_id
-                room_usage[(room, day, p)] = task.task_id
-                entries.append(
-                    TimetableEntry(
-                        section=task.section,
-                        day=day,
-                        period=p,
-                        course=task.subject_code,
-                        room=room,
-                        faculty_id=task.faculty_id,
-                    )
-                )
+        grid.occupy(faculty, section, room, start, duration)
+        genes.append((task, start, room))
+        return True
+
+    def try_inherited(task: int) -> bool:
+        gene = inherited.get(instance.task_ids[task]) if inherited else None
+        return gene is not None and try_place(task, gene[0], room_ids.get(gene[1], -1))
+
+    def shuffled_starts(duration: int) -> Iterator[int]:
+        # Lazy Fisher-Yates over the precomputed table: most tasks fit within a
+        # few probes, so only the prefix that is actually visited gets shuffled.
+        pool = list(start_slots[duration])
+        size = len(pool)
+        for i in range(size):
+            j = rng.randrange(i, size)
+            pool[i], pool[j] = pool[j], pool[i]
+            yield pool[i]
+
+    def place_task(task: int, preferred_start: int | None = None) -> bool:
+        if preferred_start is not None and try_place(task, preferred_start):
             return True
+        for start in shuffled_starts(task_length[task]):
+            if start != preferred_start and try_place(task, start):
+                return True
 
-        unscheduled.append(task.task_id)
-        conflicts.append(
-            ConflictRecord(
-                conflict_type="SECTION",
-                message=f"Unable to place task {task.task_id} without hard clash",
-                section=task.section,
-                day="N/A",
-                period=0,
-            )
-        )
+        unscheduled.append(task)
+        clashed.append(task)
         return False
 
-    for _, group_tasks in elective_buckets.items():
-        group_tasks = sorted(group_tasks, key=lambda t: (t.subject_code, t.section))
-        if not group_tasks:
-            continue
+    def take_mark() -> tuple[int, int, int, int]:
+        return grid.mark(), len(unscheduled), len(clashed), len(genes)
+
+    def rollback(mark: tuple[int, int, int, int]) -> None:
+        nonlocal rollbacks
+        rollbacks += 1
+        grid_mark, unscheduled_count, clashed_count, gene_count = mark
+        grid.undo(grid_mark)
+        del unscheduled[unscheduled_count:]
+        del clashed[clashed_count:]
+        del genes[gene_count:]
+
+    def end_phase(name: str) -> None:
+        nonlocal phase_started
+        if profiler is not None:
+            now = time.perf_counter()
+            profiler.record(name, now - phase_started)
+            phase_started = now
+
+    def place_inherited_group(group_tasks: list[int]) -> bool:
+        mark = take_mark()
+        for task in group_tasks:
+            if not try_inherited(task):
+                rollback(mark)
+                return False
+        return True
+
+    pending_groups: list[list[int]] = []
+    for _, group in elective_buckets.items():
+        group_tasks = [
+            instance.task(task.task_id) for task in sorted(group, key=lambda t: (t.subject_code, t.section))
+        ]
+        if group_tasks and not place_inherited_group(group_tasks):
+            pending_groups.append(group_tasks)
+
+    pending_tasks: list[SessionTask] = []
+    for task in independent_tasks:
+        if not try_inherited(instance.task(task.task_id)):
+            pending_tasks.append(task)
+
+    end_phase("construct.inherited")
+    for group_tasks in pending_groups:
         anchor = group_tasks[0]
-        possible = [(d, p) for d, p in slots if p + anchor.duration - 1 <= day_periods[d]]
-        rng.shuffle(possible)
         placed_group = False
-        for start in possible:
-            snapshot = (list(entries), dict(faculty_usage), dict(section_usage), dict(room_usage), list(unscheduled), list(conflicts))
+        for start in shuffled_starts(task_length[anchor]):
+            mark = take_mark()
             if not place_task(anchor, preferred_start=start):
-                entries, faculty_usage, section_usage, room_usage, unscheduled, conflicts = snapshot
+                rollback(mark)
                 continue
             ok = True
             for other in group_tasks[1:]:
@@ -267,28 +370,194 @@ def generate_candidate(
             if ok:
                 placed_group = True
                 break
-            entries, faculty_usage, section_usage, room_usage, unscheduled, conflicts = snapshot
+            rollback(mark)
         if not placed_group:
-            for task in group_tasks:
-                if task.task_id not in unscheduled:
-                    unscheduled.append(task.task_id)
+            listed = set(unscheduled)
+            unscheduled.extend(task for task in group_tasks if task not in listed)
+    end_phase("construct.electives")
 
-    for task in independent_tasks:
-        place_task(task)
+    if task_ordering == "dsatur":
+        start_masks = {duration: sum(1 << slot_id for slot_id in table) for duration, table in start_slots.items()}
+        queue = DSaturQueue([instance.task(task.task_id) for task in pending_tasks], instance, grid, start_masks)
+        for task in queue:
+            if place_task(task):
+                queue.notify_placed(task)
+    else:
+        for task in order_tasks(pending_tasks, task_ordering):
+            place_task(instance.task(task.task_id))
+    end_phase("construct.tasks")
+    if profiler is not None:
+        profiler.count("candidates_built")
+        profiler.count("placement_attempts", attempts)
+        profiler.count("rollbacks", rollbacks)
 
     hard_violations = {
         "unscheduled_tasks": len(unscheduled),
-        "direct_conflicts": len(conflicts),
+        "direct_conflicts": len(clashed),
     }
-    soft_score = max(0.0, 100 - (len(unscheduled) * 12 + len(conflicts) * 4))
-    fitness = soft_score - len(unscheduled) * 20 - len(conflicts) * 6
+    soft_score, fitness = _score(len(unscheduled), len(clashed))
+    task_ids, room_names = instance.task_ids, instance.rooms
     return Candidate(
-        entries=entries,
-        conflicts=conflicts,
-        unscheduled_tasks=unscheduled,
+        unscheduled_tasks=[task_ids[task] for task in unscheduled],
+        clashed_tasks=[task_ids[task] for task in clashed],
         hard_violations=hard_violations,
         soft_score=soft_score,
         fitness=fitness,
+        genes={task_ids[task]: (start, room_names[room]) for task, start, room in genes},
+    )
+
+
+def materialize(
+    candidate: Candidate,
+    tasks: list[SessionTask],
+    slots: list[tuple[str, int]],
+) -> tuple[list[TimetableEntry], list[ConflictRecord]]:
+    """Build the response models for a candidate; only the winner of a run needs them."""
+    by_id = {task.task_id: task for task in tasks}
+    entries: list[TimetableEntry] = []
+    for task_id, (start, room) in candidate.genes.items():
+        task = by_id[task_id]
+        day, period = slots[start]
+        for offset in range(task.duration):
+            entries.append(
+                TimetableEntry(
+                    section=task.section,
+                    day=day,
+                    period=period + offset,
+                    course=task.subject_code,
+                    room=room,
+                    faculty_id=task.faculty_id,
+                )
+            )
+    conflicts = [
+        ConflictRecord(
+            conflict_type="SECTION",
+            message=f"Unable to place task {task_id} without hard clash",
+            section=by_id[task_id].section,
+            day="N/A",
+            period=0,
+        )
+        for task_id in candidate.clashed_tasks
+    ]
+    return entries, conflicts
+
+
+def _score(unscheduled: int, conflicts: int) -> tuple[float, float]:
+    soft_score = max(0.0, 100 - (unscheduled * 12 + conflicts * 4))
+    return soft_score, soft_score - unscheduled * 20 - conflicts * 6
+
+
+def _inheritance_units(tasks: list[SessionTask]) -> list[list[str]]:
+    """Group task ids into the units crossover exchanges: one per elective group, one per section."""
+    units: dict[tuple[str, str], list[str]] = defaultdict(list)
+    for task in tasks:
+        key = ("group", task.elective_group) if task.elective_group else ("section", task.section)
+        units[key].append(task.task_id)
+    return list(units.values())
+
+
+def _crossover(
+    parent_a: Candidate,
+    parent_b: Candidate,
+    units: list[list[str]],
+    mutation_rate: float,
+    rng: random.Random,
+    pinned: Container[str] = (),
+) -> dict[str, tuple[int, str]]:
+    child: dict[str, tuple[int, str]] = {}
+    for unit in units:
+        donor = parent_a if rng.random() < 0.5 else parent_b
+        for task_id in unit:
+            gene = donor.genes.get(task_id)
+            if gene is not None:
+                child[task_id] = gene
+
+    # Dropped genes are re-placed at random by the repair pass, so a small
+    # per-gene rate keeps most parent structure while still moving blockers.
+    for task_id in list(child):
+        if task_id not in pinned and rng.random() < mutation_rate / 10:
+            del child[task_id]
+    return child
+
+
+def _chromosome_seed(chromosome: dict[str, tuple[int, str]], instance: ProblemInstance) -> int:
+    """Stable 64-bit construction seed for a chromosome, so equal chromosomes share a cache entry.
+
+    The chromosome is hashed as (start, room id) pairs in task id order,
+    with -1 for tasks it leaves out.
+    """
+    encoded = array("i", [-1]) * (2 * len(instance.task_ids))
+    task, room = instance.task, instance.room
+    for task_id, (start, room_name) in chromosome.items():
+        index = 2 * task(task_id)
+        encoded[index] = start
+        encoded[index + 1] = room(room_name)
+    digest = hashlib.blake2b(encoded.tobytes(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def _stop_reason(
+    best: Candidate,
+    generations_run: int,
+    generations: int,
+    elapsed_ms: float,
+    time_budget_ms: float | None,
+    stalled: int,
+    stall_generations: int | None,
+    target_fitness: float | None,
+) -> str | None:
+    if not best.unscheduled_tasks and not best.clashed_tasks:
+        return "target_reached"
+    if target_fitness is not None and best.fitness >= target_fitness:
+        return "target_reached"
+    if generations_run >= generations:
+        return "generations"
+    if time_budget_ms is not None and elapsed_ms >= time_budget_ms:
+        return "time_budget"
+    if stall_generations is not None and stalled >= stall_generations:
+        return "stalled"
+    return None
+
+
+# A decomposed run reports the first of its components' stop reasons in this
+# order, so it is only "target_reached" when every component reached it.
+STOP_REASON_PRIORITY = ("cancelled", "time_budget", "stalled", "generations", "target_reached")
+
+
+_WORKER_STATE: dict[str, Any] = {}
+
+
+def _init_candidate_worker(
+    preprocessed: PreprocessedData,
+    sections: list[str],
+    rooms: list[str],
+    room_types: dict[str, str],
+    task_ordering: TaskOrdering,
+) -> None:
+    _WORKER_STATE.update(
+        instance=ProblemInstance.from_tasks(preprocessed.tasks, preprocessed.slots, rooms, room_types),
+        preprocessed=preprocessed,
+        sections=sections,
+        rooms=rooms,
+        room_types=room_types,
+        task_ordering=task_ordering,
+    )
+
+
+def _generate_candidate_in_worker(seed: int, inherited: dict[str, tuple[int, str]] | None) -> Candidate:
+    preprocessed: PreprocessedData = _WORKER_STATE["preprocessed"]
+    return generate_candidate(
+        tasks=preprocessed.tasks,
+        sections=_WORKER_STATE["sections"],
+        slots=preprocessed.slots,
+        day_periods=preprocessed.day_periods,
+        rooms=_WORKER_STATE["rooms"],
+        room_types=_WORKER_STATE["room_types"],
+        seed=seed,
+        inherited=inherited,
+        task_ordering=_WORKER_STATE["task_ordering"],
+        start_slots=preprocessed.start_slots,
+        instance=_WORKER_STATE["instance"],
     )
 
 
@@ -300,54 +569,211 @@ def optimize_schedule(
     population_size: int,
     generations: int,
     mutation_rate: float,
+    workers: int = 1,
+    seed: int | None = None,
+    cache: CandidateCache | None = None,
+    time_budget_ms: float | None = None,
+    stall_generations: int | None = None,
+    target_fitness: float | None = None,
+    stats: SearchStats | None = None,
+    task_ordering: TaskOrdering = "input",
+    local_search: LocalSearchMethod | None = None,
+    local_search_iterations: int = 500,
+    local_search_time_ms: float | None = None,
+    warm_start: dict[str, tuple[int, str]] | None = None,
+    progress: ProgressCallback | None = None,
+    profiler: Profiler | None = None,
 ) -> Candidate:
-    population = [
-        generate_candidate(
-            tasks=preprocessed.tasks,
-            sections=sections,
-            slots=preprocessed.slots,
-            day_periods=preprocessed.day_periods,
-            rooms=rooms,
-            room_types=room_types,
-            seed=i,
-        )
-        for i in range(population_size)
-    ]
+    """Evolve a population of candidates and return the fittest.
+
+    Runs until `generations` is exhausted or, earlier, when a conflict-free
+    timetable with every task placed is found, `target_fitness` is reached,
+    `time_budget_ms` has elapsed or the best fitness has not improved for
+    `stall_generations` generations. The reason is recorded on `stats`.
+
+    With `local_search` set to "sa" or "tabu" and unscheduled tasks left in
+    the winner, a simulated-annealing or tabu pass (see `improve_genes`)
+    then tries to place them within `local_search_iterations` /
+    `local_search_time_ms`.
+
+    `warm_start` genes (see `genes_from_timetable`) seed every initial
+    candidate and are never dropped by mutation or moved by local search,
+    so only the tasks without a valid prior placement are searched over.
 
-    for _ in range(generations):
-        population.sort(key=lambda c: c.fitness, reverse=True)
-        elites = population[: max(2, population_size // 4)]
+    `progress` receives the best candidate's fitness, unscheduled and
+    clashed counts, elapsed time and cache statistics after every
+    generation, including the last one.
 
-        next_population = elites.copy()
-        while len(next_population) < population_size:
-            parent_a = random.choice(elites)
-            parent_b = random.choice(elites)
-            mix_seed = int((parent_a.fitness + parent_b.fitness) * 1000)
-            if random.random() < mutation_rate:
-                mix_seed += random.randint(1, 10_000)
+    `profiler` accumulates construction, sorting, breeding and local search
+    time. Fitness is derived from the placement counts while a candidate is
+    built, so there is no separate evaluation phase. Construction phases
+    and counters are only collected for candidates built in this process.
+    """
+    rng = random.Random(seed)
+    cache = cache if cache is not None else CandidateCache()
+    stats = stats if stats is not None else SearchStats()
+    instance = ProblemInstance.from_tasks(preprocessed.tasks, preprocessed.slots, rooms, room_types)
+    units = _inheritance_units(preprocessed.tasks)
+    pinned = frozenset(warm_start or ())
+    executor: ProcessPoolExecutor | None = None
+    if workers > 1:
+        # Workers receive the preprocessed problem once via the initializer;
+        # afterwards only seeds, inherited genes and finished candidates cross
+        # process boundaries.
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_candidate_worker,
+            initargs=(preprocessed, sections, rooms, room_types, task_ordering),
+        )
 
-            child = generate_candidate(
+    def construct(seeds: list[int], chromosomes: list[dict[str, tuple[int, str]] | None]) -> list[Candidate]:
+        if executor is not None:
+            chunksize = max(1, len(seeds) // (workers * 4))
+            return list(executor.map(_generate_candidate_in_worker, seeds, chromosomes, chunksize=chunksize))
+        return [
+            generate_candidate(
                 tasks=preprocessed.tasks,
                 sections=sections,
                 slots=preprocessed.slots,
                 day_periods=preprocessed.day_periods,
                 rooms=rooms,
                 room_types=room_types,
-                seed=mix_seed,
+                seed=candidate_seed,
+                inherited=chromosome,
+                task_ordering=task_ordering,
+                start_slots=preprocessed.start_slots,
+                profiler=profiler,
+                instance=instance,
+            )
+            for candidate_seed, chromosome in zip(seeds, chromosomes)
+        ]
+
+    def build(seeds: list[int], chromosomes: list[dict[str, tuple[int, str]] | None]) -> list[Candidate]:
+        built: dict[int, Candidate] = {}
+        missing: dict[int, dict[str, tuple[int, str]] | None] = {}
+        for candidate_seed, chromosome in zip(seeds, chromosomes):
+            if candidate_seed in missing:
+                cache.hits += 1
+                continue
+            cached = cache.get(candidate_seed)
+            if cached is not None:
+                built[candidate_seed] = cached
+            else:
+                missing[candidate_seed] = chromosome
+
+        with phase(profiler, "construction"):
+            constructed = construct(list(missing), list(missing.values()))
+        for candidate_seed, candidate in zip(missing, constructed):
+            cache.put(candidate_seed, candidate)
+            built[candidate_seed] = candidate
+        return [built[candidate_seed] for candidate_seed in seeds]
+
+    started = time.monotonic()
+    try:
+        population = build(list(range(population_size)), [warm_start] * population_size)
+        best_fitness = float("-inf")
+        stalled = 0
+
+        while True:
+            with phase(profiler, "sorting"):
+                population.sort(key=lambda c: c.fitness, reverse=True)
+            best = population[0]
+            if best.fitness > best_fitness:
+                best_fitness = best.fitness
+                stalled = 0
+            else:
+                stalled += 1
+
+            stop_reason = _stop_reason(
+                best,
+                generations_run=stats.generations_run,
+                generations=generations,
+                elapsed_ms=(time.monotonic() - started) * 1000,
+                time_budget_ms=time_budget_ms,
+                stalled=stalled,
+                stall_generations=stall_generations,
+                target_fitness=target_fitness,
             )
-            next_population.append(child)
+            if progress is not None:
+                proceed = progress(
+                    {
+                        "generation": stats.generations_run,
+                        "best_fitness": round(best.fitness, 2),
+                        "unscheduled": len(best.unscheduled_tasks),
+                        "conflicts": len(best.clashed_tasks),
+                        "elapsed_ms": round((time.monotonic() - started) * 1000, 2),
+                        "candidate_cache": cache.stats(),
+                    }
+                )
+                if proceed is False and stop_reason is None:
+                    stop_reason = "cancelled"
+            if stop_reason is not None:
+                stats.stop_reason = stop_reason
+                break
 
-        population = next_population
+            elites = population[: max(2, population_size // 4)]
 
-    population.sort(key=lambda c: c.fitness, reverse=True)
-    return population[0]
+            child_seeds: list[int] = []
+            child_chromosomes: list[dict[str, tuple[int, str]] | None] = []
+            with phase(profiler, "breeding"):
+                while len(elites) + len(child_seeds) < population_size:
+                    parent_a = rng.choice(elites)
+                    parent_b = rng.choice(elites)
+                    chromosome = _crossover(parent_a, parent_b, units, mutation_rate, rng, pinned)
+                    child_chromosomes.append(chromosome)
+                    child_seeds.append(_chromosome_seed(chromosome, instance))
 
+            population = elites + build(child_seeds, child_chromosomes)
+            stats.generations_run += 1
+    finally:
+        if executor is not None:
+            executor.shutdown()
 
-def build_constraint_summary(preprocessed: PreprocessedData, candidate: Candidate) -> dict[str, Any]:
+    best = population[0]
+    if local_search is not None and best.unscheduled_tasks:
+        with phase(profiler, "local_search"):
+            genes, stats.local_search = improve_genes(
+                tasks=preprocessed.tasks,
+                genes=best.genes,
+                slots=preprocessed.slots,
+                rooms=rooms,
+                room_types=room_types,
+                start_slots=preprocessed.start_slots,
+                method=local_search,
+                iterations=local_search_iterations,
+                time_budget_ms=local_search_time_ms,
+                seed=rng.getrandbits(32),
+                fixed=pinned,
+            )
+            improved = generate_candidate(
+                tasks=preprocessed.tasks,
+                sections=sections,
+                slots=preprocessed.slots,
+                day_periods=preprocessed.day_periods,
+                rooms=rooms,
+                room_types=room_types,
+                seed=_chromosome_seed(genes, instance),
+                inherited=genes,
+                task_ordering=task_ordering,
+                start_slots=preprocessed.start_slots,
+                instance=instance,
+            )
+        if improved.fitness > best.fitness:
+            best = improved
+
+    stats.elapsed_ms = round((time.monotonic() - started) * 1000, 2)
+    return best
+
+
+def build_constraint_summary(
+    preprocessed: PreprocessedData,
+    candidate: Candidate,
+    conflicts: list[ConflictRecord],
+) -> dict[str, Any]:
     summary = {
-        "faculty_clash": all(c.conflict_type != "FACULTY" for c in candidate.conflicts),
-        "room_clash": all(c.conflict_type != "ROOM" for c in candidate.conflicts),
-        "section_clash": all(c.conflict_type != "SECTION" for c in candidate.conflicts),
+        "faculty_clash": all(c.conflict_type != "FACULTY" for c in conflicts),
+        "room_clash": all(c.conflict_type != "ROOM" for c in conflicts),
+        "section_clash": all(c.conflict_type != "SECTION" for c in conflicts),
         "lab_continuity": len([m for m in preprocessed.preprocessing_conflicts if "contiguous block" in m]) == 0,
         "exact_weekly_fulfillment": len(candidate.unscheduled_tasks) == 0,
         "elective_synchronization": True,
@@ -356,6 +782,117 @@ def build_constraint_summary(preprocessed: PreprocessedData, candidate: Candidat
     return summary
 
 
+def _merge_candidates(candidates: list[Candidate]) -> Candidate:
+    unscheduled = [task_id for c in candidates for task_id in c.unscheduled_tasks]
+    clashed = [task_id for c in candidates for task_id in c.clashed_tasks]
+    hard_violations: dict[str, int] = defaultdict(int)
+    for c in candidates:
+        for key, value in c.hard_violations.items():
+            hard_violations[key] += value
+    soft_score, fitness = _score(len(unscheduled), len(clashed))
+    return Candidate(
+        unscheduled_tasks=unscheduled,
+        clashed_tasks=clashed,
+        hard_violations=dict(hard_violations),
+        soft_score=soft_score,
+        fitness=fitness,
+        genes={task_id: gene for c in candidates for task_id, gene in c.genes.items()},
+    )
+
+
+def _solve(
+    preprocessed: PreprocessedData,
+    sections: list[str],
+    rooms: list[str],
+    room_types: dict[str, str],
+    solver: Solver,
+    cache_size: int,
+    options: dict[str, Any],
+    progress: ProgressCallback | None = None,
+    profiler: Profiler | None = None,
+) -> tuple[Candidate, SearchStats, dict[str, Any]]:
+    """Solve one (sub-)problem; `options` are the optimize_schedule search settings.
+
+    With the CSP, `options["time_budget_ms"]` covers both the CSP and the GA
+    fallback: the GA only gets what the CSP left, and the reported elapsed
+    time includes both. `options["csp_time_budget_ms"]` (set by the "auto"
+    plan) additionally caps the CSP alone.
+    """
+    options = dict(options)
+    csp_time_budget_ms = options.pop("csp_time_budget_ms", None)
+    cache = CandidateCache(max_size=cache_size)
+    stats = SearchStats()
+    csp_stats: dict[str, Any] | None = None
+
+    if solver == "csp":
+        # The CSP either proves a clash-free timetable exists (and returns it)
+        # or gives up; in the latter case the GA still produces a best effort.
+        started = time.monotonic()
+        time_budget_ms = options.get("time_budget_ms")
+        csp_budget = min(
+            (budget for budget in (time_budget_ms, csp_time_budget_ms) if budget is not None), default=None
+        )
+
+        def should_stop() -> bool:
+            assert progress is not None
+            return progress({"phase": "csp", "elapsed_ms": round((time.monotonic() - started) * 1000, 2)}) is False
+
+        with phase(profiler, "csp"):
+            solved = solve_csp(
+                tasks=preprocessed.tasks,
+                slots=preprocessed.slots,
+                day_periods=preprocessed.day_periods,
+                rooms=rooms,
+                room_types=room_types,
+                start_slots=preprocessed.start_slots,
+                time_budget_ms=csp_budget,
+                seed=options.get("seed"),
+                preferred=options.get("warm_start"),
+                should_stop=None if progress is None else should_stop,
+            )
+        csp_stats = {"status": solved.status, **solved.stats}
+        instance = ProblemInstance.from_tasks(preprocessed.tasks, preprocessed.slots, rooms, room_types)
+        # A cancelled search keeps its partial assignment; the rest is placed greedily.
+        if solved.status in ("solved", "cancelled"):
+            candidate = generate_candidate(
+                tasks=preprocessed.tasks,
+                sections=sections,
+                slots=preprocessed.slots,
+                day_periods=preprocessed.day_periods,
+                rooms=rooms,
+                room_types=room_types,
+                seed=_chromosome_seed(solved.genes, instance),
+                inherited=solved.genes,
+                start_slots=preprocessed.start_slots,
+                instance=instance,
+            )
+            stats.stop_reason = "target_reached" if solved.status == "solved" else "cancelled"
+            stats.elapsed_ms = round((time.monotonic() - started) * 1000, 2)
+            return candidate, stats, {"candidate_cache": cache.stats(), "csp": csp_stats}
+        csp_ms = (time.monotonic() - started) * 1000
+        if time_budget_ms is not None:
+            options = {**options, "time_budget_ms": max(time_budget_ms - csp_ms, 0.0)}
+
+    candidate = optimize_schedule(
+        preprocessed=preprocessed,
+        sections=sections,
+        rooms=rooms,
+        room_types=room_types,
+        cache=cache,
+        stats=stats,
+        progress=progress,
+        profiler=profiler,
+        **options,
+    )
+    if csp_stats is not None:
+        stats.elapsed_ms = round(stats.elapsed_ms + csp_ms, 2)
+    return candidate, stats, {"candidate_cache": cache.stats(), "csp": csp_stats}
+
+
+def _component_progress(progress: ProgressCallback, index: int) -> ProgressCallback:
+    return lambda snapshot: progress({"component": index, **snapshot})
+
+
 def run_scheduler(
     tenant_id: str,
     sections: list[SchedulerSectionInput],
@@ -365,25 +902,199 @@ def run_scheduler(
     population_size: int = 20,
     generations: int = 20,
     mutation_rate: float = 0.2,
+    workers: int = 1,
+    seed: int | None = None,
+    cache_size: int = 128,
+    time_budget_ms: float | None = None,
+    stall_generations: int | None = None,
+    target_fitness: float | None = None,
+    task_ordering: TaskOrdering = "input",
+    local_search: LocalSearchMethod | None = None,
+    local_search_iterations: int = 500,
+    local_search_time_ms: float | None = None,
+    solver: Solver = "ga",
+    decompose: bool = False,
+    warm_start: list[TimetableEntry] | None = None,
+    progress: ProgressCallback | None = None,
+    profile: bool = False,
+    profile_hook: ProfileHook | None = None,
 ) -> SchedulerGenerateResult:
-    preprocessed = preprocess(sections, admin)
-    candidate = optimize_schedule(
-        preprocessed=preprocessed,
-        sections=[section.section for section in sections],
-        rooms=rooms,
-        room_types=room_types,
-        population_size=population_size,
-        generations=generations,
-        mutation_rate=mutation_rate,
-    )
-    summary = build_constraint_summary(preprocessed, candidate)
+    """Generate a timetable for one tenant.
+
+    `warm_start` takes the entries of an earlier version (for example
+    `TIMETABLE_CACHE[timetable_id].timetable`); assignments that are still
+    valid for the current input are pinned and only the rest is re-placed.
+
+    `progress` is forwarded to `optimize_schedule`. Decomposed runs tag each
+    snapshot with its `component` index; components solved in worker
+    processes report no progress. `time_budget_ms` (and the "auto" CSP
+    budget) covers the whole decomposed run and is shared by task count.
+
+    With `profile` (or a `profile_hook`, which sees each phase as it ends),
+    per-phase wall times and construction counters are returned as
+    `diagnostics["timings"]`; see `Profiler`. As with progress, components
+    solved in worker processes only contribute their total solve time.
+
+    `solver="auto"` profiles the preprocessed instance and lets
+    `choose_strategy` pick the solver, population size, generations, stall
+    limit, decomposition and (unless one is given) local search; `workers`
+    then caps the processes it may use. The profile and the chosen plan are
+    returned as `diagnostics["strategy"]`.
+    """
+    if solver not in ("ga", "csp", "auto"):
+        raise ValueError(f"Unknown solver: {solver}")
+    profiler = Profiler(profile_hook) if profile or profile_hook is not None else None
+    with phase(profiler, "preprocess"):
+        preprocessed = preprocess(sections, admin)
+    strategy = None
+    csp_time_budget_ms = None
+    if solver == "auto":
+        instance_profile = profile_instance(preprocessed, rooms, room_types)
+        plan = choose_strategy(instance_profile, max_workers=workers)
+        solver = plan.solver
+        population_size, generations, workers = plan.population_size, plan.generations, plan.workers
+        stall_generations = stall_generations or plan.stall_generations
+        local_search = local_search or plan.local_search
+        decompose = plan.decompose
+        csp_time_budget_ms = plan.csp_time_budget_ms
+        strategy = {"profile": asdict(instance_profile), "plan": asdict(plan)}
+    section_names = [section.section for section in sections]
+    warm_genes = None
+    if warm_start:
+        with phase(profiler, "warm_start"):
+            warm_genes = genes_from_timetable(warm_start, preprocessed, rooms, room_types)
+    options: dict[str, Any] = {
+        "population_size": population_size,
+        "generations": generations,
+        "mutation_rate": mutation_rate,
+        "workers": workers,
+        "seed": seed,
+        "time_budget_ms": time_budget_ms,
+        "stall_generations": stall_generations,
+        "target_fitness": target_fitness,
+        "task_ordering": task_ordering,
+        "local_search": local_search,
+        "local_search_iterations": local_search_iterations,
+        "local_search_time_ms": local_search_time_ms,
+        "warm_start": warm_genes,
+    }
+    if csp_time_budget_ms is not None:
+        options["csp_time_budget_ms"] = csp_time_budget_ms
+
+    components: list[Component] = []
+    if decompose:
+        with phase(profiler, "decompose"):
+            components = split_components(preprocessed, section_names, rooms, room_types)
+    if len(components) > 1:
+        # Parallelism moves from the population to the components: each
+        # component gets its own process and runs its GA serially. The time
+        # budgets cover the whole run, so they are shared out by task count.
+        started = time.monotonic()
+        total_tasks = sum(len(component.tasks) for component in components)
+        jobs = []
+        for index, component in enumerate(components):
+            sub_problem = PreprocessedData(
+                tasks=component.tasks,
+                slots=preprocessed.slots,
+                day_periods=preprocessed.day_periods,
+                preprocessing_conflicts=[],
+                start_slots=preprocessed.start_slots,
+            )
+            sub_options = {**options, "workers": 1, "seed": None if seed is None else seed + index}
+            if csp_time_budget_ms is not None:
+                sub_options["csp_time_budget_ms"] = csp_time_budget_ms * len(component.tasks) / total_tasks
+            jobs.append((sub_problem, component.sections, component.rooms, room_types, solver, cache_size, sub_options))
+        if workers > 1:
+            pool_size = min(workers, len(jobs))
+            if time_budget_ms is not None:
+                # Components beyond the pool size wait for a free process.
+                waves = -(-len(jobs) // pool_size)
+                for job in jobs:
+                    job[-1]["time_budget_ms"] = time_budget_ms / waves
+            with phase(profiler, "components"), ProcessPoolExecutor(max_workers=pool_size) as executor:
+                results = list(executor.map(_solve, *zip(*jobs)))
+        else:
+            results = []
+            remaining_tasks = total_tasks
+            for index, job in enumerate(jobs):
+                component_tasks = len(job[0].tasks)
+                if time_budget_ms is not None:
+                    # Each component gets its share of what is left, so time
+                    # an earlier component did not use passes on.
+                    left_ms = max(time_budget_ms - (time.monotonic() - started) * 1000, 0.0)
+                    job[-1]["time_budget_ms"] = left_ms * component_tasks / max(remaining_tasks, 1)
+                remaining_tasks -= component_tasks
+                results.append(
+                    _solve(
+                        *job,
+                        progress=None if progress is None else _component_progress(progress, index),
+                        profiler=profiler,
+                    )
+                )
+
+        candidate = _merge_candidates([result[0] for result in results])
+        stats = SearchStats(
+            generations_run=max(result[1].generations_run for result in results),
+            stop_reason=min((result[1].stop_reason for result in results), key=STOP_REASON_PRIORITY.index),
+            elapsed_ms=round((time.monotonic() - started) * 1000, 2),
+        )
+        cache_stats = [result[2]["candidate_cache"] for result in results]
+        hits = sum(entry["hits"] for entry in cache_stats)
+        lookups = hits + sum(entry["misses"] for entry in cache_stats)
+        solve_diagnostics: dict[str, Any] = {
+            "candidate_cache": {
+                "hits": hits,
+                "misses": lookups - hits,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "size": sum(entry["size"] for entry in cache_stats),
+                "max_size": cache_size,
+            },
+            "csp": [result[2]["csp"] for result in results] if solver == "csp" else None,
+        }
+        components_summary = [
+            {
+                "sections": component.sections,
+                "tasks": len(component.tasks),
+                "rooms": component.rooms,
+                "stop_reason": result[1].stop_reason,
+                "fitness": round(result[0].fitness, 2),
+                "local_search": result[1].local_search,
+            }
+            for component, result in zip(components, results)
+        ]
+    else:
+        candidate, stats, solve_diagnostics = _solve(
+            preprocessed, section_names, rooms, room_types, solver, cache_size, options, progress, profiler
+        )
+        components_summary = None
+
+    with phase(profiler, "materialize"):
+        entries, conflicts = materialize(candidate, preprocessed.tasks, preprocessed.slots)
+    summary = build_constraint_summary(preprocessed, candidate, conflicts)
     return SchedulerGenerateResult(
         tenant_id=tenant_id,
         generated=True,
-        timetable=sorted(candidate.entries, key=lambda e: (e.day, e.period, e.section)),
-        conflicts=candidate.conflicts,
+        timetable=sorted(entries, key=lambda e: (e.day, e.period, e.section)),
+        conflicts=conflicts,
         fitness_score=round(candidate.fitness, 2),
-        conflict_count=len(candidate.conflicts),
+        conflict_count=len(conflicts),
         quality_score=round(candidate.soft_score, 2),
         constraint_summary=summary,
+        stop_reason=stats.stop_reason,
+        diagnostics={
+            **solve_diagnostics,
+            "generations_run": stats.generations_run,
+            "elapsed_ms": stats.elapsed_ms,
+            "local_search": stats.local_search,
+            "components": components_summary,
+            "timings": None if profiler is None else profiler.as_dict(),
+            "strategy": strategy,
+            "warm_start": None
+            if warm_genes is None
+            else {
+                "tasks": len(preprocessed.tasks),
+                "pinned": len(warm_genes),
+                "kept": sum(candidate.genes.get(task_id) == gene for task_id, gene in warm_genes.items()),
+            },
+        },
     )
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+from array import array
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..scheduler_engine import PeriodBlock
+    from .engine import SessionTask
+
+
+class ProblemInstance:
+    """A scheduling problem with every string id interned to a dense integer.
+
+    Days, slots, sections, faculty, subjects, section/subject courses, room
+    types and rooms are numbered in first-seen order, with a list per kind to
+    decode ids back to names. Tasks are stored column-wise: `task_faculty[t]`
+    is the faculty id of task `t`, and so on. Slot `s` is `slots[s]`; blocks
+    are contiguous slot ranges, and `slot_run[s]` is how many slots from `s`
+    onwards stay on the same day with consecutive periods.
+
+    Resource/slot pairs flatten to `resource * slot_count + slot`, so hot
+    loops index flat lists instead of hashing string tuples.
+    """
+
+    __slots__ = (
+        "slots",
+        "slot_index",
+        "slot_day",
+        "slot_period",
+        "slot_run",
+        "days",
+        "day_slots",
+        "sections",
+        "faculty",
+        "subjects",
+        "courses",
+        "room_types",
+        "rooms",
+        "room_type",
+        "rooms_by_type",
+        "task_ids",
+        "task_section",
+        "task_faculty",
+        "task_subject",
+        "task_course",
+        "task_length",
+        "task_room_type",
+        "task_difficulty",
+        "_index",
+    )
+
+    def __init__(self, slots: list[tuple[str, int]], rooms: list[str], room_types: dict[str, str]) -> None:
+        self._index: dict[str, dict] = {
+            "day": {},
+            "section": {},
+            "faculty": {},
+            "subject": {},
+            "course": {},
+            "room_type": {},
+            "room": {},
+            "task": {},
+        }
+        self.days: list[str] = []
+        self.sections: list[str] = []
+        self.faculty: list[str] = []
+        self.subjects: list[str] = []
+        self.courses: list[tuple[str, str]] = []
+        self.room_types: list[str] = []
+        self.rooms: list[str] = []
+
+        self.slots = list(slots)
+        self.slot_index = {slot: slot_id for slot_id, slot in enumerate(self.slots)}
+        self.slot_day = array("i", (self._intern("day", self.days, day) for day, _ in self.slots))
+        self.slot_period = array("i", (period for _, period in self.slots))
+        self.day_slots: list[list[int]] = [[] for _ in self.days]
+        for slot_id, day in enumerate(self.slot_day):
+            self.day_slots[day].append(slot_id)
+        for day_slots in self.day_slots:
+            day_slots.sort(key=lambda slot_id: self.slot_period[slot_id])
+        self.slot_run = array("i", [1] * len(self.slots))
+        for slot_id in range(len(self.slots) - 2, -1, -1):
+            day, period = self.slots[slot_id]
+            if self.slots[slot_id + 1] == (day, period + 1):
+                self.slot_run[slot_id] = self.slot_run[slot_id + 1] + 1
+
+        self.room_type = array("i")
+        self.rooms_by_type: list[list[int]] = []
+        for room in dict.fromkeys(rooms):
+            room_id = self._intern("room", self.rooms, room)
+            type_id = self._intern_room_type(room_types.get(room, "CLASSROOM"))
+            self.room_type.append(type_id)
+            self.rooms_by_type[type_id].append(room_id)
+
+        self.task_ids: list[str] = []
+        self.task_section = array("i")
+        self.task_faculty = array("i")
+        self.task_subject = array("i")
+        self.task_course = array("i")
+        self.task_length = array("i")
+        self.task_room_type = array("i")
+        self.task_difficulty = array("i")
+
+    def _intern(self, kind: str, table: list, name) -> int:
+        index = self._index[kind]
+        value = index.get(name)
+        if value is None:
+            value = index[name] = len(table)
+            table.append(name)
+        return value
+
+    def _intern_room_type(self, name: str) -> int:
+        type_id = self._intern("room_type", self.room_types, name)
+        if type_id == len(self.rooms_by_type):
+            self.rooms_by_type.append([])
+        return type_id
+
+    @property
+    def slot_count(self) -> int:
+        return len(self.slots)
+
+    def add_task(
+        self,
+        task_id: str,
+        section: str,
+        faculty_id: str,
+        subject: str,
+        length: int,
+        room_type: str,
+        difficulty: int = 0,
+    ) -> int:
+        if task_id in self._index["task"]:
+            raise ValueError(f"Duplicate task id: {task_id}")
+        task = self._intern("task", self.task_ids, task_id)
+        self.task_section.append(self._intern("section", self.sections, section))
+        self.task_faculty.append(self._intern("faculty", self.faculty, faculty_id))
+        self.task_subject.append(self._intern("subject", self.subjects, subject))
+        self.task_course.append(self._intern("course", self.courses, (section, subject)))
+        self.task_length.append(length)
+        self.task_room_type.append(self._intern_room_type(room_type))
+        self.task_difficulty.append(difficulty)
+        return task
+
+    def task(self, task_id: str) -> int:
+        return self._index["task"][task_id]
+
+    def room(self, name: str) -> int:
+        return self._index["room"][name]
+
+    def slot(self, day: str, period: int) -> int:
+        """Slot id of (day, period), or -1 when it is outside the slot matrix."""
+        return self.slot_index.get((day, period), -1)
+
+    @classmethod
+    def from_tasks(
+        cls,
+        tasks: list[SessionTask],
+        slots: list[tuple[str, int]],
+        rooms: list[str],
+        room_types: dict[str, str],
+    ) -> ProblemInstance:
+        instance = cls(slots, rooms, room_types)
+        for task in tasks:
+            instance.add_task(
+                task.task_id, task.section, task.faculty_id, task.subject_code, task.duration, task.room_type
+            )
+        return instance
+
+    @classmethod
+    def from_blocks(
+        cls,
+        blocks: list[PeriodBlock],
+        slots: list[tuple[str, int]],
+        rooms: list[str],
+        room_types: dict[str, str],
+    ) -> ProblemInstance:
+        instance = cls(slots, rooms, room_types)
+        for block in blocks:
+            instance.add_task(
+                block.block_id,
+                block.section,
+                block.faculty_id,
+                block.subject,
+                block.length,
+                "LAB" if block.kind == "LAB" else "CLASSROOM",
+                block.difficulty,
+            )
+        return instance
@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+from collections import defaultdict, deque
+import math
+import random
+import time
+from typing import TYPE_CHECKING, Any, Container, Literal
+
+from .instance import ProblemInstance
+from .occupancy import OccupancyGrid, block_mask
+
+if TYPE_CHECKING:
+    from .engine import SessionTask
+
+LocalSearchMethod = Literal["sa", "tabu"]
+
+TABU_TENURE = 12
+TABU_SAMPLE_SIZE = 8
+
+
+class _PlacementState:
+    """Genes plus the grid and slot owners they imply, undoable through the grid trail.
+
+    Slot owners are flat lists indexed by `ProblemInstance` ids, one per
+    resource kind, holding the task id booked there or None.
+    """
+
+    def __init__(
+        self,
+        tasks: list[SessionTask],
+        genes: dict[str, tuple[int, str]],
+        instance: ProblemInstance,
+        rooms: list[str],
+        room_types: dict[str, str],
+    ) -> None:
+        slot_count = instance.slot_count
+        self.instance = instance
+        self.grid = OccupancyGrid(rooms, room_types, slot_count)
+        self.genes: dict[str, tuple[int, str] | None] = {task.task_id: None for task in tasks}
+        self.faculty_owners: list[str | None] = [None] * (len(instance.faculty) * slot_count)
+        self.section_owners: list[str | None] = [None] * (len(instance.sections) * slot_count)
+        self.room_owners: list[str | None] = [None] * (len(instance.rooms) * slot_count)
+        self.room_bases = {room: instance.room(room) * slot_count for room in instance.rooms}
+        self.bases: dict[str, tuple[int, int]] = {}
+        for task in tasks:
+            index = instance.task(task.task_id)
+            self.bases[task.task_id] = (
+                instance.task_faculty[index] * slot_count,
+                instance.task_section[index] * slot_count,
+            )
+        self.counters = {"unplaced": len(tasks)}
+        for task in tasks:
+            gene = genes.get(task.task_id)
+            if gene is not None:
+                self.place(task, *gene)
+        self.grid.trail.clear()
+
+    def mark(self) -> int:
+        return self.grid.mark()
+
+    def undo(self, mark: int) -> None:
+        self.grid.undo(mark)
+
+    def _set(self, store: dict | list, key: Any, value: Any) -> None:
+        self.grid.trail.append((store, key, store[key]))
+        store[key] = value
+
+    def _set_owners(self, task: SessionTask, start: int, room: str, owner: str | None) -> None:
+        faculty_base, section_base = self.bases[task.task_id]
+        room_base = self.room_bases[room]
+        for slot_id in range(start, start + task.duration):
+            self._set(self.faculty_owners, faculty_base + slot_id, owner)
+            self._set(self.section_owners, section_base + slot_id, owner)
+            self._set(self.room_owners, room_base + slot_id, owner)
+
+    def place(self, task: SessionTask, start: int, room: str) -> None:
+        self.grid.occupy(task.faculty_id, task.section, room, start, task.duration)
+        self._set(self.genes, task.task_id, (start, room))
+        self._set(self.counters, "unplaced", self.counters["unplaced"] - 1)
+        self._set_owners(task, start, room, task.task_id)
+
+    def remove(self, task: SessionTask) -> None:
+        start, room = self.genes[task.task_id]
+        self.grid.release(task.faculty_id, task.section, room, start, task.duration)
+        self._set(self.genes, task.task_id, None)
+        self._set(self.counters, "unplaced", self.counters["unplaced"] + 1)
+        self._set_owners(task, start, room, None)
+
+    def fits(self, task: SessionTask, start: int) -> str | None:
+        if not self.grid.is_free(task.faculty_id, task.section, block_mask(start, task.duration)):
+            return None
+        return self.grid.rooms.find(task.room_type, start, task.duration)
+
+    def blockers(self, task: SessionTask, start: int) -> set[str] | None:
+        """Task ids to evict so `task` fits at `start`, or None when no room of its type exists."""
+        faculty_base, section_base = self.bases[task.task_id]
+        span = range(start, start + task.duration)
+        found: set[str] = set()
+        for slot_id in span:
+            for owner in (self.faculty_owners[faculty_base + slot_id], self.section_owners[section_base + slot_id]):
+                if owner is not None:
+                    found.add(owner)
+
+        best_extra: set[str] | None = None
+        for room in self.grid.rooms.rooms_by_type.get(task.room_type, []):
+            room_base = self.room_bases[room]
+            extra = {
+                owner
+                for slot_id in span
+                if (owner := self.room_owners[room_base + slot_id]) is not None and owner not in found
+            }
+            if best_extra is None or len(extra) < len(best_extra):
+                best_extra = extra
+                if not extra:
+                    break
+        if best_extra is None:
+            return None
+        return found | best_extra
+
+
+def improve_genes(
+    tasks: list[SessionTask],
+    genes: dict[str, tuple[int, str]],
+    slots: list[tuple[str, int]],
+    rooms: list[str],
+    room_types: dict[str, str],
+    start_slots: dict[int, list[int]],
+    method: LocalSearchMethod = "sa",
+    iterations: int = 500,
+    time_budget_ms: float | None = None,
+    seed: int | None = None,
+    fixed: Container[str] = (),
+) -> tuple[dict[str, tuple[int, str]], dict[str, Any]]:
+    """Reduce the number of unplaced tasks by local search over a candidate's genes.
+
+    Neighborhoods are `kick` (place an unplaced task by evicting what blocks it
+    and re-placing the evicted tasks), `move` (relocate one placed task) and
+    `swap` (exchange the starts of two same-length tasks of one section).
+    `sa` accepts worsening moves with the annealing probability; `tabu` takes
+    the best of a sampled neighborhood while recently moved tasks may not be
+    evicted. Elective-group tasks stay where they are, since they must move
+    as a group, and so do the task ids in `fixed`.
+    """
+    if method not in ("sa", "tabu"):
+        raise ValueError(f"Unknown local search method: {method}")
+
+    rng = random.Random(seed)
+    movable = [task for task in tasks if not task.elective_group and task.task_id not in fixed]
+    by_id = {task.task_id: task for task in movable}
+    by_section_length: dict[tuple[str, int], list[SessionTask]] = defaultdict(list)
+    for task in movable:
+        by_section_length[(task.section, task.duration)].append(task)
+
+    instance = ProblemInstance.from_tasks(tasks, slots, rooms, room_types)
+    state = _PlacementState(tasks, genes, instance, rooms, room_types)
+    tabu: deque[str] = deque(maxlen=TABU_TENURE)
+    started = time.monotonic()
+
+    def place_anywhere(task: SessionTask) -> bool:
+        table = start_slots.get(task.duration, [])
+        for start in rng.sample(table, len(table)):
+            room = state.fits(task, start)
+            if room is not None:
+                state.place(task, start, room)
+                return True
+        return False
+
+    def kick() -> list[str] | None:
+        unplaced = [task_id for task_id in by_id if state.genes[task_id] is None]
+        if not unplaced:
+            return None
+        task = by_id[rng.choice(unplaced)]
+        table = start_slots.get(task.duration)
+        if not table:
+            return None
+        start = rng.choice(table)
+        evicted = state.blockers(task, start)
+        if evicted is None or any(task_id not in by_id or task_id in tabu for task_id in evicted):
+            return None
+        for task_id in evicted:
+            state.remove(by_id[task_id])
+        room = state.fits(task, start)
+        if room is None:
+            return None
+        state.place(task, start, room)
+        for task_id in evicted:
+            place_anywhere(by_id[task_id])
+        return [task.task_id, *evicted]
+
+    def move() -> list[str] | None:
+        task = rng.choice(movable)
+        if state.genes[task.task_id] is None:
+            return None
+        state.remove(task)
+        return [task.task_id] if place_anywhere(task) else None
+
+    def swap() -> list[str] | None:
+        first = rng.choice(movable)
+        if state.genes[first.task_id] is None:
+            return None
+        peers = [t for t in by_section_length[(first.section, first.duration)] if t is not first and state.genes[t.task_id]]
+        if not peers:
+            return None
+        second = rng.choice(peers)
+        first_start = state.genes[first.task_id][0]
+        second_start = state.genes[second.task_id][0]
+        state.remove(first)
+        state.remove(second)
+        for task, start in ((first, second_start), (second, first_start)):
+            room = state.fits(task, start)
+            if room is None:
+                return None
+            state.place(task, start, room)
+        return [first.task_id, second.task_id]
+
+    def propose() -> list[str] | None:
+        if not movable:
+            return None
+        roll = rng.random()
+        if state.counters["unplaced"] and roll < 0.6:
+            return kick()
+        if roll < 0.8:
+            return move()
+        return swap()
+
+    initial = state.counters["unplaced"]
+    best = initial
+    best_genes = {task_id: gene for task_id, gene in state.genes.items() if gene is not None}
+    temperature = 2.0
+    cooling = (0.05 / temperature) ** (1 / max(1, iterations))
+    iterations_run = 0
+
+    for _ in range(iterations):
+        if best == 0:
+            break
+        if time_budget_ms is not None and (time.monotonic() - started) * 1000 >= time_budget_ms:
+            break
+        iterations_run += 1
+        current = state.counters["unplaced"]
+
+        if method == "sa":
+            mark = state.mark()
+            moved = propose()
+            if moved is None:
+                state.undo(mark)
+                continue
+            delta = state.counters["unplaced"] - current
+            if delta > 0 and rng.random() >= math.exp(-delta / temperature):
+                state.undo(mark)
+            temperature *= cooling
+        else:
+            best_move: tuple[int, int] | None = None
+            for attempt in range(TABU_SAMPLE_SIZE):
+                mark = state.mark()
+                attempt_seed = rng.getrandbits(32)
+                rng_state = rng.getstate()
+                rng.seed(attempt_seed)
+                moved = propose()
+                rng.setstate(rng_state)
+                if moved is not None:
+                    delta = state.counters["unplaced"] - current
+                    if best_move is None or delta < best_move[0]:
+                        best_move = (delta, attempt_seed)
+                state.undo(mark)
+            if best_move is None:
+                continue
+            # Replay the chosen neighbor from its seed, then freeze what it touched.
+            rng_state = rng.getstate()
+            rng.seed(best_move[1])
+            moved = propose()
+            rng.setstate(rng_state)
+            tabu.extend(moved or [])
+
+        if state.counters["unplaced"] < best:
+            best = state.counters["unplaced"]
+            best_genes = {task_id: gene for task_id, gene in state.genes.items() if gene is not None}
+
+    stats = {
+        "method": method,
+        "iterations": iterations_run,
+        "initial_unplaced": initial,
+        "final_unplaced": best,
+        "elapsed_ms": round((time.monotonic() - started) * 1000, 2),
+    }
+    return best_genes, stats
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .instance import ProblemInstance
+
+
+def block_mask(start: int, duration: int) -> int:
+    """Bitmask covering `duration` consecutive slot ids beginning at `start`."""
+    return ((1 << duration) - 1) << start
+
+
+class RoomIndex:
+    """Free-room bitmasks per room type and slot id.
+
+    Rooms of one type are numbered in `rooms` order; bit `n` of
+    `free[room_type][slot_id]` is set while the n-th room of that type is
+    free, so the first free room of a block is the lowest bit of the AND
+    across its periods. `exhausted[room_type]` is a slot-id bitmask of the
+    slots in which no room of that type is left.
+    """
+
+    def __init__(self, rooms: list[str], room_types: dict[str, str], slot_count: int) -> None:
+        self.rooms_by_type: dict[str, list[str]] = {}
+        self.room_bits: dict[str, tuple[str, int]] = {}
+        for room in dict.fromkeys(rooms):
+            room_type = room_types.get(room, "CLASSROOM")
+            members = self.rooms_by_type.setdefault(room_type, [])
+            self.room_bits[room] = (room_type, len(members))
+            members.append(room)
+        self.free: dict[str, list[int]] = {
+            room_type: [(1 << len(members)) - 1] * slot_count for room_type, members in self.rooms_by_type.items()
+        }
+        self.exhausted: dict[str, int] = {room_type: 0 for room_type in self.rooms_by_type}
+
+    def find(self, room_type: str, start: int, duration: int) -> str | None:
+        masks = self.free.get(room_type)
+        if masks is None:
+            return None
+        available = masks[start]
+        for slot_id in range(start + 1, start + duration):
+            available &= masks[slot_id]
+            if not available:
+                return None
+        if not available:
+            return None
+        return self.rooms_by_type[room_type][(available & -available).bit_length() - 1]
+
+    def is_free(self, room: str, room_type: str, start: int, duration: int) -> bool:
+        entry = self.room_bits.get(room)
+        if entry is None or entry[0] != room_type:
+            return False
+        masks = self.free[room_type]
+        bit = 1 << entry[1]
+        return all(masks[slot_id] & bit for slot_id in range(start, start + duration))
+
+    def occupy(self, room: str, start: int, duration: int, trail: list[tuple[list[int], int, int]]) -> None:
+        room_type, bit = self.room_bits[room]
+        masks = self.free[room_type]
+        for slot_id in range(start, start + duration):
+            trail.append((masks, slot_id, masks[slot_id]))
+            masks[slot_id] &= ~(1 << bit)
+            if not masks[slot_id]:
+                trail.append((self.exhausted, room_type, self.exhausted[room_type]))
+                self.exhausted[room_type] |= 1 << slot_id
+
+    def release(self, room: str, start: int, duration: int, trail: list[tuple[list[int], int, int]]) -> None:
+        room_type, bit = self.room_bits[room]
+        masks = self.free[room_type]
+        for slot_id in range(start, start + duration):
+            if not masks[slot_id]:
+                trail.append((self.exhausted, room_type, self.exhausted[room_type]))
+                self.exhausted[room_type] &= ~(1 << slot_id)
+            trail.append((masks, slot_id, masks[slot_id]))
+            masks[slot_id] |= 1 << bit
+
+
+class OccupancyGrid:
+    """Busy bitmasks per faculty and section over integer slot ids, plus room index.
+
+    Bit `n` of a resource's mask is set when that resource is booked in slot
+    id `n`, so checking an L-period block is a single AND against
+    `block_mask(start, L)`.
+
+    Every mutation is recorded on a trail of `(store, key, previous)` entries;
+    `undo(mark)` restores the grid to the state it had when `mark()` was
+    taken, in time proportional to the work done since.
+    """
+
+    def __init__(self, rooms: list[str], room_types: dict[str, str], slot_count: int) -> None:
+        self.faculty: dict[str, int] = {}
+        self.section: dict[str, int] = {}
+        self.rooms = RoomIndex(rooms, room_types, slot_count)
+        self.trail: list[tuple] = []
+
+    def mark(self) -> int:
+        return len(self.trail)
+
+    def undo(self, mark: int) -> None:
+        trail = self.trail
+        while len(trail) > mark:
+            store, key, previous = trail.pop()
+            store[key] = previous
+
+    def is_free(self, faculty_id: str, section: str, mask: int) -> bool:
+        return not ((self.faculty.get(faculty_id, 0) | self.section.get(section, 0)) & mask)
+
+    def occupy(self, faculty_id: str, section: str, room: str, start: int, duration: int) -> None:
+        mask = block_mask(start, duration)
+        previous_faculty = self.faculty.get(faculty_id, 0)
+        previous_section = self.section.get(section, 0)
+        self.trail.append((self.faculty, faculty_id, previous_faculty))
+        self.trail.append((self.section, section, previous_section))
+        self.faculty[faculty_id] = previous_faculty | mask
+        self.section[section] = previous_section | mask
+        self.rooms.occupy(room, start, duration, self.trail)
+
+    def release(self, faculty_id: str, section: str, room: str, start: int, duration: int) -> None:
+        mask = block_mask(start, duration)
+        previous_faculty = self.faculty.get(faculty_id, 0)
+        previous_section = self.section.get(section, 0)
+        self.trail.append((self.faculty, faculty_id, previous_faculty))
+        self.trail.append((self.section, section, previous_section))
+        self.faculty[faculty_id] = previous_faculty & ~mask
+        self.section[section] = previous_section & ~mask
+        self.rooms.release(room, start, duration, self.trail)
+
+
+class InstanceGrid:
+    """OccupancyGrid over `ProblemInstance` ids, for the GA's construction loop.
+
+    Faculty and section busy masks are lists indexed by instance id, and
+    free-room masks are lists per room type id and slot; bit `n` of
+    `free[type][slot]` stands for `instance.rooms_by_type[type][n]`. Room
+    types without rooms are exhausted in every slot. Undo works as in
+    OccupancyGrid.
+    """
+
+    def __init__(self, instance: ProblemInstance) -> None:
+        slot_count = instance.slot_count
+        self.faculty = [0] * len(instance.faculty)
+        self.section = [0] * len(instance.sections)
+        self.rooms_by_type = instance.rooms_by_type
+        self.room_type = instance.room_type
+        self.room_bit = [0] * len(instance.rooms)
+        for members in self.rooms_by_type:
+            for bit, room in enumerate(members):
+                self.room_bit[room] = bit
+        self.free = [[(1 << len(members)) - 1] * slot_count for members in self.rooms_by_type]
+        self.exhausted = [0 if members else (1 << slot_count) - 1 for members in self.rooms_by_type]
+        self.trail: list[tuple] = []
+
+    def mark(self) -> int:
+        return len(self.trail)
+
+    def undo(self, mark: int) -> None:
+        trail = self.trail
+        while len(trail) > mark:
+            store, key, previous = trail.pop()
+            store[key] = previous
+
+    def find_room(self, room_type: int, start: int, duration: int) -> int:
+        """First free room of the type for the whole block, or -1."""
+        masks = self.free[room_type]
+        available = masks[start]
+        for slot_id in range(start + 1, start + duration):
+            available &= masks[slot_id]
+        if not available:
+            return -1
+        return self.rooms_by_type[room_type][(available & -available).bit_length() - 1]
+
+    def room_is_free(self, room: int, room_type: int, start: int, duration: int) -> bool:
+        if self.room_type[room] != room_type:
+            return False
+        masks = self.free[room_type]
+        bit = 1 << self.room_bit[room]
+        return all(masks[slot_id] & bit for slot_id in range(start, start + duration))
+
+    def occupy(self, faculty: int, section: int, room: int, start: int, duration: int) -> None:
+        mask = block_mask(start, duration)
+        trail = self.trail
+        trail.append((self.faculty, faculty, self.faculty[faculty]))
+        trail.append((self.section, section, self.section[section]))
+        self.faculty[faculty] |= mask
+        self.section[section] |= mask
+        room_type = self.room_type[room]
+        masks = self.free[room_type]
+        clear = ~(1 << self.room_bit[room])
+        for slot_id in range(start, start + duration):
+            trail.append((masks, slot_id, masks[slot_id]))
+            masks[slot_id] &= clear
+            if not masks[slot_id]:
+                trail.append((self.exhausted, room_type, self.exhausted[room_type]))
+                self.exhausted[room_type] |= 1 << slot_id
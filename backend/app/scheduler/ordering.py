@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from collections import Counter, defaultdict
+import heapq
+from typing import TYPE_CHECKING, Literal
+
+if TYPE_CHECKING:
+    from .engine import SessionTask
+    from .instance import ProblemInstance
+    from .occupancy import InstanceGrid
+
+TaskOrdering = Literal["input", "longest_first", "faculty_load", "dsatur"]
+TASK_ORDERINGS: tuple[str, ...] = ("input", "longest_first", "faculty_load", "dsatur")
+
+
+def order_tasks(tasks: list[SessionTask], ordering: TaskOrdering) -> list[SessionTask]:
+    """Static placement order for the construction pass; `dsatur` is ranked dynamically by DSaturQueue."""
+    if ordering not in TASK_ORDERINGS:
+        raise ValueError(f"Unknown task ordering: {ordering}")
+    if ordering == "longest_first":
+        return sorted(tasks, key=lambda t: -t.duration)
+    if ordering == "faculty_load":
+        load: Counter[str] = Counter()
+        for task in tasks:
+            load[task.faculty_id] += task.duration
+        return sorted(tasks, key=lambda t: (-load[t.faculty_id], -t.duration))
+    return list(tasks)
+
+
+class DSaturQueue:
+    """Yield tasks fewest-remaining-feasible-starts first, re-ranking as the grid fills.
+
+    Tasks are `ProblemInstance` task ids. A start counts as feasible when the
+    task's faculty and section are free for the whole block and its room
+    type is not exhausted in any of those slots. After a placement only tasks
+    sharing the placed task's faculty or section are re-counted; stale heap
+    entries are skipped on pop.
+    """
+
+    def __init__(
+        self, tasks: list[int], instance: ProblemInstance, grid: InstanceGrid, start_masks: dict[int, int]
+    ) -> None:
+        self.tasks = tasks
+        self.instance = instance
+        self.grid = grid
+        self.start_masks = start_masks
+        self.remaining = set(range(len(tasks)))
+        self.version = [0] * len(tasks)
+        self.by_faculty: dict[int, list[int]] = defaultdict(list)
+        self.by_section: dict[int, list[int]] = defaultdict(list)
+        for index, task in enumerate(tasks):
+            self.by_faculty[instance.task_faculty[task]].append(index)
+            self.by_section[instance.task_section[task]].append(index)
+        self.heap: list[tuple[int, int, int, int]] = []
+        for index in range(len(tasks)):
+            self._push(index)
+
+    def _feasible_starts(self, task: int) -> int:
+        instance, grid = self.instance, self.grid
+        duration = instance.task_length[task]
+        busy = (
+            grid.faculty[instance.task_faculty[task]]
+            | grid.section[instance.task_section[task]]
+            | grid.exhausted[instance.task_room_type[task]]
+        )
+        # A start s is blocked when any of bits s .. s + duration - 1 is busy.
+        blocked = busy
+        for offset in range(1, duration):
+            blocked |= busy >> offset
+        return (self.start_masks.get(duration, 0) & ~blocked).bit_count()
+
+    def _push(self, index: int) -> None:
+        task = self.tasks[index]
+        heapq.heappush(
+            self.heap, (self._feasible_starts(task), -self.instance.task_length[task], index, self.version[index])
+        )
+
+    def __iter__(self) -> DSaturQueue:
+        return self
+
+    def __next__(self) -> int:
+        while self.heap:
+            _, _, index, version = heapq.heappop(self.heap)
+            if index in self.remaining and version == self.version[index]:
+                self.remaining.discard(index)
+                return self.tasks[index]
+        raise StopIteration
+
+    def notify_placed(self, task: int) -> None:
+        instance = self.instance
+        touched: set[int] = set()
+        for group in (self.by_faculty[instance.task_faculty[task]], self.by_section[instance.task_section[task]]):
+            touched.update(i for i in group if i in self.remaining)
+        for index in touched:
+            self.version[index] += 1
+            self._push(index)
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+import time
+from typing import Any, Callable, ContextManager, Iterator
+
+# Called with (phase name, seconds) each time a phase ends.
+ProfileHook = Callable[[str, float], None]
+
+
+class Profiler:
+    """Wall time per named phase and event counters for one scheduler run.
+
+    Phases are timed with `time.perf_counter` and accumulate over repeated
+    entries, so `as_dict` reports the total and the number of calls. A
+    `hook` sees every phase as it ends, e.g. to forward it to a metrics
+    client or a tracing span.
+    """
+
+    def __init__(self, hook: ProfileHook | None = None) -> None:
+        self.hook = hook
+        self.seconds: dict[str, float] = defaultdict(float)
+        self.calls: dict[str, int] = defaultdict(int)
+        self.counters: dict[str, int] = defaultdict(int)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def record(self, name: str, seconds: float) -> None:
+        self.seconds[name] += seconds
+        self.calls[name] += 1
+        if self.hook is not None:
+            self.hook(name, seconds)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counters[name] += amount
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "phases": {
+                name: {"ms": round(seconds * 1000, 3), "calls": self.calls[name]}
+                for name, seconds in self.seconds.items()
+            },
+            "counters": dict(self.counters),
+        }
+
+
+def phase(profiler: Profiler | None, name: str) -> ContextManager[None]:
+    """`profiler.phase(name)`, or a no-op when profiling is off."""
+    return nullcontext() if profiler is None else profiler.phase(name)
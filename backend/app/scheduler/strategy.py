@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass
+import os
+from typing import TYPE_CHECKING, Literal
+
+from .local_search import LocalSearchMethod
+
+if TYPE_CHECKING:
+    from .engine import PreprocessedData
+
+# Below this many tasks the GA reaches its target within a few generations,
+# so the CSP's propagation setup is not worth paying for.
+CSP_MIN_TASKS = 300
+# The CSP thrashes once a room pool is nearly full; such instances go to the
+# GA with local search instead.
+CSP_MAX_UTILIZATION = 0.85
+# Evaluating a population in worker processes only pays off above this size.
+PARALLEL_MIN_TASKS = 1000
+# The CSP either solves quickly or not at all, so "auto" gives it a short
+# size-derived budget (this many ms per task, clamped) before the GA takes over.
+CSP_MS_PER_TASK = 2
+CSP_MIN_TIME_BUDGET_MS = 500
+CSP_MAX_TIME_BUDGET_MS = 10_000
+DECOMPOSE_MIN_SECTIONS = 16
+
+
+@dataclass
+class InstanceProfile:
+    tasks: int
+    sections: int
+    periods: int
+    slots: int
+    # Busiest room pool: periods it must host / (rooms in the pool x slots).
+    utilization: float
+    # Busiest section or faculty member, as a share of the week.
+    peak_load: float
+    elective_groups: int
+    lab_share: float
+
+
+@dataclass
+class SolverPlan:
+    solver: Literal["ga", "csp"]
+    population_size: int
+    generations: int
+    stall_generations: int
+    workers: int
+    decompose: bool
+    local_search: LocalSearchMethod | None
+    csp_time_budget_ms: float | None
+    reasons: list[str]
+
+
+def profile_instance(preprocessed: PreprocessedData, rooms: list[str], room_types: dict[str, str]) -> InstanceProfile:
+    slot_count = len(preprocessed.slots)
+    pool_sizes = Counter(room_types.get(room, "CLASSROOM") for room in rooms)
+    by_pool: Counter[str] = Counter()
+    by_owner: Counter[tuple[str, str]] = Counter()
+    for task in preprocessed.tasks:
+        by_pool[task.room_type] += task.duration
+        by_owner["section", task.section] += task.duration
+        by_owner["faculty", task.faculty_id] += task.duration
+    periods = sum(by_pool.values())
+    return InstanceProfile(
+        tasks=len(preprocessed.tasks),
+        sections=len({task.section for task in preprocessed.tasks}),
+        periods=periods,
+        slots=slot_count,
+        utilization=round(
+            max((booked / (max(pool_sizes[pool], 1) * slot_count) for pool, booked in by_pool.items()), default=0.0), 3
+        ),
+        peak_load=round(max(by_owner.values(), default=0) / slot_count, 3) if slot_count else 0.0,
+        elective_groups=len({task.elective_group for task in preprocessed.tasks if task.elective_group}),
+        lab_share=round(by_pool["LAB"] / periods, 3) if periods else 0.0,
+    )
+
+
+def choose_strategy(profile: InstanceProfile, max_workers: int = 1) -> SolverPlan:
+    """Pick solver, GA sizing and parallelism for `solver="auto"`.
+
+    The population and generation budget grow with the task count (8-60
+    members, 10-150 generations) so small departments finish in a few
+    milliseconds and large institutes are not starved. Tight instances get
+    twice the generations plus tabu search, and elective groups or a large
+    lab share add a quarter. Large instances with slack go to the CSP, for
+    at most `csp_time_budget_ms` before the GA takes over, and no more than
+    `max_workers` processes are ever requested.
+    """
+    reasons: list[str] = []
+    population_size = min(60, max(8, round(8 + profile.tasks / 40)))
+    generations = min(150, max(10, round(10 + profile.tasks / 25)))
+    reasons.append(f"{profile.tasks} tasks: population {population_size}, {generations} generations")
+
+    tight = profile.utilization > CSP_MAX_UTILIZATION or profile.peak_load >= 1.0
+    if tight:
+        generations *= 2
+        reasons.append(
+            f"tight instance (room utilization {profile.utilization}, peak load {profile.peak_load}): "
+            "doubled generations, tabu local search"
+        )
+    if profile.elective_groups or profile.lab_share >= 0.25:
+        generations = round(generations * 1.25)
+        reasons.append(
+            f"{profile.elective_groups} elective groups, lab share {profile.lab_share}: 25% more generations"
+        )
+
+    solver: Literal["ga", "csp"] = "ga"
+    csp_time_budget_ms = None
+    if profile.tasks >= CSP_MIN_TASKS and not tight:
+        solver = "csp"
+        csp_time_budget_ms = float(
+            min(CSP_MAX_TIME_BUDGET_MS, max(CSP_MIN_TIME_BUDGET_MS, profile.tasks * CSP_MS_PER_TASK))
+        )
+        reasons.append(f"large instance with slack: CSP for up to {csp_time_budget_ms:.0f} ms, GA as fallback")
+
+    decompose = profile.sections >= DECOMPOSE_MIN_SECTIONS
+    if decompose:
+        reasons.append(f"{profile.sections} sections: split into independent components")
+    workers = 1
+    if profile.tasks >= PARALLEL_MIN_TASKS:
+        workers = max(1, min(max_workers, os.cpu_count() or 1))
+        if workers > 1:
+            reasons.append(f"{workers} worker processes")
+
+    return SolverPlan(
+        solver=solver,
+        population_size=population_size,
+        generations=generations,
+        stall_generations=max(5, generations // 4),
+        workers=workers,
+        decompose=decompose,
+        local_search="tabu" if tight else None,
+        csp_time_budget_ms=csp_time_budget_ms,
+        reasons=reasons,
+    )
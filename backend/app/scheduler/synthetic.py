@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import random
+
+from ..schemas import SchedulerAdminConfig, SchedulerSectionInput, SchedulerSubjectInput
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
+
+DEFAULT_LTP_MIX: dict[str, float] = {"3-0-0": 0.4, "3-1-0": 0.3, "2-1-0": 0.2, "2-0-2": 0.1}
+
+
+@dataclass
+class SyntheticInstitution:
+    sections: list[SchedulerSectionInput]
+    rooms: list[str]
+    room_types: dict[str, str]
+    admin: SchedulerAdminConfig
+
+    @property
+    def demanded_periods(self) -> int:
+        return sum(
+            sum(int(hours) for hours in subject.ltp.split("-"))
+            for section in self.sections
+            for subject in section.subjects
+        )
+
+
+def generate_institution(
+    sections: int,
+    faculty: int,
+    rooms: int,
+    labs: int,
+    subjects_per_section: int = 6,
+    sections_per_department: int = 4,
+    ltp_mix: dict[str, float] | None = None,
+    lab_ratio: float = 0.2,
+    elective_groups: int = 0,
+    working_days: int = 5,
+    hours_per_day: int = 6,
+    seed: int = 0,
+) -> SyntheticInstitution:
+    """Build a reproducible scheduling workload; equal arguments give an identical institution.
+
+    Sections are grouped into departments of `sections_per_department` that
+    share a curriculum. Each curriculum subject is a lab (`0-0-2` or `0-0-4`
+    in LAB rooms) with probability `lab_ratio`, otherwise its L-T-P is drawn
+    from `ltp_mix` weights. Every section/subject pair is taught by the
+    currently least-loaded of the `faculty` members, so load stays even as
+    the instance grows. With `elective_groups` > 0, each section also takes
+    one `2-0-0` elective from group `EG{department % elective_groups}`,
+    taught by a dedicated faculty member since the group meets at once.
+    """
+    if min(sections, faculty, rooms, subjects_per_section, sections_per_department) < 1:
+        raise ValueError("sections, faculty, rooms, subjects_per_section and sections_per_department must be positive")
+    if labs < 0 or not 0 <= lab_ratio <= 1:
+        raise ValueError("labs must be non-negative and lab_ratio within [0, 1]")
+    if lab_ratio > 0 and labs == 0:
+        raise ValueError("lab_ratio > 0 needs at least one lab room")
+    if not 1 <= working_days <= len(WEEKDAYS):
+        raise ValueError(f"working_days must be between 1 and {len(WEEKDAYS)}")
+
+    rng = random.Random(seed)
+    mix = ltp_mix or DEFAULT_LTP_MIX
+    patterns, weights = list(mix), list(mix.values())
+    faculty_ids = [f"F{index:03d}" for index in range(faculty)]
+    load = dict.fromkeys(faculty_ids, 0)
+
+    def assign_faculty(hours: int) -> str:
+        least = min(load.values())
+        chosen = rng.choice([faculty_id for faculty_id, value in load.items() if value == least])
+        load[chosen] += hours
+        return chosen
+
+    section_inputs: list[SchedulerSectionInput] = []
+    department_count = -(-sections // sections_per_department)
+    for department in range(department_count):
+        curriculum: list[tuple[str, str, str]] = []
+        for index in range(subjects_per_section):
+            if rng.random() < lab_ratio:
+                curriculum.append((f"D{department:02d}-LAB{index}", rng.choice(["0-0-2", "0-0-4"]), "LAB"))
+            else:
+                curriculum.append((f"D{department:02d}-C{index}", rng.choices(patterns, weights)[0], "CLASSROOM"))
+
+        first = department * sections_per_department
+        for section_index in range(first, min(sections, first + sections_per_department)):
+            name = f"D{department:02d}-S{section_index:03d}"
+            subjects = [
+                SchedulerSubjectInput(
+                    code=code,
+                    ltp=ltp,
+                    faculty_id=assign_faculty(sum(int(hours) for hours in ltp.split("-"))),
+                    room_type=room_type,
+                    lab_block_size=2 if room_type == "LAB" or ltp.endswith("-2") else None,
+                )
+                for code, ltp, room_type in curriculum
+            ]
+            if elective_groups:
+                group = f"EG{department % elective_groups}"
+                subjects.append(
+                    SchedulerSubjectInput(
+                        code=f"{group}-E{section_index:03d}",
+                        ltp="2-0-0",
+                        faculty_id=f"FE{section_index:03d}",
+                        elective_group=group,
+                    )
+                )
+            section_inputs.append(SchedulerSectionInput(section=name, subjects=subjects))
+
+    room_names = [f"R{index:03d}" for index in range(rooms)] + [f"LAB{index:03d}" for index in range(labs)]
+    return SyntheticInstitution(
+        sections=section_inputs,
+        rooms=room_names,
+        room_types={room: "LAB" if room.startswith("LAB") else "CLASSROOM" for room in room_names},
+        admin=SchedulerAdminConfig(working_days=WEEKDAYS[:working_days], hours_per_day=hours_per_day),
+    )
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
+from ..schemas import TimetableEntry
+
+if TYPE_CHECKING:
+    from .engine import PreprocessedData
+
+
+def genes_from_timetable(
+    entries: list[TimetableEntry],
+    preprocessed: PreprocessedData,
+    rooms: list[str],
+    room_types: dict[str, str],
+) -> dict[str, tuple[int, str]]:
+    """Recover (start slot id, room) genes for the tasks a prior timetable still satisfies.
+
+    Entries are one row per period, so each section/course is first cut into
+    runs of consecutive periods on one day with one room and faculty member.
+    A task keeps a run (or the leading part of it) only if the run is long
+    enough, the day and periods still exist, the faculty member is unchanged
+    and the room still exists with the task's room type. Everything else,
+    including added sections or subjects, gets no gene and is re-placed.
+    """
+    slot_ids = {slot: slot_id for slot_id, slot in enumerate(preprocessed.slots)}
+    known_rooms = set(rooms)
+
+    runs: dict[tuple[str, str], list[list[TimetableEntry]]] = defaultdict(list)
+    by_course: dict[tuple[str, str], list[TimetableEntry]] = defaultdict(list)
+    for entry in entries:
+        if (entry.day, entry.period) in slot_ids:
+            by_course[(entry.section, entry.course)].append(entry)
+    for key, course_entries in by_course.items():
+        course_entries.sort(key=lambda e: slot_ids[(e.day, e.period)])
+        current: list[TimetableEntry] = []
+        for entry in course_entries:
+            if current and not (
+                entry.day == current[-1].day
+                and entry.period == current[-1].period + 1
+                and entry.room == current[-1].room
+                and entry.faculty_id == current[-1].faculty_id
+            ):
+                runs[key].append(current)
+                current = []
+            current.append(entry)
+        if current:
+            runs[key].append(current)
+
+    genes: dict[str, tuple[int, str]] = {}
+    # Longest tasks first, so lab blocks claim the multi-period runs before
+    # single-period sessions split them up.
+    for task in sorted(preprocessed.tasks, key=lambda t: -t.duration):
+        available = runs.get((task.section, task.subject_code))
+        if not available:
+            continue
+        for index, run in enumerate(available):
+            head = run[0]
+            if (
+                len(run) >= task.duration
+                and head.faculty_id == task.faculty_id
+                and head.room in known_rooms
+                and room_types.get(head.room, "CLASSROOM") == task.room_type
+                and head.period + task.duration - 1 <= preprocessed.day_periods[head.day]
+            ):
+                genes[task.task_id] = (slot_ids[(head.day, head.period)], head.room)
+                remainder = run[task.duration :]
+                if remainder:
+                    available[index] = remainder
+                else:
+                    del available[index]
+                break
+    return genes
@@ -1,8 +1,14 @@
 from __future__ import annotations
 
+from collections import deque
 from dataclasses import dataclass
+import heapq
+import math
+import multiprocessing
+import queue
 from random import Random
-from typing import Literal
+import time
+from typing import Any, Callable, Literal
 
 from .schemas import (
     AdminConfig,
@@ -13,9 +19,18 @@ from .schemas import (
     SubjectSpec,
     TimetableEntry,
 )
+from .scheduler.batch_fitness import PenaltyScore, PopulationEvaluator
+from .scheduler.instance import ProblemInstance
 
 DayName = str
 
+LOCAL_SEARCH_TABU_TENURE = 16
+LOCAL_SEARCH_TABU_SAMPLE = 16
+# Default min-conflicts repair budget, in steps per block of the candidate.
+REPAIR_STEPS_PER_BLOCK = 2
+ISLAND_MIGRATION_INTERVAL = 5
+ISLAND_MIGRANTS = 2
+
 
 @dataclass(frozen=True)
 class PeriodBlock:
@@ -28,6 +43,173 @@ class PeriodBlock:
     difficulty: int
 
 
+class IncrementalFitness:
+    """Penalty counters for one candidate that can be updated one block move at a time.
+
+    Mirrors `SchedulerEngine._fitness`: per-(faculty|room|section, slot)
+    occupancy counts give the hard clash total, and per-(course, day) and
+    per-(section, day[, slot]) aggregates give the spread, fatigue and
+    heavy-subject penalties. All counters are flat integer lists indexed
+    through the candidate's `ProblemInstance`, and `move` only revisits the
+    entries the block touches.
+    """
+
+    def __init__(self, candidate: dict[str, tuple[DayName, int, str]], instance: ProblemInstance) -> None:
+        self.instance = instance
+        slot_count = instance.slot_count
+        day_count = len(instance.days)
+        self.assignments: dict[str, tuple[DayName, int, str]] = {}
+        self.faculty_slots = [0] * (len(instance.faculty) * slot_count)
+        self.room_slots = [0] * (len(instance.rooms) * slot_count)
+        self.section_slots = [0] * (len(instance.sections) * slot_count)
+        self.course_days = [0] * (len(instance.courses) * day_count)
+        self.course_day_count = [0] * len(instance.courses)
+        self.section_starts = [0] * (len(instance.sections) * slot_count)
+        self.section_day_fatigue = [0] * (len(instance.sections) * day_count)
+        self.heavy_by_day = [0] * (len(instance.sections) * day_count)
+
+        self.hard_conflicts = 0
+        self.subject_spread_penalty = 0
+        self.fatigue_penalty = 0
+        self.heavy_subject_penalty = 0
+
+        for block_id, assignment in candidate.items():
+            self._add(block_id, assignment)
+
+    def copy(self) -> IncrementalFitness:
+        clone = IncrementalFitness.__new__(IncrementalFitness)
+        clone.instance = self.instance
+        clone.assignments = dict(self.assignments)
+        clone.faculty_slots = self.faculty_slots[:]
+        clone.room_slots = self.room_slots[:]
+        clone.section_slots = self.section_slots[:]
+        clone.course_days = self.course_days[:]
+        clone.course_day_count = self.course_day_count[:]
+        clone.section_starts = self.section_starts[:]
+        clone.section_day_fatigue = self.section_day_fatigue[:]
+        clone.heavy_by_day = self.heavy_by_day[:]
+        clone.hard_conflicts = self.hard_conflicts
+        clone.subject_spread_penalty = self.subject_spread_penalty
+        clone.fatigue_penalty = self.fatigue_penalty
+        clone.heavy_subject_penalty = self.heavy_subject_penalty
+        return clone
+
+    @property
+    def total_penalty(self) -> int:
+        return (
+            self.hard_conflicts * 100
+            + self.subject_spread_penalty
+            + self.fatigue_penalty
+            + self.heavy_subject_penalty
+        )
+
+    @property
+    def fitness(self) -> float:
+        return max(0.0, 1000.0 - self.total_penalty)
+
+    def move(self, block_id: str, assignment: tuple[DayName, int, str]) -> int:
+        """Reassign one block and return the change in total penalty."""
+        before = self.total_penalty
+        if block_id in self.assignments:
+            self._remove(block_id)
+        self._add(block_id, assignment)
+        return self.total_penalty - before
+
+    def move_delta(self, block_id: str, assignment: tuple[DayName, int, str]) -> int:
+        """Penalty change of a move without keeping it."""
+        previous = self.assignments.get(block_id)
+        delta = self.move(block_id, assignment)
+        if previous is None:
+            self._remove(block_id)
+        else:
+            self.move(block_id, previous)
+        return delta
+
+    def _refresh_fatigue(self, section: int, day: int) -> None:
+        instance = self.instance
+        base = section * instance.slot_count
+        periods: list[int] = []
+        for slot_id in instance.day_slots[day]:
+            count = self.section_starts[base + slot_id]
+            if count:
+                periods.extend([instance.slot_period[slot_id]] * count)
+        penalty = 0
+        streak = 1
+        for i in range(1, len(periods)):
+            if periods[i] == periods[i - 1] + 1:
+                streak += 1
+            else:
+                streak = 1
+            if streak > 3:
+                penalty += 8
+        key = section * len(instance.days) + day
+        self.fatigue_penalty += penalty - self.section_day_fatigue[key]
+        self.section_day_fatigue[key] = penalty
+
+    def _heavy_penalty(self, count: int) -> int:
+        return (count - 2) * 6 if count > 2 else 0
+
+    def _update(self, block_id: str, assignment: tuple[DayName, int, str], step: int) -> None:
+        instance = self.instance
+        task = instance.task(block_id)
+        day_name, period, room_name = assignment
+        start = instance.slot(day_name, period)
+        if start < 0:
+            raise ValueError(f"{block_id} starts outside the slot matrix: {day_name} {period}")
+        slot_count = instance.slot_count
+        length = instance.task_length[task]
+        section = instance.task_section[task]
+
+        # Periods running past the end of the day are hard conflicts of their own.
+        covered = min(length, instance.slot_run[start])
+        hard = self.hard_conflicts + step * (length - covered)
+        for counts, base in (
+            (self.faculty_slots, instance.task_faculty[task] * slot_count),
+            (self.room_slots, instance.room(room_name) * slot_count),
+            (self.section_slots, section * slot_count),
+        ):
+            for key in range(base + start, base + start + covered):
+                count = counts[key]
+                if step > 0:
+                    if count:
+                        hard += 1
+                    counts[key] = count + 1
+                else:
+                    if count >= 2:
+                        hard -= 1
+                    counts[key] = count - 1
+        self.hard_conflicts = hard
+
+        day = instance.slot_day[start]
+        day_count = len(instance.days)
+        course = instance.task_course[task]
+        previous_spread = 15 if self.course_day_count[course] == 1 else 0
+        day_key = course * day_count + day
+        self.course_days[day_key] += step
+        if step > 0 and self.course_days[day_key] == 1:
+            self.course_day_count[course] += 1
+        elif step < 0 and self.course_days[day_key] == 0:
+            self.course_day_count[course] -= 1
+        self.subject_spread_penalty += (15 if self.course_day_count[course] == 1 else 0) - previous_spread
+
+        self.section_starts[section * slot_count + start] += step
+        self._refresh_fatigue(section, day)
+
+        if instance.task_difficulty[task] >= 4:
+            heavy_key = section * day_count + day
+            previous_heavy = self._heavy_penalty(self.heavy_by_day[heavy_key])
+            self.heavy_by_day[heavy_key] += step
+            self.heavy_subject_penalty += self._heavy_penalty(self.heavy_by_day[heavy_key]) - previous_heavy
+
+    def _add(self, block_id: str, assignment: tuple[DayName, int, str]) -> None:
+        self.assignments[block_id] = assignment
+        self._update(block_id, assignment, 1)
+
+    def _remove(self, block_id: str) -> None:
+        assignment = self.assignments.pop(block_id)
+        self._update(block_id, assignment, -1)
+
+
 class SchedulerEngine:
     def __init__(self, seed: int = 42) -> None:
         self.rng = Random(seed)
@@ -38,47 +220,314 @@ class SchedulerEngine:
         subjects: list[SubjectSpec],
         rooms: list[RoomSpec],
         config: AdminConfig,
-        ga_config: dict[str, int] | None = None,
+        ga_config: dict[str, Any] | None = None,
     ) -> tuple[list[TimetableEntry], ScoreBreakdown, SchedulerDiagnostics]:
+        ga_config = ga_config or {}
+        local_search = ga_config.get("local_search")
+        local_search_iterations = ga_config.get("local_search_iterations", 2000)
+        local_search_time_ms = ga_config.get("local_search_time_ms")
+        # With more than one island, each evolves its own population of
+        # `population_size` in a separate process; see `_evolve_islands`.
+        islands = ga_config.get("islands", 1)
+        if islands < 1:
+            raise ValueError("islands must be at least 1")
+        if ga_config.get("evaluation", "incremental") not in ("incremental", "numpy"):
+            raise ValueError(f"Unknown evaluation mode: {ga_config['evaluation']}")
+
+        blocks, slots, block_map, instance = self._prepare(sections, subjects, rooms, config)
+        if islands > 1:
+            best_candidate = self._evolve_islands(sections, subjects, rooms, config, ga_config, islands)
+            best_evaluator: IncrementalFitness | PenaltyScore = IncrementalFitness(best_candidate, instance)
+        else:
+            best_candidate, best_evaluator = self._evolve(blocks, slots, rooms, block_map, instance, ga_config)
+
+        if local_search:
+            if not isinstance(best_evaluator, IncrementalFitness):
+                best_evaluator = IncrementalFitness(best_candidate, instance)
+            best_candidate = self._local_search(
+                best_evaluator,
+                slots,
+                rooms,
+                block_map,
+                method=local_search,
+                iterations=local_search_iterations,
+                time_budget_ms=local_search_time_ms,
+            )
+
+        _, best_breakdown, best_diags = self._fitness(best_candidate, blocks, slots)
+        timetable_entries = self._to_timetable_entries(best_candidate, block_map)
+        return timetable_entries, best_breakdown, best_diags
+
+    def _prepare(
+        self,
+        sections: list[str],
+        subjects: list[SubjectSpec],
+        rooms: list[RoomSpec],
+        config: AdminConfig,
+    ) -> tuple[list[PeriodBlock], list[tuple[DayName, int]], dict[str, PeriodBlock], ProblemInstance]:
         blocks = self._expand_subject_blocks(sections, subjects)
         slots = self._build_slot_matrix(config)
+        block_map = {block.block_id: block for block in blocks}
+        instance = ProblemInstance.from_blocks(
+            blocks,
+            slots,
+            [room.name for room in rooms],
+            {room.name: "LAB" if room.is_lab else "CLASSROOM" for room in rooms},
+        )
+        return blocks, slots, block_map, instance
+
+    def _evolve(
+        self,
+        blocks: list[PeriodBlock],
+        slots: list[tuple[DayName, int]],
+        rooms: list[RoomSpec],
+        block_map: dict[str, PeriodBlock],
+        instance: ProblemInstance,
+        ga_config: dict[str, Any],
+        exchange: Callable[[int, list[dict[str, tuple[DayName, int, str]]]], list[dict[str, tuple[DayName, int, str]]]]
+        | None = None,
+    ) -> tuple[dict[str, tuple[DayName, int, str]], IncrementalFitness | PenaltyScore]:
+        # `exchange` is called every generation with the population ranked
+        # best first; the candidates it returns replace the worst members.
+        population_size = ga_config.get("population_size", 20)
+        generations = ga_config.get("generations", 30)
+        mutation_rate = ga_config.get("mutation_rate", 20)
+        # Called with a snapshot after every generation; returning False stops the GA.
+        progress = ga_config.get("progress")
+        # "numpy" scores each generation in one batch (see PopulationEvaluator)
+        # instead of updating an IncrementalFitness per child.
+        evaluation = ga_config.get("evaluation", "incremental")
+        repair_steps = ga_config.get("repair_steps")
 
-        population_size = (ga_config or {}).get("population_size", 20)
-        generations = (ga_config or {}).get("generations", 30)
-        mutation_rate = (ga_config or {}).get("mutation_rate", 20)
+        population = [self._construct_candidate(blocks, instance, rooms) for _ in range(population_size)]
+        population = [
+            self._repair_candidate(candidate, instance, rooms, block_map, repair_steps) for candidate in population
+        ]
+        batch = PopulationEvaluator(instance) if evaluation == "numpy" else None
 
-        block_map = {block.block_id: block for block in blocks}
-        population = [self._construct_candidate(blocks, slots, rooms, block_map) for _ in range(population_size)]
-        population = [self._repair_candidate(candidate, slots, rooms, block_map) for candidate in population]
+        def evaluate(candidates: list[dict[str, tuple[DayName, int, str]]]) -> list[Any]:
+            if batch is not None:
+                return batch.score(candidates)
+            return [IncrementalFitness(candidate, instance) for candidate in candidates]
 
+        evaluators = evaluate(population)
         best_candidate = population[0]
-        best_fitness, best_breakdown, best_diags = self._fitness(best_candidate, blocks, slots)
-
-        for _ in range(generations):
-            scored = []
-            for candidate in population:
-                fitness, breakdown, diagnostics = self._fitness(candidate, blocks, slots)
-                scored.append((fitness, candidate, breakdown, diagnostics))
+        best_evaluator = evaluators[0]
+        started = time.monotonic()
 
-            scored.sort(key=lambda item: item[0], reverse=True)
-            if scored[0][0] > best_fitness:
-                best_fitness, best_candidate, best_breakdown, best_diags = scored[0]
+        for generation in range(generations):
+            scored = sorted(zip(population, evaluators), key=lambda item: item[1].fitness, reverse=True)
+            if exchange is not None:
+                immigrants = exchange(generation, [candidate for candidate, _ in scored])[: population_size - 1]
+                if immigrants:
+                    scored = sorted(
+                        scored[: len(scored) - len(immigrants)] + list(zip(immigrants, evaluate(immigrants))),
+                        key=lambda item: item[1].fitness,
+                        reverse=True,
+                    )
+            if scored[0][1].fitness > best_evaluator.fitness:
+                best_candidate, best_evaluator = scored[0]
+            if progress is not None:
+                proceed = progress(
+                    {
+                        "generation": generation,
+                        "best_fitness": best_evaluator.fitness,
+                        "hard_conflicts": best_evaluator.hard_conflicts,
+                        "soft_penalty": best_evaluator.total_penalty - best_evaluator.hard_conflicts * 100,
+                        "elapsed_ms": round((time.monotonic() - started) * 1000, 2),
+                    }
+                )
+                if proceed is False:
+                    break
 
-            parents = [item[1] for item in scored[: max(2, population_size // 2)]]
-            next_generation: list[dict[str, tuple[DayName, int, str]]] = [scored[0][1]]
+            parents = scored[: max(2, population_size // 2)]
+            next_generation: list[dict[str, tuple[DayName, int, str]]] = [scored[0][0]]
+            next_evaluators = [scored[0][1]]
 
             while len(next_generation) < population_size:
-                p1 = self.rng.choice(parents)
-                p2 = self.rng.choice(parents)
+                p1, p1_fitness = self.rng.choice(parents)
+                p2, p2_fitness = self.rng.choice(parents)
                 child = self._crossover(p1, p2)
                 child = self._mutate(child, slots, rooms, mutation_rate)
-                child = self._repair_candidate(child, slots, rooms, block_map)
+                child = self._repair_candidate(child, instance, rooms, block_map, repair_steps)
                 next_generation.append(child)
+                if batch is None:
+                    next_evaluators.append(self._child_fitness(child, [(p1, p1_fitness), (p2, p2_fitness)], instance))
 
             population = next_generation
+            evaluators = next_evaluators if batch is None else next_evaluators + batch.score(next_generation[1:])
 
-        timetable_entries = self._to_timetable_entries(best_candidate, block_map)
-        return timetable_entries, best_breakdown, best_diags
+        return best_candidate, best_evaluator
+
+    def _evolve_islands(
+        self,
+        sections: list[str],
+        subjects: list[SubjectSpec],
+        rooms: list[RoomSpec],
+        config: AdminConfig,
+        ga_config: dict[str, Any],
+        islands: int,
+    ) -> dict[str, tuple[DayName, int, str]]:
+        # Island model: `islands` processes arranged in a ring, each sending
+        # copies of its best `migrants` candidates to the next island every
+        # `migration_interval` generations. Sends go through a
+        # multiprocessing.Queue and arrivals are only polled, so no island
+        # ever waits for another; migrants join the population on the next
+        # generation that finds them. Timing decides which generation that
+        # is, so island runs are not bit-for-bit reproducible. Progress is
+        # not reported from island processes.
+        if ga_config.get("migration_interval", ISLAND_MIGRATION_INTERVAL) < 1:
+            raise ValueError("migration_interval must be at least 1")
+        island_config = {key: value for key, value in ga_config.items() if key != "progress"}
+        context = multiprocessing.get_context()
+        inboxes = [context.Queue() for _ in range(islands)]
+        results = context.Queue()
+        processes = [
+            context.Process(
+                target=_run_island,
+                args=(
+                    self.rng.randrange(2**32),
+                    sections,
+                    subjects,
+                    rooms,
+                    config,
+                    island_config,
+                    inboxes[index],
+                    inboxes[(index + 1) % islands],
+                    results,
+                ),
+                daemon=True,
+            )
+            for index in range(islands)
+        ]
+        for process in processes:
+            process.start()
+        finished: list[tuple[float, dict[str, tuple[DayName, int, str]]]] = []
+        try:
+            while len(finished) < islands:
+                try:
+                    finished.append(results.get(timeout=0.5))
+                except queue.Empty:
+                    if any(process.exitcode not in (None, 0) for process in processes):
+                        raise RuntimeError("An island process exited without a result") from None
+        finally:
+            for process in processes:
+                process.join(timeout=1)
+                if process.is_alive():
+                    process.terminate()
+        return max(finished, key=lambda item: item[0])[1]
+
+    def _local_search(
+        self,
+        evaluator: IncrementalFitness,
+        slots: list[tuple[DayName, int]],
+        rooms: list[RoomSpec],
+        block_map: dict[str, PeriodBlock],
+        method: Literal["sa", "tabu"],
+        iterations: int,
+        time_budget_ms: float | None = None,
+    ) -> dict[str, tuple[DayName, int, str]]:
+        # Post-GA improvement over move / swap / kick neighborhoods, scored
+        # through the incremental evaluator so each step costs O(moved blocks).
+        if method not in ("sa", "tabu"):
+            raise ValueError(f"Unknown local search method: {method}")
+
+        state = evaluator.copy()
+        best_state = state.copy()
+        block_ids = list(state.assignments)
+        if not block_ids:
+            return dict(state.assignments)
+        compatible = {block_id: self._compatible_rooms(block_map[block_id], rooms) for block_id in block_ids}
+        tabu: deque[str] = deque(maxlen=LOCAL_SEARCH_TABU_TENURE)
+        temperature = 50.0
+        cooling = (0.5 / temperature) ** (1 / max(1, iterations))
+        started = time.monotonic()
+
+        def neighbor() -> list[tuple[str, tuple[DayName, int, str]]]:
+            roll = self.rng.random()
+            first = self.rng.choice(block_ids)
+            if roll < 0.5:
+                day, period = self.rng.choice(slots)
+                return [(first, (day, period, self.rng.choice(compatible[first])))]
+            second = self.rng.choice(block_ids)
+            first_day, first_period, first_room = state.assignments[first]
+            second_day, second_period, second_room = state.assignments[second]
+            if roll < 0.8:
+                return [
+                    (first, (second_day, second_period, first_room)),
+                    (second, (first_day, first_period, second_room)),
+                ]
+            # Kick: first takes second's place, second is pushed to a random slot.
+            room = second_room if second_room in compatible[first] else first_room
+            day, period = self.rng.choice(slots)
+            return [
+                (first, (second_day, second_period, room)),
+                (second, (day, period, self.rng.choice(compatible[second]))),
+            ]
+
+        def apply(moves: list[tuple[str, tuple[DayName, int, str]]]) -> tuple[int, list[tuple[str, tuple[DayName, int, str]]]]:
+            undo = [(block_id, state.assignments[block_id]) for block_id, _ in moves]
+            delta = sum(state.move(block_id, assignment) for block_id, assignment in moves)
+            return delta, undo
+
+        def revert(undo: list[tuple[str, tuple[DayName, int, str]]]) -> None:
+            for block_id, assignment in reversed(undo):
+                state.move(block_id, assignment)
+
+        for _ in range(iterations):
+            if best_state.total_penalty == 0:
+                break
+            if time_budget_ms is not None and (time.monotonic() - started) * 1000 >= time_budget_ms:
+                break
+
+            if method == "sa":
+                delta, undo = apply(neighbor())
+                if delta > 0 and self.rng.random() >= math.exp(-delta / temperature):
+                    revert(undo)
+                temperature *= cooling
+            else:
+                chosen: tuple[int, list[tuple[str, tuple[DayName, int, str]]]] | None = None
+                for _ in range(LOCAL_SEARCH_TABU_SAMPLE):
+                    moves = neighbor()
+                    delta, undo = apply(moves)
+                    revert(undo)
+                    aspiration = state.total_penalty + delta < best_state.total_penalty
+                    if any(block_id in tabu for block_id, _ in moves) and not aspiration:
+                        continue
+                    if chosen is None or delta < chosen[0]:
+                        chosen = (delta, moves)
+                if chosen is None:
+                    continue
+                apply(chosen[1])
+                tabu.extend(block_id for block_id, _ in chosen[1])
+
+            if state.total_penalty < best_state.total_penalty:
+                best_state = state.copy()
+
+        return dict(best_state.assignments)
+
+    def _child_fitness(
+        self,
+        child: dict[str, tuple[DayName, int, str]],
+        parents: list[tuple[dict[str, tuple[DayName, int, str]], IncrementalFitness]],
+        instance: ProblemInstance,
+    ) -> IncrementalFitness:
+        # Score the child as its closest parent plus the blocks that moved; a
+        # move costs about two block insertions, so past half the blocks a
+        # fresh evaluation is cheaper.
+        best_moves: list[str] | None = None
+        best_base: IncrementalFitness | None = None
+        for parent, evaluator in parents:
+            moved = [block_id for block_id, assignment in child.items() if parent.get(block_id) != assignment]
+            if best_moves is None or len(moved) < len(best_moves):
+                best_moves, best_base = moved, evaluator
+        if best_base is None or best_moves is None or len(best_moves) * 2 >= len(child):
+            return IncrementalFitness(child, instance)
+
+        evaluator = best_base.copy()
+        for block_id in best_moves:
+            evaluator.move(block_id, child[block_id])
+        return evaluator
 
     def _expand_subject_blocks(self, sections: list[str], subjects: list[SubjectSpec]) -> list[PeriodBlock]:
         blocks: list[PeriodBlock] = []
@@ -159,114 +608,190 @@ class SchedulerEngine:
     def _construct_candidate(
         self,
         blocks: list[PeriodBlock],
-        slots: list[tuple[DayName, int]],
+        instance: ProblemInstance,
         rooms: list[RoomSpec],
-        block_map: dict[str, PeriodBlock],
     ) -> dict[str, tuple[DayName, int, str]]:
+        # Faculty / section / room occupancy is kept as flat per-slot flags
+        # (see `ProblemInstance`), so a probe costs O(block length) instead
+        # of a scan over every assignment made so far.
+        slot_count = instance.slot_count
+        occupied = (
+            bytearray(len(instance.faculty) * slot_count),
+            bytearray(len(instance.sections) * slot_count),
+            bytearray(len(instance.rooms) * slot_count),
+        )
+        compatible_by_kind: dict[str, list[str]] = {}
         assignments: dict[str, tuple[DayName, int, str]] = {}
         for block in blocks:
-            candidate_slots = slots[:]
-            self.rng.shuffle(candidate_slots)
+            task = instance.task(block.block_id)
+            if block.kind not in compatible_by_kind:
+                compatible_by_kind[block.kind] = self._compatible_rooms(block, rooms)
+            room_pool = compatible_by_kind[block.kind]
+            candidate_starts = list(range(slot_count))
+            self.rng.shuffle(candidate_starts)
             chosen = None
-            for day, period in candidate_slots:
-                room_pool = self._compatible_rooms(block, rooms)
-                if not room_pool:
-                    continue
-                room = self.rng.choice(room_pool)
-                if self._can_place(assignments, block, day, period, room, slots, block_map):
-                    chosen = (day, period, room)
-                    break
+            if room_pool:
+                for start in candidate_starts:
+                    room = self.rng.choice(room_pool)
+                    if self._can_place(occupied, instance, task, start, instance.room(room)):
+                        chosen = (start, room)
+                        break
             if chosen is None:
-                room = self.rng.choice(self._compatible_rooms(block, rooms) or [rooms[0].name])
-                day, period = self.rng.choice(slots)
-                chosen = (day, period, room)
-            assignments[block.block_id] = chosen
+                room = self.rng.choice(room_pool or [rooms[0].name])
+                chosen = (self.rng.choice(range(slot_count)), room)
+
+            start, room = chosen
+            day, period = instance.slots[start]
+            assignments[block.block_id] = (day, period, room)
+            faculty_slots, section_slots, room_slots = occupied
+            faculty_base = instance.task_faculty[task] * slot_count
+            section_base = instance.task_section[task] * slot_count
+            room_base = instance.room(room) * slot_count
+            for slot_id in range(start, start + min(block.length, instance.slot_run[start])):
+                faculty_slots[faculty_base + slot_id] = 1
+                section_slots[section_base + slot_id] = 1
+                room_slots[room_base + slot_id] = 1
         return assignments
 
     def _can_place(
         self,
-        assignments: dict[str, tuple[DayName, int, str]],
-        block: PeriodBlock,
-        day: DayName,
-        period: int,
-        room: str,
-        slots: list[tuple[DayName, int]],
-        block_map: dict[str, PeriodBlock],
+        occupied: tuple[bytearray, bytearray, bytearray],
+        instance: ProblemInstance,
+        task: int,
+        start: int,
+        room_id: int,
     ) -> bool:
-        for offset in range(block.length):
-            if (day, period + offset) not in slots:
+        length = instance.task_length[task]
+        if length > instance.slot_run[start]:
+            return False
+        slot_count = instance.slot_count
+        faculty_slots, section_slots, room_slots = occupied
+        faculty_base = instance.task_faculty[task] * slot_count
+        section_base = instance.task_section[task] * slot_count
+        room_base = room_id * slot_count
+        for slot_id in range(start, start + length):
+            if faculty_slots[faculty_base + slot_id] or section_slots[section_base + slot_id] or room_slots[room_base + slot_id]:
                 return False
-
-        for assigned_id, (a_day, a_period, a_room) in assignments.items():
-            assigned_block = block_map[assigned_id]
-            for offset in range(block.length):
-                target_period = period + offset
-                for a_offset in range(assigned_block.length):
-                    occupied_period = a_period + a_offset
-                    if a_day == day and occupied_period == target_period:
-                        if assigned_block.faculty_id == block.faculty_id:
-                            return False
-                        if assigned_block.section == block.section:
-                            return False
-                        if a_room == room:
-                            return False
-
         return True
 
     def _repair_candidate(
         self,
         candidate: dict[str, tuple[DayName, int, str]],
-        slots: list[tuple[DayName, int]],
+        instance: ProblemInstance,
         rooms: list[RoomSpec],
         block_map: dict[str, PeriodBlock],
+        max_steps: int | None = None,
     ) -> dict[str, tuple[DayName, int, str]]:
-        # Light CSP-repair: reassign items that violate hard constraints.
+        # Min-conflicts repair. Every block involved in a hard violation sits
+        # in a max-heap keyed by its conflict count; each step pops the worst
+        # one and moves it to the (start, room) with the fewest conflicts,
+        # judged against per-(resource, slot) occupancy counts. Moves must
+        # strictly improve, a block that still clashes is queued again, and
+        # the repair stops when the heap is empty or after `max_steps`.
         fixed = dict(candidate)
-        occupied_faculty: set[tuple[str, DayName, int]] = set()
-        occupied_room: set[tuple[str, DayName, int]] = set()
-        occupied_section: set[tuple[str, DayName, int]] = set()
+        slot_count = instance.slot_count
+        slot_run = instance.slot_run
+        faculty_slots = [0] * (len(instance.faculty) * slot_count)
+        room_slots = [0] * (len(instance.rooms) * slot_count)
+        section_slots = [0] * (len(instance.sections) * slot_count)
+        compatible_by_kind: dict[str, list[int]] = {}
+        placement: dict[str, tuple[int, int]] = {}
+        misplaced: set[str] = set()
+
+        def occupy(task: int, start: int, room_id: int, step: int) -> None:
+            if start < 0:
+                return
+            faculty_base = instance.task_faculty[task] * slot_count
+            section_base = instance.task_section[task] * slot_count
+            room_base = room_id * slot_count
+            for slot_id in range(start, start + min(instance.task_length[task], slot_run[start])):
+                faculty_slots[faculty_base + slot_id] += step
+                room_slots[room_base + slot_id] += step
+                section_slots[section_base + slot_id] += step
 
-        for block_id in list(fixed.keys()):
-            day, period, room = fixed[block_id]
+        def conflicts(block_id: str) -> int:
+            task = instance.task(block_id)
+            start, room_id = placement[block_id]
+            length = instance.task_length[task]
+            if start < 0:
+                return length
+            covered = min(length, slot_run[start])
+            faculty_base = instance.task_faculty[task] * slot_count
+            section_base = instance.task_section[task] * slot_count
+            room_base = room_id * slot_count
+            count = length - covered + (block_id in misplaced)
+            for slot_id in range(start, start + covered):
+                count += (
+                    faculty_slots[faculty_base + slot_id]
+                    + room_slots[room_base + slot_id]
+                    + section_slots[section_base + slot_id]
+                    - 3
+                )
+            return count
+
+        for block_id, (day, period, room) in fixed.items():
             block = block_map[block_id]
+            if block.kind not in compatible_by_kind:
+                compatible_by_kind[block.kind] = [instance.room(name) for name in self._compatible_rooms(block, rooms)]
+            room_id = instance.room(room)
+            if room_id not in compatible_by_kind[block.kind]:
+                misplaced.add(block_id)
+            placement[block_id] = (instance.slot(day, period), room_id)
+            occupy(instance.task(block_id), *placement[block_id], 1)
 
-            def has_conflict(test_day: DayName, test_period: int, test_room: str) -> bool:
-                if block.kind == "LAB" and test_room not in self._compatible_rooms(block, rooms):
-                    return True
-                for offset in range(block.length):
-                    slot = (test_day, test_period + offset)
-                    if slot not in slots:
-                        return True
-                    if (block.faculty_id, test_day, test_period + offset) in occupied_faculty:
-                        return True
-                    if (test_room, test_day, test_period + offset) in occupied_room:
-                        return True
-                    if (block.section, test_day, test_period + offset) in occupied_section:
-                        return True
-                return False
+        heap = []
+        for order, block_id in enumerate(fixed):
+            count = conflicts(block_id)
+            if count:
+                heap.append((-count, order, block_id))
+        heapq.heapify(heap)
 
-            if has_conflict(day, period, room):
-                reassigned = False
-                for alt_day, alt_period in slots:
-                    for alt_room in self._compatible_rooms(block, rooms):
-                        if has_conflict(alt_day, alt_period, alt_room):
-                            continue
-                        fixed[block_id] = (alt_day, alt_period, alt_room)
-                        day, period, room = alt_day, alt_period, alt_room
-                        reassigned = True
-                        break
-                    if reassigned:
-                        break
-                if not reassigned:
-                    compatible = self._compatible_rooms(block, rooms)
-                    fallback_room = compatible[0] if compatible else rooms[0].name
-                    fixed[block_id] = (slots[0][0], slots[0][1], fallback_room)
-                    day, period, room = fixed[block_id]
+        steps = len(fixed) * REPAIR_STEPS_PER_BLOCK if max_steps is None else max_steps
+        while heap and steps > 0:
+            priority, order, block_id = heapq.heappop(heap)
+            current = conflicts(block_id)
+            if current == 0:
+                continue
+            if current != -priority:
+                heapq.heappush(heap, (-current, order, block_id))
+                continue
+            steps -= 1
 
-            for offset in range(block.length):
-                occupied_faculty.add((block.faculty_id, day, period + offset))
-                occupied_room.add((room, day, period + offset))
-                occupied_section.add((block.section, day, period + offset))
+            task = instance.task(block_id)
+            length = instance.task_length[task]
+            faculty_base = instance.task_faculty[task] * slot_count
+            section_base = instance.task_section[task] * slot_count
+            occupy(task, *placement[block_id], -1)
+            best_cost, best = current, placement[block_id]
+            # Start the scan at a random slot so ties don't pile onto early periods.
+            offset = self.rng.randrange(slot_count)
+            for shift in range(slot_count):
+                start = (offset + shift) % slot_count
+                covered = min(length, slot_run[start])
+                span = range(start, start + covered)
+                base_cost = length - covered
+                for slot_id in span:
+                    base_cost += faculty_slots[faculty_base + slot_id] + section_slots[section_base + slot_id]
+                if base_cost >= best_cost:
+                    continue
+                for room_id in compatible_by_kind[block_map[block_id].kind]:
+                    room_base = room_id * slot_count
+                    cost = base_cost + sum(room_slots[room_base + slot_id] for slot_id in span)
+                    if cost < best_cost:
+                        best_cost, best = cost, (start, room_id)
+                        if cost == base_cost:
+                            break
+                if best_cost == 0:
+                    break
+
+            if best_cost < current:
+                placement[block_id] = best
+                misplaced.discard(block_id)
+                day, period = instance.slots[best[0]]
+                fixed[block_id] = (day, period, instance.rooms[best[1]])
+                if best_cost:
+                    heapq.heappush(heap, (-best_cost, order, block_id))
+            occupy(task, *placement[block_id], 1)
 
         return fixed
 
@@ -479,3 +1004,38 @@ class SchedulerEngine:
             if lab_rooms:
                 return lab_rooms
         return [room.name for room in rooms]
+
+
+def _run_island(
+    seed: int,
+    sections: list[str],
+    subjects: list[SubjectSpec],
+    rooms: list[RoomSpec],
+    config: AdminConfig,
+    ga_config: dict[str, Any],
+    inbox: Any,
+    outbox: Any,
+    results: Any,
+) -> None:
+    engine = SchedulerEngine(seed)
+    blocks, slots, block_map, instance = engine._prepare(sections, subjects, rooms, config)
+    interval = ga_config.get("migration_interval", ISLAND_MIGRATION_INTERVAL)
+    migrants = ga_config.get("migrants", ISLAND_MIGRANTS)
+    # Migrants left unread when the neighbour finishes must not keep this
+    # process alive waiting for the queue to flush.
+    outbox.cancel_join_thread()
+
+    def exchange(
+        generation: int, ranked: list[dict[str, tuple[DayName, int, str]]]
+    ) -> list[dict[str, tuple[DayName, int, str]]]:
+        if generation and generation % interval == 0:
+            outbox.put(ranked[:migrants])
+        arrivals: list[dict[str, tuple[DayName, int, str]]] = []
+        while True:
+            try:
+                arrivals.extend(inbox.get_nowait())
+            except queue.Empty:
+                return arrivals
+
+    candidate, evaluator = engine._evolve(blocks, slots, rooms, block_map, instance, ga_config, exchange)
+    results.put((evaluator.fitness, candidate))
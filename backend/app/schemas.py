@@ -186,6 +186,48 @@ class SchedulerGenerateResult(TimetableGenerateResponse):
     conflicts: list[ConflictRecord] = Field(default_factory=list)
     fitness_score: float
     constraint_summary: dict
+    stop_reason: Literal["generations", "target_reached", "time_budget", "stalled", "cancelled"] | None = None
+    diagnostics: dict = Field(default_factory=dict)
+
+
+class SchedulerGenerateRequest(BaseModel):
+    tenant_id: str
+    sections: list[SchedulerSectionInput]
+    rooms: list[RoomSpec]
+    admin: SchedulerAdminConfig
+    population_size: int = Field(default=20, ge=2)
+    generations: int = Field(default=20, ge=0)
+    mutation_rate: float = Field(default=0.2, ge=0, le=1)
+    seed: int | None = None
+    time_budget_ms: float | None = Field(default=None, gt=0)
+    stall_generations: int | None = Field(default=None, ge=1)
+    target_fitness: float | None = None
+    task_ordering: Literal["input", "longest_first", "faculty_load", "dsatur"] = "input"
+    local_search: Literal["sa", "tabu"] | None = None
+    solver: Literal["ga", "csp", "auto"] = "ga"
+    decompose: bool = False
+    profile: bool = False
+    # A previous timetable to start from: its entries, or the id of one in
+    # TIMETABLE_CACHE (resolved by the API before the run is queued).
+    warm_start: list[TimetableEntry] | None = None
+    warm_start_timetable_id: str | None = None
+
+    @model_validator(mode="after")
+    def check_warm_start(self) -> "SchedulerGenerateRequest":
+        if self.warm_start is not None and self.warm_start_timetable_id is not None:
+            raise ValueError("Pass warm_start or warm_start_timetable_id, not both")
+        return self
+
+
+class JobStatusResponse(BaseModel):
+    job_id: str
+    tenant_id: str
+    status: Literal["queued", "running", "succeeded", "failed", "timed_out", "cancelled"]
+    submitted_at: float
+    started_at: float | None = None
+    finished_at: float | None = None
+    result: SchedulerGenerateResult | None = None
+    error: str | None = None
 
 
 class TimetableValidateRequest(BaseModel):
@@ -1,6 +1,12 @@
+import json
+import time
+
+import pytest
 from fastapi.testclient import TestClient
 
+from app.jobs import JobQueue, solve_request
 from app.main import app
+from app.schemas import SchedulerGenerateRequest
 
 client = TestClient(app)
 
@@ -145,3 +151,172 @@ def test_generate_with_custom_configuration_and_validation() -> None:
     }
     invalid_response = client.post('/timetables/generate', json=invalid_payload)
     assert invalid_response.status_code == 422
+
+
+def test_scheduler_stream_emits_progress_then_result() -> None:
+    payload = {
+        'tenant_id': 't1',
+        'sections': [{'section': 'CSE-A', 'subjects': [{'code': 'CS501', 'ltp': '3-0-0', 'faculty_id': 'F1'}]}],
+        'rooms': [{'room_id': 'R101'}],
+        'admin': {'working_days': ['Monday', 'Tuesday'], 'hours_per_day': 4},
+        'generations': 3,
+        'seed': 1,
+    }
+    response = client.post('/scheduler/generate/stream', json=payload)
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/event-stream')
+
+    events = []
+    for block in response.text.strip().split('\n\n'):
+        event_line, data_line = block.split('\n')
+        events.append((event_line.removeprefix('event: '), json.loads(data_line.removeprefix('data: '))))
+    assert [name for name, _ in events[:-1]] == ['progress'] * (len(events) - 1)
+    assert events[0][1]['generation'] == 0
+    name, result = events[-1]
+    assert name == 'result'
+    assert result['conflict_count'] == 0
+    assert len(result['timetable']) == 3
+
+
+def test_scheduler_job_runs_in_background_and_reports_result() -> None:
+    payload = {
+        'tenant_id': 't1',
+        'sections': [{'section': 'CSE-B', 'subjects': [{'code': 'CS502', 'ltp': '2-0-0', 'faculty_id': 'F2'}]}],
+        'rooms': [{'room_id': 'R102'}],
+        'admin': {'working_days': ['Monday'], 'hours_per_day': 4},
+        'seed': 1,
+    }
+    submit_response = client.post('/scheduler/jobs', json=payload)
+    assert submit_response.status_code == 202
+    job_id = submit_response.json()['job_id']
+
+    deadline = time.monotonic() + 30
+    while (job := client.get(f'/jobs/{job_id}').json())['status'] in ('queued', 'running'):
+        assert time.monotonic() < deadline
+        time.sleep(0.05)
+    assert job['status'] == 'succeeded'
+    assert job['result']['timetable_id'] == job_id
+    assert len(job['result']['timetable']) == 2
+    assert client.get('/jobs/missing').status_code == 404
+
+
+def _finished_job(job_id: str) -> dict:
+    deadline = time.monotonic() + 30
+    while (job := client.get(f'/jobs/{job_id}').json())['status'] in ('queued', 'running'):
+        assert time.monotonic() < deadline
+        time.sleep(0.05)
+    return job
+
+
+def test_scheduler_job_warm_starts_from_a_cached_timetable() -> None:
+    payload = {
+        'tenant_id': 't1',
+        'sections': [{'section': 'CSE-F', 'subjects': [{'code': 'CS506', 'ltp': '2-0-0', 'faculty_id': 'F6'}]}],
+        'rooms': [{'room_id': 'R106'}],
+        'admin': {'working_days': ['Monday', 'Tuesday'], 'hours_per_day': 4},
+        'seed': 1,
+    }
+    first = _finished_job(client.post('/scheduler/jobs', json=payload).json()['job_id'])
+    payload['sections'][0]['subjects'].append({'code': 'CS507', 'ltp': '1-0-0', 'faculty_id': 'F7'})
+
+    by_id = client.post('/scheduler/jobs', json={**payload, 'warm_start_timetable_id': first['job_id']})
+    by_entries = client.post('/scheduler/jobs', json={**payload, 'warm_start': first['result']['timetable']})
+
+    for response in (by_id, by_entries):
+        job = _finished_job(response.json()['job_id'])
+        assert job['status'] == 'succeeded'
+        assert job['result']['diagnostics']['warm_start'] == {'tasks': 3, 'pinned': 2, 'kept': 2}
+    missing = client.post('/scheduler/jobs', json={**payload, 'warm_start_timetable_id': 'missing'})
+    assert missing.status_code == 404
+    both = {**payload, 'warm_start_timetable_id': first['job_id'], 'warm_start': first['result']['timetable']}
+    assert client.post('/scheduler/jobs', json=both).status_code == 422
+
+
+def test_job_queue_rejects_submissions_beyond_max_depth() -> None:
+    payload = SchedulerGenerateRequest(
+        tenant_id='t1',
+        sections=[{'section': 'CSE-C', 'subjects': [{'code': 'CS503', 'ltp': '6-0-0', 'faculty_id': 'F3'}]}],
+        rooms=[{'room_id': 'R103'}],
+        admin={'working_days': ['Monday'], 'hours_per_day': 4},
+        generations=10_000,
+        time_budget_ms=2000,
+    )
+    queue = JobQueue(workers=1, max_queue_depth=1)
+    try:
+        queue.submit(payload)
+        with pytest.raises(RuntimeError, match='queue is full'):
+            queue.submit(payload)
+    finally:
+        queue.shutdown()
+
+
+# Runs in the job process, so it must be importable from this module.
+def _slow_solve(payload: SchedulerGenerateRequest, progress=None):
+    if payload.tenant_id == 'slow':
+        time.sleep(60)
+    return solve_request(payload, progress=progress)
+
+
+def _wait_for(queue: JobQueue, job_id: str, statuses: tuple[str, ...], timeout_s: float = 30):
+    deadline = time.monotonic() + timeout_s
+    while (job := queue.get(job_id)) is not None and job.status not in statuses:
+        assert time.monotonic() < deadline
+        time.sleep(0.02)
+    return job
+
+
+def test_job_queue_kills_jobs_past_their_timeout() -> None:
+    payload = SchedulerGenerateRequest(
+        tenant_id='slow',
+        sections=[{'section': 'CSE-D', 'subjects': [{'code': 'CS504', 'ltp': '2-0-0', 'faculty_id': 'F4'}]}],
+        rooms=[{'room_id': 'R104'}],
+        admin={'working_days': ['Monday'], 'hours_per_day': 4},
+        seed=1,
+    )
+    queue = JobQueue(workers=1, job_timeout_s=1.0, timeout_grace_s=0.5, retention_s=1.0, solve=_slow_solve)
+    try:
+        slow = queue.submit(payload)
+        fast = queue.submit(payload.model_copy(update={'tenant_id': 't1'}))
+        assert _wait_for(queue, slow.job_id, ('running',)).started_at is not None
+
+        slow = _wait_for(queue, slow.job_id, ('succeeded', 'failed', 'timed_out'))
+        assert slow.status == 'timed_out'
+        assert slow.finished_at - slow.started_at < 5
+        # The only worker slot is free again, so the next job runs.
+        assert _wait_for(queue, fast.job_id, ('succeeded', 'failed', 'timed_out')).status == 'succeeded'
+
+        assert _wait_for(queue, slow.job_id, (), timeout_s=5) is None
+    finally:
+        queue.shutdown()
+
+
+def test_job_queue_forwards_progress_and_cancels_running_jobs() -> None:
+    payload = SchedulerGenerateRequest(
+        tenant_id='slow',
+        sections=[{'section': 'CSE-E', 'subjects': [{'code': 'CS505', 'ltp': '2-0-0', 'faculty_id': 'F5'}]}],
+        rooms=[{'room_id': 'R105'}],
+        admin={'working_days': ['Monday'], 'hours_per_day': 4},
+        generations=3,
+        seed=1,
+    )
+    snapshots, finished = [], []
+    queue = JobQueue(workers=1, solve=_slow_solve)
+    try:
+        slow = queue.submit(payload, on_finish=finished.append)
+        fast = queue.submit(
+            payload.model_copy(update={'tenant_id': 't1'}), on_progress=snapshots.append, on_finish=finished.append
+        )
+        _wait_for(queue, slow.job_id, ('running',))
+        assert queue.cancel(slow.job_id)
+        assert queue.get(slow.job_id).status == 'cancelled'
+
+        assert _wait_for(queue, fast.job_id, ('succeeded', 'failed')).status == 'succeeded'
+        assert not queue.cancel(fast.job_id)
+        deadline = time.monotonic() + 5
+        while not finished:
+            assert time.monotonic() < deadline
+            time.sleep(0.02)
+        assert [job.job_id for job in finished] == [fast.job_id]
+        assert snapshots and snapshots[0]['generation'] == 0
+    finally:
+        queue.shutdown()
@@ -1,5 +1,26 @@
-from app.scheduler.engine import preprocess, run_scheduler
+import importlib
+import random
+import sys
+from types import ModuleType
+from typing import Iterator, Literal
+
+from pydantic import BaseModel, Field
+import pytest
+
+from app import schemas
+from app.scheduler.batch_fitness import PopulationEvaluator
+from app.scheduler.benchmark import compare_to_baseline, run_benchmarks
+from app.scheduler.cache import CandidateCache
+from app.scheduler.decompose import split_components
+from app.scheduler.engine import generate_candidate, materialize, preprocess, run_scheduler
+from app.scheduler.instance import ProblemInstance
+from app.scheduler.local_search import improve_genes
+from app.scheduler.occupancy import InstanceGrid, OccupancyGrid, block_mask
+from app.scheduler.ordering import order_tasks
+from app.scheduler.profiling import Profiler
+from app.scheduler.synthetic import generate_institution
 from app.schemas import SchedulerAdminConfig, SchedulerSectionInput, SchedulerSubjectInput
+from app.services import detect_conflicts
 
 
 def test_lab_continuity_blocks_created() -> None:
@@ -100,3 +121,934 @@ def test_multi_section_clash_avoidance_for_elective_sync() -> None:
     b_entry = next(entry for entry in result.timetable if entry.section == "CSE-B")
     assert (a_entry.day, a_entry.period) == (b_entry.day, b_entry.period)
     assert not any(conflict.conflict_type == "SECTION" for conflict in result.conflicts)
+
+
+def test_generated_timetable_has_no_resource_double_booking() -> None:
+    sections = [
+        SchedulerSectionInput(
+            section=f"ECE-{name}",
+            subjects=[
+                SchedulerSubjectInput(code="SIG", ltp="3-1-0", faculty_id="F-SIG"),
+                SchedulerSubjectInput(code="VLSI", ltp="2-0-2", faculty_id="F-VLSI", lab_block_size=2),
+            ],
+        )
+        for name in ("A", "B", "C")
+    ]
+    admin = SchedulerAdminConfig(working_days=["Monday", "Tuesday", "Wednesday"], hours_per_day=5)
+
+    result = run_scheduler(
+        tenant_id="t-grid",
+        sections=sections,
+        rooms=["R1", "R2", "LAB1"],
+        room_types={"R1": "CLASSROOM", "R2": "CLASSROOM", "LAB1": "LAB"},
+        admin=admin,
+        population_size=6,
+        generations=4,
+    )
+
+    assert result.constraint_summary["exact_weekly_fulfillment"] is True
+    assert detect_conflicts(result.timetable) == []
+
+
+def test_lab_block_keeps_one_room_across_its_periods() -> None:
+    sections = [
+        SchedulerSectionInput(
+            section=f"MECH-{name}",
+            subjects=[SchedulerSubjectInput(code="CAD", ltp="0-0-2", faculty_id=f"F-CAD-{name}", room_type="LAB")],
+        )
+        for name in ("A", "B")
+    ]
+    admin = SchedulerAdminConfig(working_days=["Monday"], hours_per_day=2)
+
+    result = run_scheduler(
+        tenant_id="t-lab-room",
+        sections=sections,
+        rooms=["R1", "LAB1", "LAB2"],
+        room_types={"R1": "CLASSROOM", "LAB1": "LAB", "LAB2": "LAB"},
+        admin=admin,
+        population_size=4,
+        generations=2,
+    )
+
+    assert result.constraint_summary["exact_weekly_fulfillment"] is True
+    for section in ("MECH-A", "MECH-B"):
+        rooms = {entry.room for entry in result.timetable if entry.section == section}
+        assert len(rooms) == 1 and rooms <= {"LAB1", "LAB2"}
+
+
+def test_occupancy_grid_undo_restores_marked_state() -> None:
+    grid = OccupancyGrid(["R1", "R2"], {"R1": "CLASSROOM", "R2": "CLASSROOM"}, slot_count=4)
+    grid.occupy("F1", "CSE-A", "R1", start=0, duration=2)
+    mark = grid.mark()
+
+    grid.occupy("F2", "CSE-B", "R2", start=1, duration=2)
+    assert grid.rooms.find("CLASSROOM", 1, 1) is None
+
+    grid.undo(mark)
+    assert grid.is_free("F2", "CSE-B", block_mask(0, 4))
+    assert not grid.is_free("F1", "CSE-B", block_mask(1, 1))
+    assert grid.rooms.find("CLASSROOM", 1, 2) == "R2"
+
+
+def test_instance_grid_books_rooms_by_type_and_undoes_to_a_mark() -> None:
+    instance = ProblemInstance([("Monday", period) for period in range(1, 5)], ["R1", "LAB1", "R2"], {"LAB1": "LAB"})
+    first = instance.add_task("T1", "CSE-A", "F1", "DBMS", 2, "CLASSROOM")
+    instance.add_task("T2", "CSE-B", "F2", "CN", 2, "SEMINAR")
+    classroom, seminar = instance.task_room_type[first], instance.task_room_type[1]
+    r1, r2 = instance.room("R1"), instance.room("R2")
+    grid = InstanceGrid(instance)
+    grid.occupy(instance.task_faculty[first], instance.task_section[first], r1, start=0, duration=2)
+    mark = grid.mark()
+
+    grid.occupy(instance.task_faculty[first], instance.task_section[first], r2, start=1, duration=2)
+    assert grid.find_room(classroom, 1, 1) == -1
+    assert grid.exhausted[classroom] == 0b10
+    assert grid.exhausted[seminar] == 0b1111
+    assert not grid.room_is_free(instance.room("LAB1"), classroom, 0, 1)
+
+    grid.undo(mark)
+    assert grid.faculty[instance.task_faculty[first]] == block_mask(0, 2)
+    assert grid.exhausted[classroom] == 0
+    assert grid.find_room(classroom, 1, 2) == r2
+    assert grid.room_is_free(r2, classroom, 0, 4)
+
+
+def test_parallel_population_matches_serial_run() -> None:
+    sections = [
+        SchedulerSectionInput(
+            section=f"IT-{name}",
+            subjects=[
+                SchedulerSubjectInput(code="DBMS", ltp="3-0-2", faculty_id="F-DB", lab_block_size=2),
+                SchedulerSubjectInput(code="CN", ltp="3-1-0", faculty_id="F-CN"),
+            ],
+        )
+        for name in ("A", "B")
+    ]
+    admin = SchedulerAdminConfig(working_days=["Monday", "Tuesday"], hours_per_day=6)
+    kwargs = dict(
+        tenant_id="t-parallel",
+        sections=sections,
+        rooms=["R1", "LAB1"],
+        room_types={"R1": "CLASSROOM", "LAB1": "LAB"},
+        admin=admin,
+        population_size=6,
+        generations=3,
+        seed=7,
+    )
+
+    serial = run_scheduler(**kwargs)
+    parallel = run_scheduler(workers=2, **kwargs)
+
+    assert parallel.fitness_score == serial.fitness_score
+    assert parallel.timetable == serial.timetable
+
+
+def test_inherited_chromosome_reproduces_parent_placement() -> None:
+    sections = [
+        SchedulerSectionInput(
+            section=f"CIVIL-{name}",
+            subjects=[
+                SchedulerSubjectInput(code="SURV", ltp="2-0-2", faculty_id=f"F-SURV-{name}", lab_block_size=2),
+                SchedulerSubjectInput(code="ENV", ltp="2-1-0", faculty_id="F-ENV"),
+                SchedulerSubjectInput(code="OE", ltp="1-0-0", faculty_id=f"F-OE-{name}", elective_group="OPEN"),
+            ],
+        )
+        for name in ("A", "B")
+    ]
+    admin = SchedulerAdminConfig(working_days=["Monday", "Tuesday"], hours_per_day=6)
+    pre = preprocess(sections, admin)
+    kwargs = dict(
+        tasks=pre.tasks,
+        sections=["CIVIL-A", "CIVIL-B"],
+        slots=pre.slots,
+        day_periods=pre.day_periods,
+        rooms=["R1", "R2", "LAB1"],
+        room_types={"R1": "CLASSROOM", "R2": "CLASSROOM", "LAB1": "LAB"},
+    )
+
+    parent = generate_candidate(seed=3, **kwargs)
+    child = generate_candidate(seed=99, inherited=parent.genes, **kwargs)
+    partial = dict(parent.genes)
+    dropped = "CIVIL-A:SURV:P:0"
+    del partial[dropped]
+    repaired = generate_candidate(seed=99, inherited=partial, **kwargs)
+
+    assert child.genes == parent.genes
+    child_entries, _ = materialize(child, pre.tasks, pre.slots)
+    parent_entries, _ = materialize(parent, pre.tasks, pre.slots)
+    assert sorted(child_entries, key=repr) == sorted(parent_entries, key=repr)
+    assert {k: v for k, v in repaired.genes.items() if k != dropped} == partial
+    assert dropped in repaired.genes
+
+
+def test_duplicate_children_are_served_from_candidate_cache() -> None:
+    sections = [
+        SchedulerSectionInput(
+            section="AIDS-A",
+            subjects=[SchedulerSubjectInput(code="ML", ltp="5-0-0", faculty_id="F-ML")],
+        )
+    ]
+    admin = SchedulerAdminConfig(working_days=["Monday"], hours_per_day=4)
+
+    result = run_scheduler(
+        tenant_id="t-cache",
+        sections=sections,
+        rooms=["R1"],
+        room_types={"R1": "CLASSROOM"},
+        admin=admin,
+        population_size=8,
+        generations=5,
+        seed=11,
+    )
+
+    stats = result.diagnostics["candidate_cache"]
+    elites = max(2, 8 // 4)
+    assert stats["hits"] + stats["misses"] == 8 + 5 * (8 - elites)
+    assert stats["hits"] > 0
+
+
+def test_candidate_cache_evicts_least_recently_used() -> None:
+    cache = CandidateCache(max_size=2)
+    cache.put(1, "first")
+    cache.put(2, "second")
+    assert cache.get(1) == "first"
+    cache.put(3, "third")
+
+    assert cache.get(2) is None
+    assert cache.get(1) == "first"
+    assert cache.stats()["hits"] == 2 and cache.stats()["misses"] == 1
+
+
+def test_optimizer_stops_early_with_reported_reason() -> None:
+    feasible = [
+        SchedulerSectionInput(
+            section="BME-A",
+            subjects=[SchedulerSubjectInput(code="BIO", ltp="2-0-0", faculty_id="F-BIO")],
+        )
+    ]
+    overloaded = [
+        SchedulerSectionInput(
+            section="BME-B",
+            subjects=[SchedulerSubjectInput(code="ANAT", ltp="6-0-0", faculty_id="F-ANAT")],
+        )
+    ]
+    admin = SchedulerAdminConfig(working_days=["Monday"], hours_per_day=4)
+    kwargs = dict(tenant_id="t-stop", rooms=["R1"], room_types={"R1": "CLASSROOM"}, admin=admin, seed=5)
+
+    solved = run_scheduler(sections=feasible, generations=50, **kwargs)
+    stalled = run_scheduler(sections=overloaded, generations=50, stall_generations=3, **kwargs)
+    budgeted = run_scheduler(sections=overloaded, generations=50, time_budget_ms=0, **kwargs)
+    exhausted = run_scheduler(sections=overloaded, generations=2, **kwargs)
+
+    assert solved.stop_reason == "target_reached"
+    assert solved.diagnostics["generations_run"] == 0
+    assert stalled.stop_reason == "stalled"
+    assert stalled.diagnostics["generations_run"] == 3
+    assert budgeted.stop_reason == "time_budget"
+    assert exhausted.stop_reason == "generations"
+    assert exhausted.diagnostics["generations_run"] == 2
+
+
+def test_progress_callback_reports_each_generation_and_can_cancel() -> None:
+    sections = [
+        SchedulerSectionInput(
+            section="BME-B",
+            subjects=[SchedulerSubjectInput(code="ANAT", ltp="6-0-0", faculty_id="F-ANAT")],
+        )
+    ]
+    admin = SchedulerAdminConfig(working_days=["Monday"], hours_per_day=4)
+    kwargs = dict(tenant_id="t-progress", sections=sections, rooms=["R1"], room_types={"R1": "CLASSROOM"}, admin=admin, seed=5)
+
+    snapshots: list[dict] = []
+    finished = run_scheduler(generations=3, progress=snapshots.append, **kwargs)
+    cancelled = run_scheduler(generations=50, progress=lambda snapshot: snapshot["generation"] < 2, **kwargs)
+
+    assert [snapshot["generation"] for snapshot in snapshots] == [0, 1, 2, 3]
+    assert snapshots[-1]["unscheduled"] == 2
+    assert snapshots[-1]["best_fitness"] == finished.fitness_score
+    assert set(snapshots[0]["candidate_cache"]) >= {"hits", "misses", "hit_rate"}
+    assert cancelled.stop_reason == "cancelled"
+    assert cancelled.diagnostics["generations_run"] == 2
+
+
+def test_profiling_reports_phase_timings_and_counters(monkeypatch: pytest.MonkeyPatch) -> None:
+    sections = [
+        SchedulerSectionInput(
+            section=f"MEC-{name}",
+            subjects=[
+                SchedulerSubjectInput(code="THERMO", ltp="3-0-0", faculty_id=f"F-T{name}"),
+                SchedulerSubjectInput(code=f"OE-{name}", ltp="1-0-0", faculty_id=f"F-E{name}", elective_group="OE"),
+            ],
+        )
+        for name in "AB"
+    ]
+    admin = SchedulerAdminConfig(working_days=["Monday", "Tuesday"], hours_per_day=3)
+    kwargs = dict(tenant_id="t-profile", sections=sections, rooms=["R1", "R2"], room_types={}, admin=admin, seed=2)
+
+    seen: list[str] = []
+    profiled = run_scheduler(profile_hook=lambda phase, seconds: seen.append(phase), **kwargs)
+    timings = profiled.diagnostics["timings"]
+
+    # Without profiling nothing is recorded, not even per candidate.
+    with monkeypatch.context() as patched:
+        patched.setattr(Profiler, "__init__", lambda *args: pytest.fail("Profiler created with profiling off"))
+        assert run_scheduler(**kwargs).diagnostics["timings"] is None
+    assert {"preprocess", "construction", "construct.electives", "construct.tasks", "materialize"} <= set(timings["phases"])
+    assert timings["phases"]["construct.tasks"]["calls"] == timings["counters"]["candidates_built"] == 20
+    assert timings["counters"]["placement_attempts"] >= 8 * 20
+    assert seen[0] == "preprocess" and seen[-1] == "materialize"
+    assert set(seen) == set(timings["phases"])
+
+
+def test_task_ordering_heuristics() -> None:
+    sections = [
+        SchedulerSectionInput(
+            section="CSE-A",
+            subjects=[
+                SchedulerSubjectInput(code="DS", ltp="1-0-0", faculty_id="F-LIGHT"),
+                SchedulerSubjectInput(code="OS", ltp="2-0-0", faculty_id="F-HEAVY"),
+                SchedulerSubjectInput(code="OS-LAB", ltp="0-0-2", faculty_id="F-HEAVY", room_type="LAB"),
+                SchedulerSubjectInput(code="CO-LAB", ltp="0-0-2", faculty_id="F-LIGHT", room_type="LAB"),
+            ],
+        )
+    ]
+    admin = SchedulerAdminConfig(working_days=["Monday", "Tuesday"], hours_per_day=4)
+    pre = preprocess(sections, admin)
+
+    longest = order_tasks(pre.tasks, "longest_first")
+    by_load = order_tasks(pre.tasks, "faculty_load")
+    assert [task.duration for task in longest[:2]] == [2, 2]
+    assert [task.faculty_id for task in by_load[:3]] == ["F-HEAVY"] * 3
+    with pytest.raises(ValueError):
+        order_tasks(pre.tasks, "alphabetical")
+
+    result = run_scheduler(
+        tenant_id="t-dsatur",
+        sections=sections,
+        rooms=["R1", "LAB1"],
+        room_types={"R1": "CLASSROOM", "LAB1": "LAB"},
+        admin=admin,
+        population_size=4,
+        generations=2,
+        task_ordering="dsatur",
+    )
+    assert result.constraint_summary["exact_weekly_fulfillment"] is True
+    assert detect_conflicts(result.timetable) == []
+
+
+def test_preprocess_builds_start_slot_table_per_duration() -> None:
+    sections = [
+        SchedulerSectionInput(
+            section="CSE-A",
+            subjects=[
+                SchedulerSubjectInput(code="AI", ltp="1-0-0", faculty_id="F-AI"),
+                SchedulerSubjectInput(code="AI-LAB", ltp="0-0-3", faculty_id="F-AI", room_type="LAB", lab_block_size=3),
+            ],
+        )
+    ]
+    admin = SchedulerAdminConfig(working_days=["Monday", "Saturday"], hours_per_day=4, saturday_hours=3)
+
+    pre = preprocess(sections, admin)
+
+    assert set(pre.start_slots) == {1, 3}
+    assert pre.start_slots[1] == list(range(len(pre.slots)))
+    assert [pre.slots[slot_id] for slot_id in pre.start_slots[3]] == [("Monday", 1), ("Monday", 2), ("Saturday", 1)]
+
+
+@pytest.mark.parametrize("method", ["sa", "tabu"])
+def test_local_search_places_task_by_kicking_a_blocker(method: str) -> None:
+    sections = [
+        SchedulerSectionInput(section="S1", subjects=[SchedulerSubjectInput(code="A", ltp="1-0-0", faculty_id="F1")]),
+        SchedulerSectionInput(
+            section="S2",
+            subjects=[
+                SchedulerSubjectInput(code="B", ltp="1-0-0", faculty_id="F2"),
+                SchedulerSubjectInput(code="C", ltp="1-0-0", faculty_id="F1"),
+            ],
+        ),
+    ]
+    pre = preprocess(sections, SchedulerAdminConfig(working_days=["Monday"], hours_per_day=2))
+    stuck = {"S1:A:L:0": (0, "R1"), "S2:B:L:0": (1, "R1")}
+
+    genes, stats = improve_genes(
+        tasks=pre.tasks,
+        genes=stuck,
+        slots=pre.slots,
+        rooms=["R1", "R2"],
+        room_types={},
+        start_slots=pre.start_slots,
+        method=method,
+        iterations=50,
+        seed=1,
+    )
+
+    assert stats["initial_unplaced"] == 1
+    assert stats["final_unplaced"] == 0
+    assert set(genes) == {"S1:A:L:0", "S2:B:L:0", "S2:C:L:0"}
+    assert genes["S2:C:L:0"][0] != genes["S2:B:L:0"][0]
+    assert genes["S2:C:L:0"][0] != genes["S1:A:L:0"][0]
+
+
+def test_csp_solver_finds_timetable_or_reports_infeasibility() -> None:
+    sections = [
+        SchedulerSectionInput(
+            section=f"MECH-{name}",
+            subjects=[
+                SchedulerSubjectInput(code="THERMO", ltp="3-0-0", faculty_id="F-TH"),
+                SchedulerSubjectInput(code="CAD", ltp="0-0-2", faculty_id=f"F-CAD-{name}", room_type="LAB", lab_block_size=2),
+                SchedulerSubjectInput(code=f"OE-{name}", ltp="2-0-0", faculty_id=f"F-OE-{name}", elective_group="OPEN"),
+            ],
+        )
+        for name in ("A", "B")
+    ]
+    admin = SchedulerAdminConfig(working_days=["Monday", "Tuesday"], hours_per_day=4)
+    kwargs = dict(
+        tenant_id="t-csp",
+        rooms=["R1", "R2", "LAB1"],
+        room_types={"R1": "CLASSROOM", "R2": "CLASSROOM", "LAB1": "LAB"},
+        admin=admin,
+        solver="csp",
+        seed=2,
+    )
+
+    solved = run_scheduler(sections=sections, **kwargs)
+    # F-TH would need 9 of the 8 weekly periods.
+    overloaded = run_scheduler(
+        sections=sections + [SchedulerSectionInput(section="MECH-C", subjects=[sections[0].subjects[0]])],
+        generations=2,
+        **kwargs,
+    )
+
+    assert solved.diagnostics["csp"]["status"] == "solved"
+    assert solved.stop_reason == "target_reached"
+    assert solved.constraint_summary["exact_weekly_fulfillment"] is True
+    assert detect_conflicts(solved.timetable) == []
+    electives = sorted((e.day, e.period) for e in solved.timetable if e.course.startswith("OE-"))
+    assert electives[0::2] == electives[1::2]
+    assert overloaded.diagnostics["csp"]["status"] == "infeasible"
+    assert "faculty F-TH" in overloaded.diagnostics["csp"]["reason"]
+    assert overloaded.stop_reason == "generations"
+    with pytest.raises(ValueError):
+        run_scheduler(sections=sections, **{**kwargs, "solver": "sat"})
+
+
+def test_csp_solver_accepts_sections_without_subjects() -> None:
+    result = run_scheduler(
+        tenant_id="t-csp",
+        sections=[SchedulerSectionInput(section="MECH-D", subjects=[])],
+        rooms=["R1"],
+        room_types={"R1": "CLASSROOM"},
+        admin=SchedulerAdminConfig(working_days=["Monday"], hours_per_day=4),
+        solver="csp",
+    )
+
+    assert result.diagnostics["csp"] == {"status": "solved", "units": 0, "backtracks": 0, "max_depth": 0}
+    assert result.stop_reason == "target_reached"
+    assert result.timetable == []
+
+
+def test_csp_and_ga_fallback_share_one_time_budget() -> None:
+    # Too tight for the CSP to finish quickly, easy for the GA.
+    institution = generate_institution(sections=24, faculty=60, rooms=20, labs=6, lab_ratio=0.3, seed=1)
+    result = run_scheduler(
+        tenant_id="t-csp",
+        sections=institution.sections,
+        rooms=institution.rooms,
+        room_types=institution.room_types,
+        admin=institution.admin,
+        solver="csp",
+        seed=0,
+        time_budget_ms=50,
+    )
+
+    assert result.diagnostics["csp"]["status"] == "budget_exhausted"
+    # The CSP used the whole budget, so the GA stops after its first generation
+    # and the reported time covers both.
+    assert result.stop_reason == "time_budget"
+    assert result.diagnostics["generations_run"] <= 1
+    assert result.diagnostics["elapsed_ms"] >= 50
+
+
+def test_progress_callback_can_cancel_the_csp() -> None:
+    institution = generate_institution(sections=24, faculty=60, rooms=20, labs=6, lab_ratio=0.3, seed=1)
+    snapshots = []
+
+    def progress(snapshot: dict) -> bool:
+        snapshots.append(snapshot)
+        return False
+
+    result = run_scheduler(
+        tenant_id="t-csp",
+        sections=institution.sections,
+        rooms=institution.rooms,
+        room_types=institution.room_types,
+        admin=institution.admin,
+        solver="csp",
+        seed=0,
+        progress=progress,
+    )
+
+    assert snapshots[0]["phase"] == "csp"
+    assert result.diagnostics["csp"]["status"] == "cancelled"
+    # Cancelled at the first check: the GA fallback never runs.
+    assert result.stop_reason == "cancelled"
+    assert result.diagnostics["generations_run"] == 0
+    assert len(snapshots) == 1
+    assert result.timetable
+
+
+def test_independent_departments_are_solved_as_separate_components() -> None:
+    sections = [
+        SchedulerSectionInput(
+            section=f"{dept}-{name}",
+            subjects=[
+                SchedulerSubjectInput(code=f"{dept}-CORE", ltp="3-0-0", faculty_id=f"F-{dept}"),
+                SchedulerSubjectInput(code=f"{dept}-LAB", ltp="0-0-2", faculty_id=f"F-{dept}-{name}", lab_block_size=2),
+            ],
+        )
+        for dept in ("CIV", "CHE")
+        for name in ("A", "B")
+    ]
+    admin = SchedulerAdminConfig(working_days=["Monday", "Tuesday"], hours_per_day=5)
+    rooms = ["R1", "R2", "R3", "LAB1", "LAB2"]
+    room_types = {"R1": "CLASSROOM", "R2": "CLASSROOM", "R3": "CLASSROOM", "LAB1": "LAB", "LAB2": "LAB"}
+    pre = preprocess(sections, admin)
+    names = [section.section for section in sections]
+
+    components = split_components(pre, names, rooms, room_types)
+    shared = sections[:3] + [
+        SchedulerSectionInput(section="CHE-B", subjects=[sections[0].subjects[0], sections[2].subjects[0]])
+    ]
+    joined = split_components(preprocess(shared, admin), [s.section for s in shared], rooms, room_types)
+    result = run_scheduler(
+        tenant_id="t-split", sections=sections, rooms=rooms, room_types=room_types, admin=admin, seed=4, decompose=True
+    )
+
+    assert sorted(sorted(c.sections) for c in components) == [["CHE-A", "CHE-B"], ["CIV-A", "CIV-B"]]
+    assert sorted(room for c in components for room in c.rooms) == sorted(rooms)
+    assert all({"LAB1", "LAB2"} & set(c.rooms) for c in components)
+    assert len(joined) == 1
+    assert len(result.diagnostics["components"]) == 2
+    assert result.constraint_summary["exact_weekly_fulfillment"] is True
+    assert detect_conflicts(result.timetable) == []
+
+
+def test_serial_decomposed_run_shares_one_time_budget() -> None:
+    # Each department's faculty member needs 6 periods out of 4, so no
+    # component can finish early and every one runs until its budget is spent.
+    sections = [
+        SchedulerSectionInput(
+            section=f"D{dept}-{name}",
+            subjects=[SchedulerSubjectInput(code=f"D{dept}-CORE", ltp="3-0-0", faculty_id=f"F-{dept}")],
+        )
+        for dept in range(6)
+        for name in ("A", "B")
+    ]
+    rooms = [f"R{index}" for index in range(6)]
+    result = run_scheduler(
+        tenant_id="t-split-budget",
+        sections=sections,
+        rooms=rooms,
+        room_types={room: "CLASSROOM" for room in rooms},
+        admin=SchedulerAdminConfig(working_days=["Monday"], hours_per_day=4),
+        generations=1_000_000,
+        seed=1,
+        time_budget_ms=300,
+        decompose=True,
+    )
+
+    assert len(result.diagnostics["components"]) == 6
+    assert result.stop_reason == "time_budget"
+    assert result.diagnostics["elapsed_ms"] < 450
+
+
+def test_warm_start_pins_assignments_that_are_still_valid() -> None:
+    sections = [
+        SchedulerSectionInput(
+            section=f"BIO-{name}",
+            subjects=[
+                SchedulerSubjectInput(code="GEN", ltp="2-1-0", faculty_id=f"F-GEN-{name}"),
+                SchedulerSubjectInput(code="MICRO", ltp="2-0-2", faculty_id="F-MICRO", lab_block_size=2),
+            ],
+        )
+        for name in ("A", "B")
+    ]
+    admin = SchedulerAdminConfig(working_days=["Monday", "Tuesday", "Wednesday"], hours_per_day=4)
+    kwargs = dict(
+        tenant_id="t-warm",
+        rooms=["R1", "R2", "LAB1"],
+        room_types={"R1": "CLASSROOM", "R2": "CLASSROOM", "LAB1": "LAB"},
+        admin=admin,
+    )
+    before = run_scheduler(sections=sections, seed=1, **kwargs)
+
+    edited = [
+        sections[0],
+        SchedulerSectionInput(
+            section="BIO-B",
+            subjects=[sections[1].subjects[0].model_copy(update={"faculty_id": "F-NEW"}), sections[1].subjects[1]],
+        ),
+    ]
+    after = run_scheduler(sections=edited, seed=2, warm_start=before.timetable, **kwargs)
+
+    kept = {(e.section, e.course, e.day, e.period, e.room) for e in before.timetable if e.faculty_id != "F-GEN-B"}
+    assert after.diagnostics["warm_start"] == {"tasks": 12, "pinned": 9, "kept": 9}
+    assert kept <= {(e.section, e.course, e.day, e.period, e.room) for e in after.timetable}
+    assert after.constraint_summary["exact_weekly_fulfillment"] is True
+    assert detect_conflicts(after.timetable) == []
+
+
+def test_problem_instance_interns_ids_into_dense_columns() -> None:
+    sections = [
+        SchedulerSectionInput(
+            section=name,
+            subjects=[
+                SchedulerSubjectInput(code="PHY", ltp="1-0-2", faculty_id="F-PHY", lab_block_size=2),
+                SchedulerSubjectInput(code=f"ENG-{name}", ltp="1-0-0", faculty_id=f"F-{name}"),
+            ],
+        )
+        for name in ("X", "Y")
+    ]
+    admin = SchedulerAdminConfig(working_days=["Monday", "Tuesday"], hours_per_day=3)
+    pre = preprocess(sections, admin)
+
+    instance = ProblemInstance.from_tasks(pre.tasks, pre.slots, ["R1", "LAB1"], {"LAB1": "LAB"})
+    lab = instance.task("Y:PHY:P:0")
+
+    assert instance.days == ["Monday", "Tuesday"]
+    assert list(instance.slot_run) == [3, 2, 1, 3, 2, 1]
+    assert instance.slot("Tuesday", 2) == 4
+    assert instance.slot("Tuesday", 4) == -1
+    assert instance.faculty == ["F-PHY", "F-X", "F-Y"]
+    assert instance.sections[instance.task_section[lab]] == "Y"
+    assert instance.faculty[instance.task_faculty[lab]] == "F-PHY"
+    assert instance.task_length[lab] == 2
+    assert instance.rooms_by_type[instance.task_room_type[lab]] == [instance.room("LAB1")]
+    assert len(instance.courses) == 4
+    with pytest.raises(ValueError):
+        instance.add_task("Y:PHY:P:0", "Y", "F-PHY", "PHY", 2, "LAB")
+
+
+def test_population_evaluator_scores_candidates_in_one_batch() -> None:
+    pytest.importorskip("numpy")
+    slots = [(day, period) for day in ("Monday", "Tuesday") for period in range(1, 5)]
+    instance = ProblemInstance(slots, ["R1", "R2"], {})
+    for index in range(1, 5):
+        instance.add_task(f"MATH-{index}", "S", "F1", "MATH", 1, "CLASSROOM", difficulty=4)
+    instance.add_task("PHY-1", "S", "F2", "PHY", 2, "CLASSROOM")
+
+    compact = {
+        "MATH-1": ("Monday", 1, "R1"),
+        "MATH-2": ("Monday", 2, "R1"),
+        "MATH-3": ("Monday", 3, "R1"),
+        "MATH-4": ("Monday", 4, "R1"),
+        "PHY-1": ("Tuesday", 1, "R1"),
+    }
+    clashing = {
+        "MATH-1": ("Monday", 1, "R1"),
+        "MATH-2": ("Monday", 1, "R2"),
+        "MATH-3": ("Tuesday", 1, "R1"),
+        "MATH-4": ("Tuesday", 2, "R1"),
+        "PHY-1": ("Tuesday", 4, "R2"),
+    }
+    scores = PopulationEvaluator(instance).score([compact, clashing])
+
+    # Compact: both courses on a single day (2 x 15), a four-period streak (8)
+    # and four heavy periods on Monday ((4 - 2) x 6).
+    assert (scores[0].hard_conflicts, scores[0].subject_spread_penalty) == (0, 30)
+    assert (scores[0].fatigue_penalty, scores[0].heavy_subject_penalty) == (8, 12)
+    assert scores[0].fitness == 950.0
+    # Clashing: faculty and section clash on Monday 1, PHY-1 runs past Tuesday.
+    assert (scores[1].hard_conflicts, scores[1].subject_spread_penalty) == (3, 15)
+    assert (scores[1].fatigue_penalty, scores[1].heavy_subject_penalty) == (0, 0)
+    assert scores[1].fitness == 685.0
+    with pytest.raises(ValueError, match="outside the slot matrix"):
+        PopulationEvaluator(instance).score([{**compact, "PHY-1": ("Sunday", 1, "R1")}])
+
+
+def test_synthetic_institution_is_deterministic_and_shaped_by_its_parameters() -> None:
+    kwargs = dict(sections=10, faculty=12, rooms=6, labs=2, subjects_per_section=5, lab_ratio=0.4, elective_groups=2, seed=3)
+    first = generate_institution(**kwargs)
+
+    assert first == generate_institution(**kwargs)
+    assert first != generate_institution(**{**kwargs, "seed": 4})
+    assert len(first.sections) == 10
+    assert all(len(section.subjects) == 6 for section in first.sections)
+    assert {room for room, kind in first.room_types.items() if kind == "LAB"} == {"LAB000", "LAB001"}
+    assert {s.elective_group for section in first.sections for s in section.subjects} == {None, "EG0", "EG1"}
+    assert any(s.room_type == "LAB" for section in first.sections for s in section.subjects)
+    core_faculty = [s.faculty_id for section in first.sections for s in section.subjects if not s.elective_group]
+    assert set(core_faculty) <= {f"F{index:03d}" for index in range(12)}
+
+
+def test_benchmark_report_flags_regressions_against_baseline() -> None:
+    report = run_benchmarks(["small"], ["run_scheduler", "scheduler_engine"], repeats=1)
+    measured, engine = report["results"]
+
+    assert measured["unscheduled_periods"] == 0
+    assert measured["wall_s"] > 0 and measured["peak_mb"] > 0
+    # SchedulerEngine is imported lazily; either it ran or it is recorded as skipped.
+    assert "skipped" in engine or "wall_s" in engine
+    assert compare_to_baseline(report, report) == []
+
+    slower = {"results": [{**measured, "wall_s": measured["wall_s"] * 10, "unscheduled_periods": 3}]}
+    assert [line.split(":")[1].split()[0] for line in compare_to_baseline(slower, report)] == ["wall_s", "unscheduled_periods"]
+
+
+def test_auto_solver_sizes_the_search_to_the_instance() -> None:
+    small = generate_institution(sections=4, faculty=10, rooms=4, labs=1, lab_ratio=0.0, seed=1)
+    medium = generate_institution(sections=24, faculty=60, rooms=20, labs=8, subjects_per_section=7, elective_groups=6)
+
+    plans = []
+    for institution in (small, medium):
+        result = run_scheduler(
+            tenant_id="t1",
+            sections=institution.sections,
+            rooms=institution.rooms,
+            room_types=institution.room_types,
+            admin=institution.admin,
+            seed=5,
+            solver="auto",
+        )
+        assert result.conflict_count == 0
+        plans.append(result.diagnostics["strategy"])
+
+    small_plan, medium_plan = plans
+    assert small_plan["profile"]["tasks"] < medium_plan["profile"]["tasks"]
+    assert small_plan["plan"]["solver"] == "ga" and not small_plan["plan"]["decompose"]
+    assert small_plan["plan"]["population_size"] < medium_plan["plan"]["population_size"]
+    assert medium_plan["plan"]["solver"] == "csp" and medium_plan["plan"]["decompose"]
+    assert medium_plan["profile"]["elective_groups"] == 6
+    assert all(plan["plan"]["reasons"] for plan in plans)
+
+
+def test_auto_solver_bounds_the_csp_and_falls_back_to_the_ga() -> None:
+    # Room pools have slack, so "auto" tries the CSP, which cannot finish here.
+    institution = generate_institution(sections=24, faculty=60, rooms=20, labs=6, lab_ratio=0.3, seed=1)
+    result = run_scheduler(
+        tenant_id="t1",
+        sections=institution.sections,
+        rooms=institution.rooms,
+        room_types=institution.room_types,
+        admin=institution.admin,
+        seed=0,
+        solver="auto",
+    )
+
+    plan = result.diagnostics["strategy"]["plan"]
+    assert plan["solver"] == "csp" and plan["csp_time_budget_ms"] is not None
+    assert result.diagnostics["csp"]["status"] == "budget_exhausted"
+    assert result.stop_reason == "target_reached"
+    assert result.conflict_count == 0
+
+
+# app.scheduler_engine expects schema models that app.schemas does not define
+# (yet); these stand-ins carry exactly the fields it uses.
+class AssignmentConflict(BaseModel):
+    conflict_type: Literal["FACULTY", "ROOM", "SECTION"]
+    message: str
+    section: str
+    day: str
+    period: int
+
+
+class ScoreBreakdown(BaseModel):
+    hard_penalty: int
+    subject_spread_penalty: int
+    fatigue_penalty: int
+    heavy_subject_penalty: int
+    final_score: float
+
+
+class SchedulerDiagnostics(BaseModel):
+    hard_conflicts: list[AssignmentConflict] = Field(default_factory=list)
+    soft_constraint_notes: list[str] = Field(default_factory=list)
+
+
+class EngineSubjectSpec(BaseModel):
+    subject: str
+    ltp: tuple[int, int, int]
+    faculty_id: str
+    difficulty: int = 3
+    lab_block_size: int | None = None
+
+
+class EngineRoomSpec(BaseModel):
+    name: str
+    is_lab: bool = False
+
+
+class EngineAdminConfig(BaseModel):
+    hours_per_day: int = 6
+    extra_slots: int = 0
+    include_saturday: bool = False
+    days: list[str] | None = None
+
+
+@pytest.fixture
+def scheduler_engine(monkeypatch: pytest.MonkeyPatch) -> Iterator[ModuleType]:
+    """`app.scheduler_engine`, imported against the stand-in schema models above."""
+    for name, model in {
+        "AssignmentConflict": AssignmentConflict,
+        "ScoreBreakdown": ScoreBreakdown,
+        "SchedulerDiagnostics": SchedulerDiagnostics,
+        "SubjectSpec": EngineSubjectSpec,
+        "RoomSpec": EngineRoomSpec,
+        "AdminConfig": EngineAdminConfig,
+    }.items():
+        monkeypatch.setattr(schemas, name, model, raising=False)
+    sys.modules.pop("app.scheduler_engine", None)
+    yield importlib.import_module("app.scheduler_engine")
+    sys.modules.pop("app.scheduler_engine", None)
+
+
+def _engine_problem(
+    sections: int = 4, subjects: int = 5, rooms: int = 4, labs: int = 2, hours_per_day: int = 6
+) -> tuple[list[str], list[EngineSubjectSpec], list[EngineRoomSpec], EngineAdminConfig]:
+    return (
+        [f"S{index}" for index in range(sections)],
+        [
+            EngineSubjectSpec(
+                subject=f"SUB{index}",
+                ltp=(3, 0, 2 if index % 3 == 0 else 0),
+                faculty_id=f"F{index}",
+                difficulty=index % 5 + 1,
+                lab_block_size=2,
+            )
+            for index in range(subjects)
+        ],
+        [EngineRoomSpec(name=f"R{index}") for index in range(rooms)]
+        + [EngineRoomSpec(name=f"L{index}", is_lab=True) for index in range(labs)],
+        EngineAdminConfig(hours_per_day=hours_per_day),
+    )
+
+
+def _engine_instance(engine, problem: tuple) -> tuple:
+    sections, subjects, rooms, config = problem
+    blocks, slots, block_map, instance = engine._prepare(sections, subjects, rooms, config)
+    return blocks, slots, block_map, instance, rooms
+
+
+def test_incremental_fitness_matches_full_evaluation(scheduler_engine: ModuleType) -> None:
+    engine = scheduler_engine.SchedulerEngine(seed=3)
+    blocks, slots, _, instance, rooms = _engine_instance(engine, _engine_problem())
+    rng = random.Random(0)
+    room_names = [room.name for room in rooms]
+
+    def random_assignment() -> tuple[str, int, str]:
+        return (*rng.choice(slots), rng.choice(room_names))
+
+    def assert_matches(candidate: dict, evaluator) -> None:
+        fitness, breakdown, _ = engine._fitness(candidate, blocks, slots)
+        assert (
+            breakdown.hard_penalty,
+            breakdown.subject_spread_penalty,
+            breakdown.fatigue_penalty,
+            breakdown.heavy_subject_penalty,
+        ) == (
+            evaluator.hard_conflicts * 100,
+            evaluator.subject_spread_penalty,
+            evaluator.fatigue_penalty,
+            evaluator.heavy_subject_penalty,
+        )
+        assert evaluator.fitness == fitness
+
+    for _ in range(200):
+        candidate = {block.block_id: random_assignment() for block in blocks}
+        evaluator = scheduler_engine.IncrementalFitness(candidate, instance)
+        assert_matches(candidate, evaluator)
+
+    snapshot = evaluator.copy()
+    for _ in range(300):
+        block_id, assignment = rng.choice(blocks).block_id, random_assignment()
+        before = evaluator.total_penalty
+        delta = evaluator.move_delta(block_id, assignment)
+        assert evaluator.total_penalty == before
+        assert evaluator.move(block_id, assignment) == delta
+        candidate[block_id] = assignment
+        assert_matches(candidate, evaluator)
+    # Copies are independent of later moves.
+    assert snapshot.total_penalty == scheduler_engine.IncrementalFitness(snapshot.assignments, instance).total_penalty
+
+
+def test_construction_places_blocks_without_clashes(scheduler_engine: ModuleType) -> None:
+    problem = _engine_problem(sections=3, subjects=4, rooms=4, labs=2)
+    engine = scheduler_engine.SchedulerEngine(seed=11)
+    blocks, _, _, instance, rooms = _engine_instance(engine, problem)
+
+    candidate = engine._construct_candidate(blocks, instance, rooms)
+    again = scheduler_engine.SchedulerEngine(seed=11)._construct_candidate(blocks, instance, rooms)
+
+    assert candidate == again
+    assert set(candidate) == {block.block_id for block in blocks}
+    assert scheduler_engine.IncrementalFitness(candidate, instance).hard_conflicts == 0
+    assert all(candidate[block.block_id][2].startswith("L") for block in blocks if block.kind == "LAB")
+
+    lab = next(block for block in blocks if block.length == 2)
+    task = instance.task(lab.block_id)
+    occupied = tuple(
+        bytearray(count * instance.slot_count)
+        for count in (len(instance.faculty), len(instance.sections), len(instance.rooms))
+    )
+    room_id = instance.room("L0")
+    assert engine._can_place(occupied, instance, task, instance.slot("Monday", 1), room_id)
+    # A two-period block cannot start in the last period of a day.
+    assert not engine._can_place(occupied, instance, task, instance.slot("Monday", 6), room_id)
+    occupied[0][instance.task_faculty[task] * instance.slot_count + instance.slot("Monday", 2)] = 1
+    assert not engine._can_place(occupied, instance, task, instance.slot("Monday", 1), room_id)
+    assert engine._can_place(occupied, instance, task, instance.slot("Monday", 3), room_id)
+
+
+def test_min_conflicts_repair_reduces_clashes_within_its_step_budget(scheduler_engine: ModuleType) -> None:
+    engine = scheduler_engine.SchedulerEngine(seed=5)
+    blocks, slots, block_map, instance, rooms = _engine_instance(engine, _engine_problem(sections=3, subjects=4))
+    rng = random.Random(1)
+    room_names = [room.name for room in rooms]
+
+    for _ in range(5):
+        candidate = {block.block_id: (*rng.choice(slots), rng.choice(room_names)) for block in blocks}
+        before = scheduler_engine.IncrementalFitness(candidate, instance).hard_conflicts
+        repaired = engine._repair_candidate(candidate, instance, rooms, block_map)
+        assert scheduler_engine.IncrementalFitness(repaired, instance).hard_conflicts < before
+
+        # Each step moves at most one block.
+        limited = engine._repair_candidate(candidate, instance, rooms, block_map, max_steps=3)
+        assert 0 < sum(limited[block_id] != candidate[block_id] for block_id in candidate) <= 3
+        assert engine._repair_candidate(candidate, instance, rooms, block_map, max_steps=0) == candidate
+
+
+def test_min_conflicts_repair_leaves_unfixable_blocks_in_place(scheduler_engine: ModuleType) -> None:
+    # Three lectures for one section in a two-period week: one clash is unavoidable.
+    problem = (["S0"], [EngineSubjectSpec(subject="SUB0", ltp=(3, 0, 0), faculty_id="F0")], [EngineRoomSpec(name="R0")])
+    engine = scheduler_engine.SchedulerEngine(seed=5)
+    blocks, _, block_map, instance, rooms = _engine_instance(
+        engine, (*problem, EngineAdminConfig(hours_per_day=2, days=["Monday"]))
+    )
+    first, second, third = (block.block_id for block in blocks)
+    candidate = {first: ("Monday", 1, "R0"), second: ("Monday", 2, "R0"), third: ("Monday", 2, "R0")}
+
+    # Moving the clashing lecture to the first slot would only trade one clash
+    # for another, so it stays where it is.
+    assert engine._repair_candidate(candidate, instance, rooms, block_map) == candidate
+
+
+def _crashing_island(*args: object) -> None:
+    raise SystemExit(3)
+
+
+def test_island_model_returns_a_valid_timetable(scheduler_engine: ModuleType, monkeypatch: pytest.MonkeyPatch) -> None:
+    sections, subjects, rooms, config = _engine_problem(sections=3, subjects=4)
+    ga_config = {"population_size": 6, "generations": 6, "islands": 2, "migration_interval": 2}
+    engine = scheduler_engine.SchedulerEngine(seed=2)
+    blocks, *_ = _engine_instance(engine, (sections, subjects, rooms, config))
+
+    entries, breakdown, _ = engine.generate(sections, subjects, rooms, config, ga_config)
+
+    assert len(entries) == len(blocks)
+    assert {(entry.section, entry.course) for entry in entries} == {(block.section, block.subject) for block in blocks}
+    assert breakdown.hard_penalty == 0
+    with pytest.raises(ValueError, match="migration_interval"):
+        engine.generate(sections, subjects, rooms, config, {**ga_config, "migration_interval": 0})
+    monkeypatch.setattr(scheduler_engine, "_run_island", _crashing_island)
+    with pytest.raises(RuntimeError, match="island"):
+        engine.generate(sections, subjects, rooms, config, ga_config)